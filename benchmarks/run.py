@@ -0,0 +1,182 @@
+#!/usr/bin/env python3
+"""
+Run the benchmark suite (benchmarks/suite.py) and compare results between
+commits.
+
+Usage:
+    python benchmarks/run.py list
+    python benchmarks/run.py run                          # small + medium, writes benchmarks/results/<commit>.json
+    python benchmarks/run.py run --scale large --filter tipout --repeat 5
+    python benchmarks/run.py compare benchmarks/results/abc1234.json benchmarks/results/def5678.json
+
+Each case gets one untimed warm-up call, then `--repeat` samples with the
+garbage collector off, as in timeit. Fast cases are called several times
+per sample so each sample lasts at least MIN_SAMPLE_SECONDS. Throughput is
+units/second of the best sample, the least noisy figure to compare across
+runs. `compare` exits with status 1 when any case's throughput dropped by
+more than `--threshold`.
+"""
+
+import argparse
+import fnmatch
+import gc
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from benchmarks.suite import CASES, SCALES
+
+RESULTS_DIR = ROOT / "benchmarks" / "results"
+DEFAULT_SCALES = ["small", "medium"]
+DEFAULT_THRESHOLD = 0.10
+MIN_SAMPLE_SECONDS = 0.2
+
+
+def git(*args):
+    try:
+        return subprocess.run(["git", *args], cwd=ROOT, capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def selected(patterns):
+    if not patterns:
+        return list(CASES.values())
+    return [c for name, c in CASES.items() if any(fnmatch.fnmatch(name, f"*{p}*") for p in patterns)]
+
+
+def time_case(bench, scale, repeat):
+    units, fn = bench["setup"](scale)
+    start = time.perf_counter()
+    fn()  # warm-up: imports, lazy caches
+    number = max(1, int(MIN_SAMPLE_SECONDS / max(time.perf_counter() - start, 1e-6)))
+
+    times = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(repeat):
+            start = time.perf_counter()
+            for _ in range(number):
+                fn()
+            times.append((time.perf_counter() - start) / number)
+    finally:
+        gc.enable()
+    best = min(times)
+    return {
+        "name": bench["name"],
+        "scale": scale,
+        "units": units,
+        "unit": bench["unit"],
+        "number": number,
+        "times": [round(t, 9) for t in times],
+        "median": round(statistics.median(times), 9),
+        "min": round(best, 9),
+        "throughput": round(units / best, 2) if best else None,
+    }
+
+
+def run(args):
+    cases = selected(args.filter)
+    if not cases:
+        print("⚠️ No benchmark cases match the filter.")
+        return 1
+
+    commit = git("rev-parse", "--short", "HEAD") or "unknown"
+    dirty = bool(git("status", "--porcelain", "--untracked-files=no"))
+    results = {
+        "commit": commit,
+        "dirty": dirty,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeat": args.repeat,
+        "results": [],
+    }
+
+    print(f"⏱  {len(cases)} cases x {', '.join(args.scale)} at {commit}{' (dirty)' if dirty else ''}\n")
+    print(f"{'Case':<44} {'Scale':<7} {'Units':>8} {'Best ms':>11} {'Throughput':>16}")
+    print("-" * 90)
+    for scale in args.scale:
+        for bench in cases:
+            r = time_case(bench, scale, args.repeat)
+            results["results"].append(r)
+            print(f"{r['name']:<44} {scale:<7} {r['units']:8,d} {r['min'] * 1000:11.1f} "
+                  f"{r['throughput']:12,.0f} {r['unit']}/s")
+
+    output = Path(args.output) if args.output else RESULTS_DIR / f"{commit}{'-dirty' if dirty else ''}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(results, indent=2))
+    print(f"\n✅ Results saved to {output}")
+    return 0
+
+
+def compare(args):
+    base = json.loads(Path(args.base).read_text())
+    new = json.loads(Path(args.new).read_text())
+    base_by_key = {(r["name"], r["scale"]): r for r in base["results"]}
+
+    print(f"{base['commit']} → {new['commit']} (regression threshold {args.threshold:.0%})\n")
+    print(f"{'Case':<44} {'Scale':<7} {'Base/s':>12} {'New/s':>12} {'Change':>9}")
+    print("-" * 90)
+    regressions = 0
+    for r in new["results"]:
+        b = base_by_key.get((r["name"], r["scale"]))
+        if not b or not b["throughput"] or not r["throughput"]:
+            print(f"{r['name']:<44} {r['scale']:<7} {'—':>12} {r['throughput'] or 0:12,.0f} {'new':>9}")
+            continue
+        change = r["throughput"] / b["throughput"] - 1
+        flag = ""
+        if change < -args.threshold:
+            regressions += 1
+            flag = "  ❌ regression"
+        elif change > args.threshold:
+            flag = "  ✅ faster"
+        print(f"{r['name']:<44} {r['scale']:<7} {b['throughput']:12,.0f} {r['throughput']:12,.0f} "
+              f"{change:+8.1%}{flag}")
+
+    if regressions:
+        print(f"\n❌ {regressions} case(s) slower by more than {args.threshold:.0%}")
+        return 1
+    print("\n✅ No throughput regressions")
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark suite runner.")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    sub.add_parser("list", help="List benchmark cases")
+
+    run_parser = sub.add_parser("run", help="Run benchmarks and save JSON results")
+    run_parser.add_argument("--scale", nargs="+", choices=list(SCALES), default=DEFAULT_SCALES)
+    run_parser.add_argument("--filter", nargs="*", help="Only cases whose name contains one of these")
+    run_parser.add_argument("--repeat", type=int, default=5, help="Timed calls per case (best one reported)")
+    run_parser.add_argument("--output", help=f"Results file (default: {RESULTS_DIR.relative_to(ROOT)}/<commit>.json)")
+
+    cmp_parser = sub.add_parser("compare", help="Compare two results files")
+    cmp_parser.add_argument("base")
+    cmp_parser.add_argument("new")
+    cmp_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                            help="Throughput drop that counts as a regression (default 0.10)")
+    args = parser.parse_args()
+
+    if args.command == "list":
+        for name, bench in CASES.items():
+            print(f"{name:<44} {bench['unit']}")
+        return 0
+    if args.command == "run":
+        return run(args)
+    return compare(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,410 @@
+"""
+Benchmark cases for benchmarks/run.py.
+
+Each case is registered with @case and, given a scale name, returns
+(units, fn): how many units one call of fn processes and the zero-argument
+callable to time. Everything before the return is setup and is not timed;
+setup may also check results against a reference implementation and raise
+(parsers.ItemParser is checked against the pre-compilation loop).
+
+Datasets come from mock_square.generator with a fixed seed, converted to SDK
+models once per scale, so every run and every commit times the same data.
+"""
+
+import random
+import re
+import tempfile
+from datetime import date, datetime, time, timedelta, timezone
+from functools import lru_cache
+from pathlib import Path
+from types import SimpleNamespace
+
+from square.types.customer import Customer
+from square.types.order import Order
+from square.types.payment import Payment
+from square.types.timecard import Timecard
+
+from mock_square.generator import SyntheticData
+
+ROOT = Path(__file__).resolve().parent.parent
+INVOICE_PDF = ROOT / "data" / "Invoice_9140577_from_Food_Matters_Again.pdf"
+
+# Orders in the synthetic dataset per scale (about as many payments).
+SCALES = {"small": 2_000, "medium": 10_000, "large": 50_000}
+ORDERS_PER_DAY = 500
+
+# Invoice parsing doesn't grow with order volume; scale is parses per call.
+INVOICE_PARSES = {"small": 1, "medium": 3, "large": 10}
+
+CASES = {}
+
+
+def case(name, unit):
+    def register(fn):
+        CASES[name] = {"name": name, "unit": unit, "setup": fn}
+        return fn
+    return register
+
+
+class _MemoryOrders:
+    def __init__(self, orders):
+        self._orders = orders
+
+    def get(self, order_id, **kwargs):
+        return SimpleNamespace(order=self._orders.get(order_id), errors=None)
+
+
+class _MemoryCustomers:
+    def __init__(self, customers):
+        self._customers = customers
+
+    def get(self, customer_id, **kwargs):
+        return SimpleNamespace(customer=self._customers.get(customer_id), errors=None)
+
+
+class MemoryClient:
+    """
+    The lookups tipout and the extractors make (orders.get, customers.get),
+    answered from dicts so the cases time our code, not I/O.
+    """
+
+    def __init__(self, orders, customers):
+        self.orders = _MemoryOrders({o.id: o for o in orders})
+        self.customers = _MemoryCustomers({c.id: c for c in customers})
+
+
+@lru_cache(maxsize=None)
+def dataset(scale):
+    """
+    (orders, payments, timecards, client) for a scale, as SDK models.
+    """
+    n_orders = SCALES[scale]
+    data = SyntheticData(locations=1, days=max(1, n_orders // ORDERS_PER_DAY),
+                         orders_per_day=min(n_orders, ORDERS_PER_DAY), seed=7)
+    location_id = data.locations[0]["id"]
+    orders, payments, timecards = [], [], []
+    for day in data.days_iter():
+        tcs = data.timecards(location_id, day)
+        day_orders, day_payments = data.orders_and_payments(location_id, day, tcs)
+        timecards += tcs
+        orders += day_orders
+        payments += day_payments
+
+    orders = [Order.model_validate(o) for o in orders]
+    customers = [Customer.model_validate(c) for c in data.customers]
+    return (
+        orders,
+        [Payment.model_validate(p) for p in payments],
+        [Timecard.model_validate(tc) for tc in timecards],
+        MemoryClient(orders, customers),
+    )
+
+
+def board_items(scale):
+    """
+    SCALES[scale] board line items (with pickup/allergy modifiers), cycled
+    from the small dataset.
+    """
+    orders = dataset("small")[0]
+    boards = [(li, o) for o in orders for li in (o.line_items or []) if li.modifiers]
+    rng = random.Random(7)
+    return [rng.choice(boards) for _ in range(SCALES[scale])]
+
+
+# ---- parsers / extractors ----
+
+# Modifiers where the leftmost match is not the highest-priority pattern's
+PRIORITY_MODIFIERS = ["Pickup 12:30 or 2pm", "noon or 3pm", "Nov 26 (11/27 backup)", "4:30"]
+
+
+def legacy_parse(item):
+    """
+    ItemParser before precompilation: each pattern list searched in order
+    with re.search, values left as the matched text.
+    """
+    from parsers.item_parser import DATE_PATTERNS, TIME_PATTERNS
+
+    pickup_date = pickup_time = allergies = None
+    extra = []
+    for mod in item.modifiers:
+        text = mod.name.strip().lower()
+        for pattern in DATE_PATTERNS:
+            m = re.search(pattern, text, flags=re.IGNORECASE)
+            if m:
+                pickup_date = m.group(0)
+                break
+        for pattern in TIME_PATTERNS:
+            m = re.search(pattern, text, flags=re.IGNORECASE)
+            if m:
+                pickup_time = m.group(0)
+                break
+        if "allerg" in text:
+            allergies = text.split(":", 1)[-1].strip()
+            continue
+        if pickup_date is None and pickup_time is None and allergies is None:
+            extra.append(mod.name)
+    return pickup_date, pickup_time, allergies, extra
+
+
+def check_item_parser(items, year=2025):
+    """
+    Raise if ItemParser picks a different pickup date, time or allergy than
+    the legacy loop for any item. The legacy matched text, parsed on its
+    own, normalizes the same way the current parser normalizes the whole
+    modifier.
+    """
+    from parsers.item_parser import ItemParser, parse_modifier_text
+
+    def normalized(text, index):
+        return None if text is None else parse_modifier_text(text, year)[index]
+
+    for item in items:
+        pickup_date, pickup_time, allergies, extra = legacy_parse(item)
+        expected = {
+            "pickup_date": normalized(pickup_date, 0),
+            "pickup_time": normalized(pickup_time, 1),
+            "allergies": allergies,
+            "extra_modifiers": extra,
+        }
+        actual = ItemParser(item, year=year).as_dict()
+        if actual != expected:
+            names = [m.name for m in item.modifiers]
+            raise RuntimeError(f"ItemParser differs from the legacy loop on {names}: {actual} != {expected}")
+
+
+@case("parsers.ItemParser", unit="items")
+def bench_item_parser(scale):
+    from parsers.item_parser import ItemParser, order_month, order_year, parse_modifier_text
+
+    items = board_items(scale)
+    check_item_parser([item for item, _ in items] + [
+        SimpleNamespace(modifiers=[SimpleNamespace(name=text)]) for text in PRIORITY_MODIFIERS
+    ])
+
+    def run():
+        parse_modifier_text.cache_clear()
+        for item, order in items:
+            ItemParser(item, year=order_year(order), month=order_month(order)).as_dict()
+    return len(items), run
+
+
+def _extractor_case(cls):
+    def setup(scale):
+        orders, _, _, client = dataset(scale)
+        extractor = cls()
+
+        def run():
+            for order in orders:
+                extractor.extract(order, client)
+        return len(orders), run
+    return setup
+
+
+def _register_extractors():
+    from extractors.charcuterie_board import CharcuterieBoardExtractor
+    from extractors.cheese_board import CheeseBoardExtractor
+    from extractors.countdown import HolidayCountdown
+    from extractors.thanksgiving_board import ThanksgivingBoardExtractor
+
+    for cls in (CheeseBoardExtractor, ThanksgivingBoardExtractor, CharcuterieBoardExtractor, HolidayCountdown):
+        case(f"extractors.{cls.__name__}", unit="orders")(_extractor_case(cls))
+
+
+_register_extractors()
+
+
+# ---- tipout ----
+
+@case("tipout.aggregate_hours_and_tips_by_day", unit="payments")
+def bench_aggregate_by_day(scale):
+    from tipout.aggregation import aggregate_hours_and_tips_by_day
+
+    _, payments, timecards, client = dataset(scale)
+    return len(payments), lambda: aggregate_hours_and_tips_by_day(timecards, payments, client)
+
+
+@case("tipout.aggregate_tips_by_hour", unit="payments")
+def bench_aggregate_by_hour(scale):
+    from tipout.aggregation import aggregate_tips_by_hour
+
+    _, payments, _, client = dataset(scale)
+    return len(payments), lambda: aggregate_tips_by_hour(payments, client)
+
+
+@case("tipout.distribute_daily_tips", unit="payments")
+def bench_distribute_daily(scale):
+    from tipout.aggregation import aggregate_hours_and_tips_by_day
+    from tipout.distribution import distribute_daily_tips
+
+    _, payments, timecards, client = dataset(scale)
+    by_day = aggregate_hours_and_tips_by_day(timecards, payments, client)
+    return len(payments), lambda: distribute_daily_tips(by_day)
+
+
+@case("tipout.distribute_tips_by_clockin", unit="payments")
+def bench_distribute_clockin(scale):
+    from tipout.distribution import distribute_tips_by_clockin
+
+    _, payments, timecards, client = dataset(scale)
+    return len(payments), lambda: distribute_tips_by_clockin(payments, timecards, client)
+
+
+# ---- output ----
+
+RESULT_SHEETS = ["thanksgiving", "charcuterie", "cheese", "countdown"]
+
+
+@lru_cache(maxsize=None)
+def result_rows(scale, seed=11):
+    """
+    SCALES[scale] (sheet, row) extraction results shaped like the extractors'.
+    """
+    rng = random.Random(seed)
+    return [
+        (RESULT_SHEETS[i % len(RESULT_SHEETS)], {
+            "order_id": f"ORD{i:08d}",
+            "order_state": rng.choice(["OPEN", "COMPLETED"]),
+            "buyer_name": rng.choice(["Ada Lovelace", "Grace Hopper", "Alan Turing", None]),
+            "email": f"buyer{i}@example.com",
+            "phone": "+13155550100",
+            "item_name": "Thanksgiving Cheese Board",
+            "variation": rng.choice(["Small", "Large"]),
+            "qty": float(rng.randint(1, 3)),
+            "total": rng.choice([65.0, 120.0, 180.0]),
+            "pickup_date": date(2025, 11, rng.randint(24, 27)),
+            "pickup_time": time(rng.randint(10, 17), 0),
+            "allergies": rng.choice([None, "nuts", "none"]),
+            "extra_modifiers": rng.choice([[], ["Extra crackers"], ["Gift wrap", "Honeycomb"]]),
+        })
+        for i in range(SCALES[scale])
+    ]
+
+
+@case("utils.excel_writer.StreamingExcelWriter", unit="rows")
+def bench_excel_writer(scale):
+    from utils.excel_writer import StreamingExcelWriter
+
+    rows = result_rows(scale)
+    tmp = tempfile.TemporaryDirectory()
+
+    def run(tmp=tmp):
+        writer = StreamingExcelWriter(str(Path(tmp.name) / "out.xlsx"))
+        for sheet, row in rows:
+            writer.write(row, sheet=sheet)
+        writer.close()
+    return len(rows), run
+
+
+def _jsonl_case(suffix):
+    def setup(scale):
+        from utils.serialization import write_jsonl
+
+        rows = [row for _, row in result_rows(scale)]
+        tmp = tempfile.TemporaryDirectory()
+        path = str(Path(tmp.name) / f"out.jsonl{suffix}")
+
+        def run(tmp=tmp):
+            write_jsonl(rows, path)
+        return len(rows), run
+    return setup
+
+
+case("utils.serialization.write_jsonl", unit="rows")(_jsonl_case(""))
+case("utils.serialization.write_jsonl.gzip", unit="rows")(_jsonl_case(".gz"))
+
+
+# ---- warehouse ----
+
+# Boards are a small share of sales; café items make up the bulk. A few
+# hundred distinct names, like a real menu over two years.
+BOARD_ITEMS = ["Thanksgiving Cheese Board", "Cheese Board", "Charcuterie Board", "Holiday Countdown Calendar"]
+CAFE_ITEMS = ["Latte", "Cappuccino", "Drip Coffee", "Croissant", "Baguette", "Olive Mix", "Cornichons"]
+BOARD_SHARE = 0.02
+
+
+class _Obj(SimpleNamespace):
+    """
+    Attribute bag with the model_dump() the warehouse uses for raw JSON.
+    """
+
+    def model_dump(self, **kwargs):
+        return {k: (v.model_dump() if isinstance(v, _Obj) else
+                    [i.model_dump() for i in v] if isinstance(v, list) else v)
+                for k, v in vars(self).items()}
+
+
+def item_search_orders(n, days=730, seed=7):
+    rng = random.Random(seed)
+    boards = BOARD_ITEMS + [f"{name} {size}" for name in BOARD_ITEMS for size in range(30)]
+    cafe = CAFE_ITEMS + [f"{name} {size}" for name in CAFE_ITEMS for size in range(30)]
+    start = datetime(2024, 1, 1, tzinfo=timezone.utc)
+    for i in range(n):
+        created = (start + timedelta(seconds=rng.randrange(days * 86400))).isoformat()
+        items = [
+            _Obj(uid=str(j), name=rng.choice(boards if rng.random() < BOARD_SHARE else cafe),
+                 quantity="1", variation_name="Regular", catalog_object_id=None, modifiers=[],
+                 base_price_money=_Obj(amount=500), total_money=_Obj(amount=500))
+            for j in range(rng.randint(1, 4))
+        ]
+        yield _Obj(id=f"O{i}", location_id=f"L{i % 3}", state="COMPLETED", customer_id=None,
+                   version=1, created_at=created, updated_at=created, total_money=_Obj(amount=500),
+                   line_items=items, service_charges=[])
+
+
+@case("warehouse.orders_with_item", unit="orders")
+def bench_item_search(scale):
+    from warehouse import Warehouse
+
+    tmp = tempfile.TemporaryDirectory()
+    wh = Warehouse(Path(tmp.name) / "bench.sqlite")
+    n_orders = SCALES[scale] * 4
+    wh.upsert_orders(item_search_orders(n_orders))
+
+    def run(tmp=tmp):
+        wh.orders_with_item("cheese board")
+    return n_orders, run
+
+
+# ---- invoices ----
+
+@case("invoices.parse_food_matters_invoice", unit="pages")
+def bench_food_matters(scale):
+    import pdfplumber
+
+    from invoices.food_matters import parse_food_matters_invoice
+
+    with pdfplumber.open(INVOICE_PDF) as pdf:
+        pages = len(pdf.pages)
+    parses = INVOICE_PARSES[scale]
+
+    def run():
+        for _ in range(parses):
+            parse_food_matters_invoice(str(INVOICE_PDF))
+    return pages * parses, run
+
+
+def _invoice_extract_case(parse_name):
+    """
+    Table extraction alone: pdfminer's page interpretation (page.chars) is
+    done and cached in setup, so parsers can be compared without its noise.
+    """
+    def setup(scale):
+        import pdfplumber
+
+        from invoices import food_matters
+
+        parse = getattr(food_matters, parse_name)
+        pdf = pdfplumber.open(INVOICE_PDF)
+        for page in pdf.pages:
+            page.chars
+        parses = INVOICE_PARSES[scale] * 10
+
+        def run(pdf=pdf):
+            for _ in range(parses):
+                parse(pdf)
+        return len(pdf.pages) * parses, run
+    return setup
+
+
+case("invoices.parse_food_matters_layout", unit="pages")(_invoice_extract_case("parse_food_matters_layout"))
+case("invoices.parse_text_pages", unit="pages")(_invoice_extract_case("parse_text_pages"))
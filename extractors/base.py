@@ -1,5 +1,10 @@
 class BaseExtractor:
     KEYWORD = None
+    # Output sheet name for multi-sheet writers (see utils.excel_writer).
+    SHEET = None
+    # Bump when extract() output changes so checkpointed rows are
+    # regenerated (see utils.checkpoints).
+    VERSION = "2"
 
     def extract(self, order, client):
         raise NotImplementedError("Extractor must implement extract()")
@@ -14,6 +14,7 @@ def is_holiday_calendar(name: str) -> bool:
 
 class HolidayCountdown(BaseExtractor):
     KEYWORD = "holiday countdown"
+    SHEET = "countdown"
     def extract(self, order, client):
         results = []
 
@@ -34,6 +35,8 @@ class HolidayCountdown(BaseExtractor):
 
             results.append({
                 "order_id": order.id,
+                "created_at": getattr(order, "created_at", None),
+                "location_id": getattr(order, "location_id", None),
                 # "date_closed": getattr(order, "closed_at", None),
                 # "order_source": source_name,
                 "order_state": order.state,
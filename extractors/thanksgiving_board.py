@@ -1,9 +1,10 @@
 from .base import BaseExtractor
-from parsers.item_parser import ItemParser
+from parsers.item_parser import ItemParser, order_month, order_year
 from parsers.buyer_parser import extract_buyer_info
 
 class ThanksgivingBoardExtractor(BaseExtractor):
     KEYWORD = "thanksgiving cheese board"
+    SHEET = "thanksgiving"
 
     def extract(self, order, client):
         results = []
@@ -17,10 +18,12 @@ class ThanksgivingBoardExtractor(BaseExtractor):
             if item.name is None:
                 continue
             if self.KEYWORD in item.name.lower():
-                parser = ItemParser(item)
+                parser = ItemParser(item, year=order_year(order), month=order_month(order))
 
                 results.append({
                     "order_id": order.id,
+                    "created_at": getattr(order, "created_at", None),
+                    "location_id": getattr(order, "location_id", None),
                     "order_state": order.state,
                     "buyer_name": buyer_name,
                     "email": buyer_email,
@@ -1,17 +1,17 @@
 #!/usr/bin/env python3
 import os
 import argparse
-import pandas as pd
 from datetime import datetime, timezone
-from square import Square
-import json
+from utils.api_fixtures import add_fixture_arguments, require_explicit_dates, square_client_for
+from utils.api_stats import ApiStats, InstrumentedClient, add_stats_arguments
+from utils.profiling import add_profile_arguments, start_profiling
+from utils.tracing import tracer
 import re
-from square.types.search_orders_query import SearchOrdersQuery
-from square.types.search_orders_filter import SearchOrdersFilter
-from square.types.search_orders_date_time_filter import SearchOrdersDateTimeFilter
-from square.types.search_orders_sort import SearchOrdersSort
 # from square.types.sort_order import SortOrder
 
+from utils.excel_writer import write_excel
+from utils.serialization import with_suffix, write_json
+
 def extract_cheese_board_info(order, client):
     """
     Extracts key info (pickup date, size, allergy info, and buyer name)
@@ -96,11 +96,14 @@ def extract_cheese_board_info(order, client):
     return results
 
 
-def find_item_sales(client, item_name, start_iso, end_iso, location_ids):
+def search_orders(client, start_iso, end_iso, location_ids):
     """
-    Search orders in Square and return any line items that match a partial item name.
+    One page of orders created in the window, newest first; None on API error.
     """
-    matches = []
+    from square.types.search_orders_query import SearchOrdersQuery
+    from square.types.search_orders_filter import SearchOrdersFilter
+    from square.types.search_orders_date_time_filter import SearchOrdersDateTimeFilter
+    from square.types.search_orders_sort import SearchOrdersSort
 
     query = SearchOrdersQuery(
         filter=SearchOrdersFilter(
@@ -121,9 +124,22 @@ def find_item_sales(client, item_name, start_iso, end_iso, location_ids):
 
     if hasattr(resp, "errors") and resp.errors:
         print("⚠️ Error:", resp.errors)
-        return matches
+        return None
+    return getattr(resp, "orders", []) or []
+
+
+def find_item_sales(client, item_name, start_iso, end_iso, location_ids, orders=None):
+    """
+    Search orders in Square and return any line items that match a partial item name.
+    Pass `orders` to scan an already-narrowed set (e.g. from the warehouse) instead.
+    """
+    matches = []
+    if orders is None:
+        orders = search_orders(client, start_iso, end_iso, location_ids)
+        if orders is None:
+            return matches
+
     matches2 = []
-    orders = getattr(resp, "orders", []) or []
     for order in orders:
         order_id = order.id
         location_id = order.location_id
@@ -148,22 +164,36 @@ def find_item_sales(client, item_name, start_iso, end_iso, location_ids):
     return matches2
 
 
-def main():
+def main(argv=None, prog=None):
     parser = argparse.ArgumentParser(
+        prog=prog,
         description="Find all Square transactions containing a specific item."
     )
     parser.add_argument("--item", required=True, help="Partial name of the item to search for")
     parser.add_argument("--start", help="Start date (YYYY-MM-DD)", required=False)
     parser.add_argument("--end", help="End date (YYYY-MM-DD)", required=False)
     parser.add_argument("--output", help="CSV output filename", default="item_sales.csv")
-    args = parser.parse_args()
-
-    token = os.getenv("SQUARE_ACCESS_TOKEN") or "EAAAly8mEyanb9A8n_mDWkIXvzMj74XtZOM6gDTChMPpyBSro1CSFTqtw9uNF80D"
-    if not token:
-        raise RuntimeError("Missing SQUARE_ACCESS_TOKEN environment variable.")
-
-    client = Square(token=token)
-    locations = client.locations.list()
+    parser.add_argument("--compress", choices=["gzip", "zstd"], help="Compress the JSON output")
+    parser.add_argument("--warehouse", metavar="DB", help="Search a local warehouse instead of the API (see warehouse_sync.py)")
+    add_fixture_arguments(parser)
+    add_stats_arguments(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+    require_explicit_dates(parser, args, "--start", "--end")
+    start_profiling(args, "find_item_sales")
+
+    stats = ApiStats()
+    warehouse = None
+    if args.warehouse:
+        from warehouse import Warehouse, WarehouseClient
+        warehouse = Warehouse(args.warehouse)
+        client = WarehouseClient(warehouse)
+    else:
+        token = os.getenv("SQUARE_ACCESS_TOKEN") or "EAAAly8mEyanb9A8n_mDWkIXvzMj74XtZOM6gDTChMPpyBSro1CSFTqtw9uNF80D"
+        client = square_client_for(token, args.record, args.replay, args.replay_latency, args.base_url, stats=stats)
+    client = InstrumentedClient(client, stats)
+    with tracer.span("list locations"):
+        locations = client.locations.list()
 
     location_ids = [loc.id for loc in locations.locations] 
     print(f"📍 Found {len(location_ids)} locations: {', '.join(location_ids)}")
@@ -178,26 +208,34 @@ def main():
         if args.end else datetime.now(timezone.utc)
     )
 
-    matches = find_item_sales(client, args.item, start_dt.isoformat(), end_dt.isoformat(), location_ids)
+    with tracer.span("search and extract"):
+        orders = None
+        if warehouse is not None:
+            # Narrow to orders containing the item with one indexed query
+            orders = client.orders_with_item(args.item, start_dt.isoformat(), end_dt.isoformat(), location_ids)
+
+        matches = find_item_sales(client, args.item, start_dt.isoformat(), end_dt.isoformat(), location_ids, orders=orders)
     if not matches:
         print("❌ No matching transactions found.")
+        stats.report(args.api_stats)
         return
     
     # Save JSON
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    json_path = f"thanksgiving_orders_{timestamp}.json"
+    json_path = with_suffix(f"thanksgiving_orders_{timestamp}.json", args.compress)
     xlsx_path = f"thanksgiving_orders_{timestamp}.xlsx"
 
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(matches, f, indent=2, ensure_ascii=False)
+    with tracer.span("write json"):
+        write_json(matches, json_path)
 
-    # Convert to DataFrame and export to Excel
-    df = pd.DataFrame(matches)
-    df.to_excel(xlsx_path, index=False)
+    # Stream rows into a write-only workbook
+    with tracer.span("write excel"):
+        write_excel(matches, xlsx_path, sheet="cheese")
 
     print(f"\n💾 Saved {len(matches)} cheese board orders:")
     print(f" - JSON:  {json_path}")
     print(f" - Excel: {xlsx_path}")
+    stats.report(args.api_stats)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Match invoice lines to Square catalog items and report cost of goods per
+board type.
+
+Usage:
+    python invoice_costs.py --dir invoices/2025-11/ --output cogs.csv
+    python invoice_costs.py --import-confirmed invoice_match_suggestions.csv
+
+Descriptions scoring at least --confirm-above are mapped automatically. The
+rest are written to --suggestions for review; fill in or clear item_id,
+then load the file back with --import-confirmed.
+"""
+
+import argparse
+import os
+import sys
+
+import pandas as pd
+
+from invoices.batch import parse_invoice_batch, print_batch_report, resolve_invoice_paths
+from invoices.cache import DEFAULT_CACHE_PATH, InvoiceCache
+from invoices.catalog_match import (
+    DEFAULT_CONFIRM_SCORE,
+    DEFAULT_MAPPING_DB,
+    CatalogMatcher,
+    cogs_report,
+)
+
+
+def get_client():
+    token = os.getenv("SQUARE_ACCESS_TOKEN")
+    if not token:
+        return None
+    from utils.square_http import make_square_client
+
+    return make_square_client(token)
+
+
+def import_confirmed(matcher, path):
+    reviewed = pd.read_csv(path, dtype=str).fillna("")
+    rows = reviewed[["description", "item_id", "variation_id", "item_name"]].to_dict("records")
+    if "score" in reviewed:
+        for row, score in zip(rows, reviewed["score"]):
+            row["score"] = float(score) if score else None
+    matcher.confirm(rows)
+    print(f"✅ Imported {len(rows)} confirmed mappings from {path}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Invoice cost of goods per board type.")
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument("--file", help="Path to one invoice PDF.")
+    source.add_argument("--dir", help="Every PDF under this directory.")
+    source.add_argument("--glob", help="Every PDF matching this glob pattern.")
+    parser.add_argument("--import-confirmed", metavar="CSV", help="Load reviewed mappings before matching.")
+    parser.add_argument("--mapping-db", default=DEFAULT_MAPPING_DB,
+                        help=f"SQLite file for the catalog cache and confirmed mappings. Default: {DEFAULT_MAPPING_DB}")
+    parser.add_argument("--refresh-catalog", action="store_true", help="Refetch the Square catalog now.")
+    parser.add_argument("--confirm-above", type=int, default=DEFAULT_CONFIRM_SCORE,
+                        help=f"Auto-confirm matches scoring at least this (0-100). Default: {DEFAULT_CONFIRM_SCORE}")
+    parser.add_argument("--suggestions", default="invoice_match_suggestions.csv",
+                        help="Where to write unconfirmed matches for review.")
+    parser.add_argument("--output", help="Optional CSV path for the COGS report.")
+    parser.add_argument("--workers", type=int, default=None, help="Processes for invoice parsing.")
+    parser.add_argument("--cache", default=DEFAULT_CACHE_PATH,
+                        help=f"Parsed-invoice cache (SQLite), keyed by PDF hash + parser version. Default: {DEFAULT_CACHE_PATH}")
+    parser.add_argument("--no-cache", action="store_true", help="Always re-parse; don't read or write the cache.")
+    args = parser.parse_args()
+
+    matcher = CatalogMatcher(args.mapping_db)
+    try:
+        if args.import_confirmed:
+            import_confirmed(matcher, args.import_confirmed)
+
+        target = args.file or args.dir or args.glob
+        if not target:
+            return
+
+        catalog = matcher.load_catalog(get_client(), refresh=args.refresh_catalog)
+        if catalog.empty:
+            print("❌ No cached catalog. Set SQUARE_ACCESS_TOKEN to fetch it.")
+            sys.exit(1)
+
+        paths = resolve_invoice_paths(target)
+        cache = None if args.no_cache else InvoiceCache(args.cache)
+        try:
+            df, report = parse_invoice_batch(paths, workers=args.workers, cache=cache)
+        finally:
+            if cache is not None:
+                cache.close()
+        print_batch_report(report, cache=cache)
+        if df.empty:
+            print("⚠️ No line items were detected in any invoice.")
+            sys.exit(1)
+
+        suggestions = matcher.suggest(df["description"].unique(), catalog)
+        auto = suggestions[suggestions["item_id"].notna() & (suggestions["score"] >= args.confirm_above)]
+        if not auto.empty:
+            matcher.confirm(auto.to_dict("records"))
+            print(f"🔗 Auto-confirmed {len(auto)} descriptions scoring ≥ {args.confirm_above}")
+
+        review = suggestions.drop(auto.index)
+        if not review.empty:
+            review.to_csv(args.suggestions, index=False)
+            print(f"📝 {len(review)} descriptions need review: {args.suggestions}")
+
+        cogs = cogs_report(matcher.resolve(df))
+        print("\n" + cogs.to_string(index=False))
+        if args.output:
+            cogs.to_csv(args.output, index=False)
+            print(f"💾 Saved COGS report to {args.output}")
+    finally:
+        matcher.close()
+
+
+if __name__ == "__main__":
+    main()
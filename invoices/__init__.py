@@ -0,0 +1,29 @@
+"""
+Vendor invoice parsing.
+
+Usage:
+    python parse_invoices.py --dir invoices/2025-11/ --output november.csv
+"""
+import importlib
+
+# Re-exports resolve on first access: the parsers pull in pdfplumber and
+# pandas, which `import invoices.cache` (for DEFAULT_CACHE_PATH) shouldn't.
+_EXPORTS = {
+    "VendorParser": ".vendors",
+    "detect_vendor": ".vendors",
+    "parse_invoice": ".vendors",
+    "register_vendor": ".vendors",
+    "parse_food_matters_invoice": ".food_matters",
+    "parse_invoice_batch": ".batch",
+    "resolve_invoice_paths": ".batch",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
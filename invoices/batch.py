@@ -0,0 +1,192 @@
+"""
+Parse many invoice PDFs at once across a process pool.
+
+pdfplumber is pure Python and CPU bound, so processes (not threads) are what
+make a month of invoices scale with core count.
+"""
+
+import glob
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import pandas as pd
+
+from .cache import file_sha256
+from .vendors import parse_invoice
+
+
+def resolve_invoice_paths(target):
+    """
+    Expand a directory (every *.pdf inside, recursively) or a glob pattern
+    into a sorted list of PDF paths.
+    """
+    path = Path(target)
+    if path.is_dir():
+        return sorted(str(p) for p in path.rglob("*") if p.suffix.lower() == ".pdf")
+    if path.is_file():
+        return [str(path)]
+    return sorted(glob.glob(target, recursive=True))
+
+
+def error_result(pdf_path, error, seconds=0.0):
+    """
+    Report entry for a PDF that couldn't be parsed.
+    """
+    return {
+        "file": pdf_path,
+        "df": None,
+        "rows": 0,
+        "invoice_number": None,
+        "invoice_date": None,
+        "vendor": None,
+        "seconds": seconds,
+        "error": error,
+        "cached": False,
+    }
+
+
+def parse_one_invoice(pdf_path):
+    """
+    Worker entry point. Never raises: failures come back in the report so
+    one bad PDF doesn't take the batch down.
+    """
+    start = time.perf_counter()
+    try:
+        df = parse_invoice(pdf_path)
+        return {
+            "file": pdf_path,
+            "df": df,
+            "rows": len(df),
+            "invoice_number": df.attrs.get("invoice_number"),
+            "invoice_date": df.attrs.get("invoice_date"),
+            "vendor": df.attrs.get("vendor"),
+            "seconds": time.perf_counter() - start,
+            "error": None,
+            "cached": False,
+        }
+    except Exception as e:
+        return error_result(pdf_path, f"{type(e).__name__}: {e}", time.perf_counter() - start)
+
+
+def cached_result(pdf_path, cache):
+    """
+    Look a PDF up in an InvoiceCache. Returns (sha256, result-or-None).
+    """
+    start = time.perf_counter()
+    try:
+        sha = file_sha256(pdf_path)
+    except OSError:
+        return None, None  # let the parser report the error
+
+    df = cache.get(sha)
+    if df is None:
+        return sha, None
+    return sha, {
+        "file": pdf_path,
+        "df": df,
+        "rows": len(df),
+        "invoice_number": df.attrs.get("invoice_number"),
+        "invoice_date": df.attrs.get("invoice_date"),
+        "vendor": df.attrs.get("vendor"),
+        "seconds": time.perf_counter() - start,
+        "error": None,
+        "cached": True,
+    }
+
+
+def parse_cached(pdf_path, cache=None, parse=parse_one_invoice):
+    """
+    Parse a single PDF through the cache. Returns the worker result dict.
+    """
+    sha, res = cached_result(pdf_path, cache) if cache else (None, None)
+    if res is None:
+        res = parse(pdf_path)
+        if cache and sha and res["error"] is None:
+            cache.put(sha, res["df"], source_file=pdf_path)
+    return res
+
+
+def parse_invoice_batch(paths, workers=None, cache=None, parse=parse_one_invoice):
+    """
+    Parse every PDF in `paths` and return (df, report).
+
+    df has the usual invoice columns plus 'source_file', 'invoice_number',
+    'invoice_date' and 'vendor'. report has one entry per file (in input
+    order) with rows, seconds, error and whether it came from the cache.
+
+    With an InvoiceCache, files are hashed in this process and only misses
+    are sent to the pool; each result is stored as soon as it arrives, so
+    an interrupted batch keeps what it finished. A worker process that dies
+    (segfault, OOM kill) fails its files in the report instead of the batch.
+    """
+    workers = workers or os.cpu_count() or 1
+    results = {}
+    hashes = {}
+    todo = []
+
+    for p in paths:
+        if cache is not None:
+            sha, res = cached_result(p, cache)
+            hashes[p] = sha
+            if res is not None:
+                results[p] = res
+                continue
+        todo.append(p)
+
+    def done(p, res):
+        results[p] = res
+        if cache is not None and hashes.get(p) and res["error"] is None:
+            cache.put(hashes[p], res["df"], source_file=p)
+
+    if workers == 1 or len(todo) <= 1:
+        for p in todo:
+            done(p, parse(p))
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(todo))) as pool:
+            futures = {pool.submit(parse, p): p for p in todo}
+            for fut in as_completed(futures):
+                p = futures[fut]
+                try:
+                    res = fut.result()
+                except Exception as e:  # BrokenProcessPool when a worker dies
+                    res = error_result(p, f"{type(e).__name__}: {e}")
+                done(p, res)
+
+    frames = []
+    report = []
+    for p in paths:
+        res = results[p]
+        df = res.pop("df")
+        report.append(res)
+        if df is None or df.empty:
+            continue
+        frames.append(df.assign(
+            source_file=Path(p).name,
+            invoice_number=res["invoice_number"],
+            invoice_date=res["invoice_date"],
+            vendor=res["vendor"],
+        ))
+
+    combined = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+    return combined, report
+
+
+def print_batch_report(report, wall_seconds=None, cache=None):
+    print(f"\n{'File':<40} {'Vendor':<20} {'Invoice':>10} {'Rows':>6} {'Seconds':>8}  Status")
+    print("-" * 110)
+    for r in report:
+        status = f"❌ {r['error']}" if r["error"] else ("cached" if r.get("cached") else "ok")
+        print(f"{Path(r['file']).name[:40]:<40} {(r['vendor'] or '-')[:20]:<20} {r['invoice_number'] or '-':>10} "
+              f"{r['rows']:6d} {r['seconds']:8.2f}  {status}")
+    print("-" * 110)
+
+    failed = sum(1 for r in report if r["error"])
+    cpu = sum(r["seconds"] for r in report)
+    summary = f"{len(report) - failed}/{len(report)} parsed, {failed} failed, {cpu:.2f}s parse time"
+    if wall_seconds:
+        summary += f", {wall_seconds:.2f}s wall"
+    if cache is not None:
+        summary += f", {cache.summary()}"
+    print(summary)
@@ -0,0 +1,103 @@
+"""
+Parsed-invoice cache keyed by the SHA-256 of the PDF bytes and the parser
+version.
+
+Unchanged PDFs come back from SQLite without opening pdfplumber. The version
+is the combined VERSION of every registered vendor parser, so bumping any
+of them changes the key and stale entries are never served; they are pruned
+the next time the cache is opened.
+"""
+
+import hashlib
+import sqlite3
+from datetime import datetime
+from pathlib import Path
+
+from utils.serialization import dumps, loads
+
+DEFAULT_CACHE_PATH = ".invoice_cache.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS parsed_invoices (
+    sha256          TEXT NOT NULL,
+    parser_version  TEXT NOT NULL,
+    source_file     TEXT,
+    vendor          TEXT,
+    invoice_number  TEXT,
+    invoice_date    TEXT,
+    rows_json       BLOB NOT NULL,
+    parsed_at       TEXT NOT NULL,
+    PRIMARY KEY (sha256, parser_version)
+)
+"""
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+class InvoiceCache:
+    def __init__(self, path=DEFAULT_CACHE_PATH, parser_version=None):
+        from .vendors import registry_version
+
+        self.path = str(path)
+        self.parser_version = str(parser_version or registry_version())
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(self.path)
+        self.conn.execute(SCHEMA)
+        pruned = self.conn.execute(
+            "DELETE FROM parsed_invoices WHERE parser_version != ?", (self.parser_version,)
+        ).rowcount
+        self.conn.commit()
+        if pruned:
+            print(f"♻️  Dropped {pruned} cached invoices from older parser versions")
+
+    def get(self, sha256):
+        """
+        Return the cached DataFrame (with header attrs restored) or None.
+        """
+        row = self.conn.execute(
+            "SELECT vendor, invoice_number, invoice_date, rows_json FROM parsed_invoices "
+            "WHERE sha256 = ? AND parser_version = ?",
+            (sha256, self.parser_version),
+        ).fetchone()
+        if row is None:
+            self.misses += 1
+            return None
+
+        import pandas as pd
+
+        self.hits += 1
+        vendor, invoice_number, invoice_date, rows_json = row
+        df = pd.DataFrame(loads(rows_json))
+        df.attrs.update(invoice_number=invoice_number, invoice_date=invoice_date, vendor=vendor)
+        return df
+
+    def put(self, sha256, df, source_file=None):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO parsed_invoices VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                sha256,
+                self.parser_version,
+                Path(source_file).name if source_file else None,
+                df.attrs.get("vendor"),
+                df.attrs.get("invoice_number"),
+                df.attrs.get("invoice_date"),
+                dumps(df.to_dict("records")),
+                datetime.now().isoformat(timespec="seconds"),
+            ),
+        )
+        self.conn.commit()
+
+    def summary(self):
+        total = self.hits + self.misses
+        rate = (self.hits / total * 100) if total else 0.0
+        return f"cache: {self.hits} hits, {self.misses} misses ({rate:.0f}% hit rate)"
+
+    def close(self):
+        self.conn.close()
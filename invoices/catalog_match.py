@@ -0,0 +1,278 @@
+"""
+Match parsed invoice lines to the Square catalog items we sell and roll the
+cost up per board type.
+
+- The catalog (items + variations) is fetched once and kept in SQLite; it is
+  refreshed when older than CATALOG_MAX_AGE or on request.
+- Every distinct, not-yet-mapped invoice description is scored against every
+  catalog entry in one rapidfuzz.process.cdist call.
+- Confirmed mappings live in the same SQLite file, keyed by the normalized
+  description, so later invoices resolve with a plain dict lookup and never
+  reach the fuzzy scorer.
+"""
+
+import re
+import sqlite3
+from datetime import datetime, timedelta
+
+import numpy as np
+import pandas as pd
+from rapidfuzz import fuzz, process, utils as fuzz_utils
+
+from extractors import (
+    CharcuterieBoardExtractor,
+    CheeseBoardExtractor,
+    HolidayCountdown,
+    ThanksgivingBoardExtractor,
+)
+
+DEFAULT_MAPPING_DB = ".invoice_catalog.sqlite"
+CATALOG_MAX_AGE = timedelta(days=1)
+
+# Scores at or above this are confirmed without review.
+DEFAULT_CONFIRM_SCORE = 90
+# Below this the best candidate is not worth suggesting.
+DEFAULT_SUGGEST_SCORE = 60
+
+# Longest keyword first so "thanksgiving cheese board" wins over "cheese board".
+BOARD_KEYWORDS = sorted(
+    (e.KEYWORD for e in (
+        ThanksgivingBoardExtractor, CheeseBoardExtractor, CharcuterieBoardExtractor, HolidayCountdown
+    )),
+    key=len,
+    reverse=True,
+)
+UNASSIGNED = "other"
+
+# Supplier noise that never appears in our item names.
+_NOISE_RE = re.compile(r"\*\*.*?\*\*|\(.*?\)|\b\d+(?:\.\d+)?\s*(?:oz|lb|lbs|kg|g|ct|pk|#)\b", re.IGNORECASE)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS catalog_items (
+    variation_id    TEXT PRIMARY KEY,
+    item_id         TEXT NOT NULL,
+    item_name       TEXT NOT NULL,
+    variation_name  TEXT,
+    label           TEXT NOT NULL,
+    price           REAL
+);
+CREATE TABLE IF NOT EXISTS catalog_meta (
+    key    TEXT PRIMARY KEY,
+    value  TEXT
+);
+CREATE TABLE IF NOT EXISTS invoice_item_map (
+    description_key  TEXT PRIMARY KEY,
+    description      TEXT NOT NULL,
+    item_id          TEXT,
+    variation_id     TEXT,
+    item_name        TEXT,
+    score            REAL,
+    confirmed_at     TEXT NOT NULL
+);
+"""
+
+
+def normalize_description(description):
+    """
+    Mapping key for an invoice description: lowercased, pack sizes and
+    supplier notes stripped, whitespace collapsed.
+    """
+    text = _NOISE_RE.sub(" ", str(description or ""))
+    return fuzz_utils.default_process(text).strip()
+
+
+def board_type(item_name):
+    name = item_name.lower() if isinstance(item_name, str) else ""
+    for keyword in BOARD_KEYWORDS:
+        if keyword in name:
+            return keyword
+    return UNASSIGNED
+
+
+def fetch_catalog_items(client):
+    """
+    Every sellable item variation in the Square catalog as flat dicts.
+    """
+    items = []
+    for obj in client.catalog.list(types="ITEM"):
+        data = getattr(obj, "item_data", None)
+        if not data or getattr(obj, "is_deleted", False):
+            continue
+        for var in getattr(data, "variations", None) or []:
+            vdata = getattr(var, "item_variation_data", None)
+            vname = getattr(vdata, "name", None) if vdata else None
+            price = getattr(getattr(vdata, "price_money", None), "amount", None)
+            label = data.name if not vname or vname == "Regular" else f"{data.name} {vname}"
+            items.append({
+                "variation_id": var.id,
+                "item_id": obj.id,
+                "item_name": data.name,
+                "variation_name": vname,
+                "label": label,
+                "price": price / 100 if price is not None else None,
+            })
+    return items
+
+
+class CatalogMatcher:
+    def __init__(self, path=DEFAULT_MAPPING_DB):
+        self.path = str(path)
+        self.conn = sqlite3.connect(self.path)
+        self.conn.executescript(SCHEMA)
+        self._catalog = None
+        self._mappings = None
+
+    # ---- catalog cache ----
+
+    def catalog_age(self):
+        row = self.conn.execute("SELECT value FROM catalog_meta WHERE key = 'fetched_at'").fetchone()
+        if not row:
+            return None
+        return datetime.now() - datetime.fromisoformat(row[0])
+
+    def load_catalog(self, client=None, refresh=False):
+        """
+        Return the cached catalog, refetching it through `client` when it is
+        missing, stale or `refresh` is set.
+        """
+        age = self.catalog_age()
+        if client is not None and (refresh or age is None or age > CATALOG_MAX_AGE):
+            items = fetch_catalog_items(client)
+            with self.conn:
+                self.conn.execute("DELETE FROM catalog_items")
+                self.conn.executemany(
+                    "INSERT INTO catalog_items VALUES "
+                    "(:variation_id, :item_id, :item_name, :variation_name, :label, :price)",
+                    items,
+                )
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO catalog_meta VALUES ('fetched_at', ?)",
+                    (datetime.now().isoformat(timespec="seconds"),),
+                )
+            print(f"📚 Cached {len(items)} catalog variations")
+            self._catalog = None
+
+        if self._catalog is None:
+            self._catalog = pd.read_sql_query("SELECT * FROM catalog_items ORDER BY label", self.conn)
+        return self._catalog
+
+    # ---- confirmed mappings ----
+
+    def mappings(self):
+        if self._mappings is None:
+            rows = self.conn.execute(
+                "SELECT description_key, item_id, variation_id, item_name, score FROM invoice_item_map"
+            )
+            self._mappings = {
+                key: {"item_id": item_id, "variation_id": var_id, "item_name": name, "score": score}
+                for key, item_id, var_id, name, score in rows
+            }
+        return self._mappings
+
+    def confirm(self, rows):
+        """
+        Store confirmed mappings. `rows` are dicts with description,
+        item_id, variation_id, item_name and (optionally) score. An empty
+        item_id records "not a catalog item" so it stops being suggested.
+        """
+        now = datetime.now().isoformat(timespec="seconds")
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO invoice_item_map VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        normalize_description(r["description"]),
+                        r["description"],
+                        r.get("item_id") or None,
+                        r.get("variation_id") or None,
+                        r.get("item_name") or None,
+                        r.get("score"),
+                        now,
+                    )
+                    for r in rows
+                ],
+            )
+        self._mappings = None
+
+    # ---- matching ----
+
+    def suggest(self, descriptions, catalog=None, suggest_score=DEFAULT_SUGGEST_SCORE):
+        """
+        Best catalog candidate for each distinct description that has no
+        confirmed mapping yet. One cdist call scores all of them at once.
+        """
+        catalog = self.load_catalog() if catalog is None else catalog
+        known = self.mappings()
+
+        pending = {}
+        for desc in descriptions:
+            key = normalize_description(desc)
+            if key and key not in known and key not in pending:
+                pending[key] = desc
+
+        columns = ["description", "item_id", "variation_id", "item_name", "label", "score"]
+        if not pending or catalog.empty:
+            return pd.DataFrame(columns=columns)
+
+        keys = list(pending)
+        labels = [normalize_description(label) for label in catalog["label"]]
+        scores = process.cdist(
+            keys, labels, scorer=fuzz.token_set_ratio, dtype=np.uint8, workers=-1
+        )
+        best = scores.argmax(axis=1)
+        best_score = scores[np.arange(len(keys)), best]
+
+        out = []
+        for key, idx, score in zip(keys, best, best_score):
+            hit = catalog.iloc[idx] if score >= suggest_score else None
+            out.append({
+                "description": pending[key],
+                "item_id": hit["item_id"] if hit is not None else None,
+                "variation_id": hit["variation_id"] if hit is not None else None,
+                "item_name": hit["item_name"] if hit is not None else None,
+                "label": hit["label"] if hit is not None else None,
+                "score": int(score),
+            })
+        return pd.DataFrame(out, columns=columns).sort_values("score", ascending=False, ignore_index=True)
+
+    def resolve(self, df):
+        """
+        Attach item_id, item_name and board_type to parsed invoice rows using
+        confirmed mappings only.
+        """
+        known = self.mappings()
+        keys = df["description"].map(normalize_description)
+        mapped = keys.map(lambda k: known.get(k) or {})
+        out = df.assign(
+            item_id=mapped.map(lambda m: m.get("item_id")),
+            item_name=mapped.map(lambda m: m.get("item_name")),
+        )
+        out["board_type"] = out["item_name"].map(board_type)
+        return out
+
+    def close(self):
+        self.conn.close()
+
+
+def cogs_report(resolved):
+    """
+    Cost of goods per board type from resolve() output. Unmapped lines are
+    counted separately so missing mappings are visible.
+    """
+    df = resolved.assign(
+        total=pd.to_numeric(resolved["total"], errors="coerce").fillna(0.0),
+        mapped=resolved["item_id"].notna(),
+    )
+    report = (
+        df.groupby("board_type")
+        .agg(
+            lines=("description", "size"),
+            mapped_lines=("mapped", "sum"),
+            items=("item_id", "nunique"),
+            cost=("total", "sum"),
+        )
+        .reset_index()
+        .sort_values("cost", ascending=False, ignore_index=True)
+    )
+    report["cost"] = report["cost"].round(2)
+    return report
@@ -0,0 +1,292 @@
+"""
+Food Matters Again invoice parser.
+"""
+
+import re
+
+import pandas as pd
+import pdfplumber
+from pdfplumber.utils import extract_words
+
+from .vendors import VendorParser, register_vendor
+
+VENDOR = "Food Matters Again"
+
+# Bump whenever parsing output changes; invoices/cache.py keys on it.
+PARSER_VERSION = "2"
+
+INVOICE_NUMBER_RE = re.compile(r"INVOICE\s*#\s*(\d+)", re.IGNORECASE)
+# Also matches the raw char stream, where words run together ("DATE11/06/2025").
+INVOICE_DATE_RE = re.compile(r"(?<!DUE )(?<!SHIP )DATE\s*(\d{1,2})/(\d{1,2})/(\d{4})")
+PACK_RE = re.compile(r"(\d+\/[0-9.\sA-Za-z]+)")
+
+# Text that marks the end of the line-item table on the last page.
+FOOTER_MARKERS = ("Thank you", "BALANCE DUE")
+
+# Gap (pt) left of the QTY header before which a word counts as description.
+NUMERIC_GUTTER = 15
+
+
+def parse_invoice_header(text):
+    """
+    Pull (invoice_number, invoice_date) out of the first page's text (or its
+    raw char stream).
+    invoice_date is returned as YYYY-MM-DD; either value may be None.
+    """
+    number = INVOICE_NUMBER_RE.search(text or "")
+    when = INVOICE_DATE_RE.search(text or "")
+    invoice_date = None
+    if when:
+        month, day, year = when.groups()
+        invoice_date = f"{year}-{int(month):02d}-{int(day):02d}"
+    return (number.group(1) if number else None), invoice_date
+
+
+def make_row(desc, qty, rate, total, continuation=""):
+    # detect optional pack info (only on the first line; wrapped lines are
+    # promo notes like "$1.50/lb" that would look like a pack)
+    pack_match = PACK_RE.search(desc)
+    pack = pack_match.group(1).strip() if pack_match else ""
+    desc_clean = desc.replace(pack, "").strip()
+    if continuation:
+        desc_clean = f"{desc_clean} {continuation}"
+
+    return {
+        "description": desc_clean,
+        "pack": pack,
+        "qty": qty,
+        "unit_price": rate,
+        "total": total
+    }
+
+
+def _find_phrase(chars, text, phrase, start=0, top=None):
+    """
+    Find `phrase` in the concatenated char stream and return its first char,
+    optionally only on the same baseline as `top`.
+    """
+    idx = text.find(phrase, start)
+    while idx != -1:
+        c = chars[idx]
+        if top is None or abs(c["top"] - top) < 2:
+            return idx, c
+        idx = text.find(phrase, idx + 1)
+    return -1, None
+
+
+def locate_table(page):
+    """
+    Locate the line-item table on a page from its raw chars, without any
+    word or line extraction.
+
+    Returns {"top", "bottom", "header_bottom", "columns": {name: (x0, x1)},
+    "preamble"} or None when the page has no DESCRIPTION/QTY/RATE/AMOUNT
+    header row. "preamble" is the raw char text before the header.
+    """
+    chars = page.chars
+    text = "".join(c["text"] for c in chars)
+
+    idx, desc = _find_phrase(chars, text, "DESCRIPTION")
+    if desc is None:
+        return None
+
+    columns = {"description": (desc["x0"], None)}
+    for name in ("QTY", "RATE", "AMOUNT"):
+        i, c = _find_phrase(chars, text, name, idx, top=desc["top"])
+        if c is None:
+            return None
+        last = chars[i + len(name) - 1]
+        columns[name.lower()] = (c["x0"], last["x1"])
+
+    bottom = page.height
+    for marker in FOOTER_MARKERS:
+        _, c = _find_phrase(chars, text, marker, idx)
+        if c is not None:
+            bottom = min(bottom, c["top"])
+
+    return {
+        "top": desc["top"],
+        "bottom": bottom,
+        "header_bottom": desc["bottom"],
+        "columns": columns,
+        "preamble": text[:idx],
+    }
+
+
+def _group_lines(words, tolerance=3):
+    lines = []
+    for w in sorted(words, key=lambda w: (w["top"], w["x0"])):
+        if lines and abs(lines[-1][0] - w["top"]) <= tolerance:
+            lines[-1][1].append(w)
+        else:
+            lines.append((w["top"], [w]))
+    return [sorted(ws, key=lambda w: w["x0"]) for _, ws in lines]
+
+
+def _parse_number(text):
+    try:
+        return float(text.replace(",", "").replace("$", ""))
+    except ValueError:
+        return None
+
+
+def parse_table_words(words, columns):
+    """
+    Assign words to columns by x position and rebuild rows. Numbers are
+    right aligned under their header, so each numeric word goes to the column
+    whose header right edge is nearest. A line with no numbers continues the
+    description of the row above it.
+    """
+    numeric = {name: x1 for name, (_, x1) in columns.items() if name != "description"}
+    desc_end = columns["qty"][0] - NUMERIC_GUTTER
+
+    rows = []
+    for line in _group_lines(words):
+        desc_words = []
+        values = {}
+        for w in line:
+            num = _parse_number(w["text"]) if w["x0"] >= desc_end else None
+            if num is None:
+                desc_words.append(w["text"])
+                continue
+            col = min(numeric, key=lambda name: abs(numeric[name] - w["x1"]))
+            values[col] = num
+
+        desc = " ".join(desc_words)
+        if len(values) == len(numeric):
+            rows.append([desc, values["qty"], values["rate"], values["amount"], ""])
+        elif not values and rows and desc:
+            rows[-1][4] = f"{rows[-1][4]} {desc}".strip()
+
+    return [make_row(*r) for r in rows]
+
+
+def parse_food_matters_layout(pdf):
+    """
+    Layout-aware parse of an open pdfplumber PDF.
+
+    The table's columns are fixed from the first header row found. Every
+    page is checked for a header from its raw chars; pages without one are
+    skipped, and only the chars between the header and the footer are
+    clustered into words. Returns (rows, header_text), or None if no page has a
+    table header.
+    """
+    columns = None
+    header_text = ""
+    rows = []
+
+    for page in pdf.pages:
+        table = locate_table(page)
+        if table is None:
+            continue
+
+        if columns is None:
+            columns = table["columns"]
+            # Invoice number/date live above the table on the first page.
+            header_text = table["preamble"]
+
+        # Filtering the already-parsed chars is cheaper than page.crop() or
+        # within_bbox(), which copy every object on the page.
+        body = [c for c in page.chars
+                if c["top"] >= table["header_bottom"] and c["bottom"] <= table["bottom"]]
+        if body:
+            rows.extend(parse_table_words(extract_words(body), columns))
+
+    if columns is None:
+        return None
+    return rows, header_text
+
+
+def parse_food_matters_invoice(pdf_path: str) -> pd.DataFrame:
+    """
+    Parse a Food Matters Again invoice PDF into a structured DataFrame.
+    Returns columns: ['description', 'pack', 'qty', 'unit_price', 'total']
+
+    The invoice number, date and vendor from the header are attached as
+    df.attrs["invoice_number"], df.attrs["invoice_date"] and df.attrs["vendor"].
+    """
+    with pdfplumber.open(pdf_path) as pdf:
+        parsed = parse_food_matters_layout(pdf)
+
+    if parsed is None:
+        return parse_food_matters_text(pdf_path)
+
+    rows, header_text = parsed
+    invoice_number, invoice_date = parse_invoice_header(header_text)
+
+    df = pd.DataFrame(rows)
+    df.attrs.update(invoice_number=invoice_number, invoice_date=invoice_date, vendor=VENDOR)
+    return df
+
+
+def parse_food_matters_text(pdf_path: str) -> pd.DataFrame:
+    """
+    Line-by-line fallback: full-page extract_text, a keyword blacklist and a
+    regex per line. Used when no table header can be located. Wrapped
+    descriptions lose their continuation lines here.
+    """
+    with pdfplumber.open(pdf_path) as pdf:
+        rows, header_text = parse_text_pages(pdf)
+
+    invoice_number, invoice_date = parse_invoice_header(header_text)
+    df = pd.DataFrame(rows)
+    df.attrs.update(invoice_number=invoice_number, invoice_date=invoice_date, vendor=VENDOR)
+    return df
+
+
+def parse_text_pages(pdf):
+    """
+    Text-based parse of an open pdfplumber PDF. Returns (rows, first_page_text).
+    """
+    rows = []
+    header_text = ""
+    line_pattern = re.compile(
+        r"^(?P<desc>.+?)\s+(?P<qty>\d+(?:\.\d+)?)\s+(?P<rate>\d{1,3}(?:,\d{3})*(?:\.\d+)?)\s+(?P<total>\d{1,3}(?:,\d{3})*(?:\.\d+)?)$"
+    )
+
+    for page in pdf.pages:
+        text = page.extract_text()
+        if not text:
+            continue
+
+        if page.page_number == 1:
+            header_text = text
+
+        for raw in text.splitlines():
+            line = raw.strip()
+            if not line:
+                continue
+
+            # ignore headers/footers and irrelevant lines
+            if any(keyword in line.upper() for keyword in [
+                "DESCRIPTION", "RATE", "AMOUNT", "DATE", "INVOICE",
+                "BALANCE DUE", "THANK YOU", "CLAIMS", "PLEASE", "TERMS"
+            ]):
+                continue
+
+            # match pattern ending in 3 numeric fields
+            m = line_pattern.search(line)
+            if not m:
+                continue
+
+            desc = m.group("desc").strip()
+            qty = float(m.group("qty"))
+            rate = float(m.group("rate").replace(",", ""))
+            total = float(m.group("total").replace(",", ""))
+
+            rows.append(make_row(desc, qty, rate, total))
+
+    return rows, header_text
+
+
+@register_vendor
+class FoodMattersParser(VendorParser):
+    NAME = VENDOR
+    VERSION = PARSER_VERSION
+
+    def matches(self, header_text):
+        text = header_text.lower()
+        return "food matters again" in text or "foodmattersagain.com" in text
+
+    def parse(self, pdf_path):
+        return parse_food_matters_invoice(pdf_path)
@@ -0,0 +1,108 @@
+"""
+Registry of vendor invoice parsers.
+
+Each vendor parser has a cheap fingerprint check that only sees the
+first page's header text. detect_vendor() opens page one alone, asks each
+registered parser whether it recognises it, and parse_invoice() hands the
+full parse to the first one that does.
+
+Adding a vendor:
+    1. Create invoices/<vendor>.py with a VendorParser subclass decorated
+       with @register_vendor (see invoices/food_matters.py).
+    2. Add the module to VENDOR_MODULES below.
+"""
+
+import importlib
+
+import pdfplumber
+
+VENDOR_MODULES = [
+    "invoices.food_matters",
+]
+
+# Fraction of page one (from the top) that fingerprints get to see.
+HEADER_FRACTION = 0.35
+
+VENDOR_PARSERS = []
+
+
+class UnknownVendorError(Exception):
+    pass
+
+
+class VendorParser:
+    NAME = None
+    # Bump whenever this vendor's parse output changes (see invoices/cache.py).
+    VERSION = "1"
+
+    def matches(self, header_text):
+        """
+        Return True if the first-page header text belongs to this vendor.
+        Must be cheap: it runs for every PDF against every vendor.
+        """
+        raise NotImplementedError("Vendor parser must implement matches()")
+
+    def parse(self, pdf_path):
+        """
+        Return a DataFrame with columns description, pack, qty, unit_price,
+        total and df.attrs invoice_number / invoice_date / vendor.
+        """
+        raise NotImplementedError("Vendor parser must implement parse()")
+
+
+def register_vendor(cls):
+    VENDOR_PARSERS.append(cls())
+    return cls
+
+
+_loaded = False
+
+
+def load_vendor_parsers():
+    global _loaded
+    if not _loaded:
+        for module in VENDOR_MODULES:
+            importlib.import_module(module)
+        _loaded = True
+    return VENDOR_PARSERS
+
+
+def registry_version():
+    """
+    Combined version of every registered parser, used as the cache key so
+    a change to any vendor invalidates cached results.
+    """
+    return "+".join(f"{p.NAME}:{p.VERSION}" for p in load_vendor_parsers())
+
+
+def first_page_header(pdf_path):
+    """
+    Raw text of the top of page one. Only that page is loaded, and only its
+    chars are read (no word/line extraction).
+    """
+    with pdfplumber.open(pdf_path, pages=[1]) as pdf:
+        if not pdf.pages:
+            return ""
+        page = pdf.pages[0]
+        cutoff = page.height * HEADER_FRACTION
+        return "".join(c["text"] for c in page.chars if c["top"] < cutoff)
+
+
+def detect_vendor(pdf_path, header_text=None):
+    if header_text is None:
+        header_text = first_page_header(pdf_path)
+    for vendor in load_vendor_parsers():
+        if vendor.matches(header_text):
+            return vendor
+    return None
+
+
+def parse_invoice(pdf_path):
+    """
+    Detect the vendor from page one and dispatch the full parse.
+    """
+    vendor = detect_vendor(pdf_path)
+    if vendor is None:
+        names = ", ".join(p.NAME for p in load_vendor_parsers())
+        raise UnknownVendorError(f"No vendor parser matches this invoice (known: {names})")
+    return vendor.parse(pdf_path)
@@ -0,0 +1,10 @@
+"""
+Synthetic Square data and a local mock of the Square API, for load and
+concurrency testing without production.
+
+Usage:
+    python mock_square_server.py --db mock_square.sqlite --generate --days 365 --orders-per-day 1500
+    python mock_square_server.py --db mock_square.sqlite --latency 80 --rate-429 0.02
+"""
+from .generator import Record, SyntheticData, generate
+from .server import MockSquare, MockSquareServer
@@ -0,0 +1,275 @@
+"""
+Synthetic Square data, written into a warehouse so the mock server (and
+WarehouseClient) can serve it.
+
+Each generated day at each location has:
+- shifts for a handful of team members: CLOSED timecards with a wage,
+  declared cash tips, and an unpaid 30 minute break on shifts over six hours
+- orders spread over opening hours: café items, plus a small share of board
+  orders carrying pickup/allergy modifiers and a customer
+- auto-gratuity service charges on large orders
+- one card payment per completed order, credited to someone on shift, with a
+  tip on most of them
+
+Everything derives from `seed`, so the same arguments give the same data.
+Volume is locations x days x orders_per_day orders and about as many
+payments; 2 locations x 365 days x 1500 orders/day is ~1.1M payments.
+"""
+
+import random
+from datetime import date, datetime, time, timedelta, timezone
+
+from warehouse.rollups import LOCAL_TZ
+
+CAFE_ITEMS = [
+    ("Latte", "Regular", 525), ("Latte", "Large", 625), ("Cappuccino", "Regular", 495),
+    ("Drip Coffee", "Regular", 325), ("Croissant", "Regular", 450), ("Baguette", "Regular", 550),
+    ("Olive Mix", "Half Pint", 850), ("Cornichons", "Jar", 995), ("Brie Wedge", "Per Piece", 1295),
+]
+BOARD_ITEMS = [
+    ("Cheese Board", "Small", 6500), ("Cheese Board", "Large", 9500),
+    ("Charcuterie Board", "Small", 7000), ("Charcuterie Board", "Large", 10500),
+    ("Thanksgiving Cheese Board", "Large", 12000),
+]
+PICKUP_TIMES = ["10am", "11:30 am", "noon", "2pm", "3:30 pm", "5pm"]
+ALLERGY_NOTES = ["Allergies: tree nuts", "Allergies: none", "no pork please", "Gluten free crackers"]
+FIRST_NAMES = ["Ana", "Ben", "Cleo", "Dev", "Eli", "Fay", "Gus", "Hana", "Ivo", "Jun", "Kai", "Lu", "Mo", "Nia"]
+LAST_NAMES = ["Alvarez", "Brooks", "Chen", "Diaz", "Evans", "Fox", "Gupta", "Hale", "Ito", "Jones"]
+
+BOARD_SHARE = 0.03
+AUTO_GRATUITY_SHARE = 0.02
+TIP_SHARE = 0.7
+OPEN_HOUR, CLOSE_HOUR = 7, 19
+
+
+class Record:
+    """
+    Dict with attribute access, shaped like an SDK model as far as the
+    warehouse upserts are concerned (getattr + model_dump).
+    """
+
+    __slots__ = ("_data",)
+
+    def __init__(self, data):
+        self._data = data
+
+    def __getattr__(self, name):
+        try:
+            value = self._data[name]
+        except KeyError:
+            raise AttributeError(name) from None
+        if isinstance(value, dict):
+            return Record(value)
+        if isinstance(value, list):
+            return [Record(v) if isinstance(v, dict) else v for v in value]
+        return value
+
+    def model_dump(self, **kwargs):
+        return self._data
+
+
+def _money(cents):
+    return {"amount": cents, "currency": "USD"}
+
+
+def _iso(local_dt):
+    return local_dt.astimezone(timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+
+class SyntheticData:
+    def __init__(self, locations=2, team_members=18, customers=5000, start="2025-01-01",
+                 days=365, orders_per_day=150, seed=7):
+        self.rng = random.Random(seed)
+        self.start = date.fromisoformat(start)
+        self.days = days
+        self.orders_per_day = orders_per_day
+        self.locations = [
+            {"id": f"LOC{i:03d}", "name": f"Shop {i + 1}", "timezone": "America/New_York",
+             "status": "ACTIVE", "currency": "USD"}
+            for i in range(locations)
+        ]
+        self.team_members = []
+        for i in range(team_members):
+            loc = self.locations[i % locations]
+            self.team_members.append({
+                "id": f"TM{i:04d}",
+                "given_name": self.rng.choice(FIRST_NAMES),
+                "family_name": self.rng.choice(LAST_NAMES),
+                "status": "ACTIVE",
+                "is_owner": False,
+                "assigned_locations": {"assignment_type": "EXPLICIT_LOCATIONS", "location_ids": [loc["id"]]},
+            })
+        self.customers = [
+            {"id": f"CUST{i:06d}",
+             "given_name": self.rng.choice(FIRST_NAMES),
+             "family_name": self.rng.choice(LAST_NAMES),
+             "email_address": f"customer{i}@example.com",
+             "phone_number": f"+1555{i:07d}"}
+            for i in range(customers)
+        ]
+        self._ids = 0
+
+    def _id(self, prefix):
+        self._ids += 1
+        return f"{prefix}{self._ids:09d}"
+
+    def _staff(self, location_id):
+        return [tm for tm in self.team_members if location_id in tm["assigned_locations"]["location_ids"]]
+
+    def timecards(self, location_id, day):
+        """
+        A morning and an afternoon crew; managers (the first team member of
+        each location) are not tip eligible.
+        """
+        rng = self.rng
+        staff = self._staff(location_id)
+        crew = rng.sample(staff, min(len(staff), rng.randint(4, 7)))
+        shifts = []
+        for n, tm in enumerate(crew):
+            start_hour = OPEN_HOUR - 1 if n % 2 == 0 else 12
+            start = datetime.combine(day, time(start_hour, rng.choice([0, 15, 30])), LOCAL_TZ)
+            end = start + timedelta(hours=rng.uniform(4, 8.5))
+            breaks = []
+            if end - start > timedelta(hours=6):
+                b_start = start + timedelta(hours=4)
+                breaks.append({
+                    "id": self._id("BRK"), "start_at": _iso(b_start), "end_at": _iso(b_start + timedelta(minutes=30)),
+                    "break_type_id": "LUNCH", "name": "Lunch", "expected_duration": "PT30M", "is_paid": False,
+                })
+            eligible = tm is not staff[0]
+            shifts.append({
+                "id": self._id("TC"),
+                "location_id": location_id,
+                "team_member_id": tm["id"],
+                "start_at": _iso(start),
+                "end_at": _iso(end),
+                "breaks": breaks,
+                "wage": {"title": "Barista" if eligible else "Manager",
+                         "hourly_rate": _money(1800 if eligible else 2600), "tip_eligible": eligible},
+                "declared_cash_tip_money": _money(rng.randrange(0, 4000, 25) if eligible else 0),
+                "status": "CLOSED",
+                "version": 1,
+            })
+        return shifts
+
+    def _line_items(self, created):
+        rng = self.rng
+        items = []
+        board = rng.random() < BOARD_SHARE
+        picks = [rng.choice(BOARD_ITEMS)] if board else []
+        picks += [rng.choice(CAFE_ITEMS) for _ in range(rng.randint(0 if board else 1, 3))]
+        for n, (name, variation, price) in enumerate(picks):
+            qty = 1 if (name, variation, price) in BOARD_ITEMS else rng.randint(1, 2)
+            modifiers = []
+            if (name, variation, price) in BOARD_ITEMS:
+                pickup = created + timedelta(days=rng.randint(1, 10))
+                modifiers = [
+                    {"uid": f"m{n}a", "name": f"Pickup {pickup:%b} {pickup.day}", "total_price_money": _money(0)},
+                    {"uid": f"m{n}b", "name": f"Pickup time {rng.choice(PICKUP_TIMES)}",
+                     "total_price_money": _money(0)},
+                ]
+                if rng.random() < 0.3:
+                    modifiers.append({"uid": f"m{n}c", "name": rng.choice(ALLERGY_NOTES),
+                                      "total_price_money": _money(0)})
+            items.append({
+                "uid": f"li{n}",
+                "name": name,
+                "variation_name": variation,
+                "quantity": str(qty),
+                "catalog_object_id": f"VAR_{name.replace(' ', '_').upper()}_{variation.replace(' ', '_').upper()}",
+                "base_price_money": _money(price),
+                "total_money": _money(price * qty),
+                "modifiers": modifiers,
+            })
+        return items, board
+
+    def orders_and_payments(self, location_id, day, timecards):
+        rng = self.rng
+        orders, payments = [], []
+        open_at = datetime.combine(day, time(OPEN_HOUR), LOCAL_TZ)
+        span = (CLOSE_HOUR - OPEN_HOUR) * 3600
+        on_shift = [(tc["team_member_id"], tc["start_at"], tc["end_at"]) for tc in timecards
+                    if tc["wage"]["tip_eligible"]]
+
+        for _ in range(self.orders_per_day):
+            created = open_at + timedelta(seconds=rng.randrange(span))
+            items, board = self._line_items(created)
+            subtotal = sum(li["total_money"]["amount"] for li in items)
+            service_charges = []
+            if rng.random() < AUTO_GRATUITY_SHARE:
+                applied = round(subtotal * 0.2)
+                service_charges.append({
+                    "uid": "sc0", "name": "Auto Gratuity", "type": "AUTO_GRATUITY", "percentage": "20",
+                    "applied_money": _money(applied), "total_money": _money(applied),
+                    "calculation_phase": "SUBTOTAL_PHASE",
+                })
+            total = subtotal + sum(sc["applied_money"]["amount"] for sc in service_charges)
+            state = "COMPLETED" if rng.random() < 0.97 else rng.choice(["OPEN", "CANCELED"])
+            order_id = self._id("ORD")
+            order = {
+                "id": order_id,
+                "location_id": location_id,
+                "state": state,
+                "version": 1 if state == "OPEN" else 3,
+                "created_at": _iso(created),
+                "updated_at": _iso(created + timedelta(minutes=rng.randint(1, 20))),
+                "line_items": items,
+                "service_charges": service_charges,
+                "total_money": _money(total),
+            }
+            if board or rng.random() < 0.1:
+                order["customer_id"] = rng.choice(self.customers)["id"]
+            if state == "COMPLETED":
+                order["closed_at"] = order["updated_at"]
+            orders.append(order)
+
+            if state != "COMPLETED":
+                continue
+            tip = round(subtotal * rng.choice([0.1, 0.15, 0.18, 0.2, 0.25])) if rng.random() < TIP_SHARE else 0
+            paid_at = _iso(created + timedelta(seconds=rng.randint(20, 300)))
+            working = [tm for tm, start, end in on_shift if start <= paid_at < end]
+            payment = {
+                "id": self._id("PAY"),
+                "created_at": paid_at,
+                "updated_at": paid_at,
+                "amount_money": _money(total),
+                "tip_money": _money(tip),
+                "total_money": _money(total + tip),
+                "status": "COMPLETED",
+                "source_type": "CARD",
+                "location_id": location_id,
+                "order_id": order_id,
+            }
+            if working:
+                payment["team_member_id"] = rng.choice(working)
+            payments.append(payment)
+        return orders, payments
+
+    def days_iter(self):
+        for n in range(self.days):
+            yield self.start + timedelta(days=n)
+
+
+def generate(warehouse, progress=None, **options):
+    """
+    Fill `warehouse` with synthetic data (see SyntheticData for options).
+    Writes one transaction per table per location-day. Returns row counts.
+    """
+    data = SyntheticData(**options)
+    warehouse.upsert_locations([Record(loc) for loc in data.locations])
+    warehouse.upsert_team_members([Record(tm) for tm in data.team_members])
+    warehouse.upsert_customers([Record(c) for c in data.customers])
+
+    for n, day in enumerate(data.days_iter()):
+        for loc in data.locations:
+            timecards = data.timecards(loc["id"], day)
+            orders, payments = data.orders_and_payments(loc["id"], day, timecards)
+            warehouse.upsert_timecards([Record(tc) for tc in timecards])
+            warehouse.upsert_orders(Record(o) for o in orders)
+            warehouse.upsert_payments([Record(p) for p in payments])
+        if progress and (n + 1) % 30 == 0:
+            progress(n + 1, data.days)
+
+    warehouse.rollups.refresh()
+    warehouse.set_state("synthetic", ", ".join(f"{k}={v}" for k, v in sorted(options.items())))
+    return warehouse.counts()
@@ -0,0 +1,271 @@
+"""
+Local HTTP server that answers the Square API endpoints this repo calls,
+from a warehouse (real synced data or mock_square.generator output).
+
+    GET  /v2/locations
+    POST /v2/team-members/search
+    POST /v2/labor/timecards/search
+    GET  /v2/payments
+    POST /v2/orders/search
+    POST /v2/orders/batch-retrieve
+    GET  /v2/orders/{id}
+    GET  /v2/customers/{id}
+
+Lists page like Square: `limit` is capped at the endpoint's maximum and the
+response carries a `cursor` until the last page. A query's full result is
+computed once and kept for its follow-up pages. Every response can be delayed
+(`latency` + uniform `jitter`, seconds) and a share of requests (`rate_429`)
+is refused with 429 and Retry-After, which the SDK retries.
+
+Point the real client at it with Square(token="...", base_url=server.base_url).
+"""
+
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from utils.serialization import dumps
+from warehouse import Warehouse
+from warehouse.offline import _get
+
+# (default, maximum) page sizes per list endpoint, as documented by Square.
+PAGE_SIZES = {
+    "team_members": (100, 200),
+    "timecards": (200, 200),
+    "payments": (100, 100),
+    "orders": (500, 1000),
+}
+RESULT_CACHE_SIZE = 32
+
+
+def _error(code, category, detail):
+    return {"errors": [{"category": category, "code": code, "detail": detail}]}
+
+
+class MockSquare:
+    """
+    The API logic, independent of HTTP: route(method, path, query, body)
+    returns (status, payload). One warehouse connection is shared by all
+    request threads behind a lock.
+    """
+
+    def __init__(self, db, latency=0.0, jitter=0.0, rate_429=0.0, retry_after=1, seed=None):
+        self.warehouse = Warehouse(db, check_same_thread=False)
+        self.latency = latency
+        self.jitter = jitter
+        self.rate_429 = rate_429
+        self.retry_after = retry_after
+        self.rng = random.Random(seed)
+        self.requests = 0
+        self.throttled = 0
+        self._lock = threading.Lock()
+        self._results = OrderedDict()
+        self.routes = [
+            ("GET", re.compile(r"/v2/locations$"), self.list_locations),
+            ("POST", re.compile(r"/v2/team-members/search$"), self.search_team_members),
+            ("POST", re.compile(r"/v2/labor/timecards/search$"), self.search_timecards),
+            ("GET", re.compile(r"/v2/payments$"), self.list_payments),
+            ("POST", re.compile(r"/v2/orders/search$"), self.search_orders),
+            ("POST", re.compile(r"/v2/orders/batch-retrieve$"), self.batch_retrieve_orders),
+            ("GET", re.compile(r"/v2/orders/(?P<order_id>[^/]+)$"), self.get_order),
+            ("GET", re.compile(r"/v2/customers/(?P<customer_id>[^/]+)$"), self.get_customer),
+        ]
+
+    # ---- plumbing ----
+
+    def delay(self):
+        wait = self.latency + (self.rng.uniform(0, self.jitter) if self.jitter else 0)
+        if wait > 0:
+            time.sleep(wait)
+
+    def throttle(self):
+        with self._lock:
+            self.requests += 1
+            if self.rate_429 and self.rng.random() < self.rate_429:
+                self.throttled += 1
+                return True
+        return False
+
+    def route(self, method, path, query, body):
+        for verb, pattern, handler in self.routes:
+            m = pattern.match(path)
+            if verb == method and m:
+                with self._lock:
+                    return handler(query=query, body=body, **m.groupdict())
+        return 404, _error("NOT_FOUND", "INVALID_REQUEST_ERROR", f"{method} {path} is not mocked")
+
+    def _page(self, kind, key, compute, limit, cursor):
+        """
+        One page of a list result. `key` identifies the query without its
+        cursor; the cursor is "<result id>:<offset>".
+        """
+        default, maximum = PAGE_SIZES[kind]
+        limit = min(int(limit or default), maximum)
+        offset = 0
+        if cursor:
+            result_id, _, offset = cursor.rpartition(":")
+            offset = int(offset)
+            key = result_id
+        rows = self._results.get(key)
+        if rows is None:
+            rows = compute()
+            self._results[key] = rows
+            if len(self._results) > RESULT_CACHE_SIZE:
+                self._results.popitem(last=False)
+        else:
+            self._results.move_to_end(key)
+        end = offset + limit
+        payload = {kind: rows[offset:end]}
+        if end < len(rows):
+            payload["cursor"] = f"{key}:{end}"
+        return 200, payload
+
+    @staticmethod
+    def _key(kind, params):
+        return f"{kind}-{hashlib.sha1(json.dumps(params, sort_keys=True).encode()).hexdigest()[:12]}"
+
+    # ---- endpoints ----
+
+    def list_locations(self, query, body):
+        return 200, {"locations": self.warehouse.locations()}
+
+    def search_team_members(self, query, body):
+        f = _get(body, "query", "filter") or {}
+        return self._page(
+            "team_members", self._key("tm", f),
+            lambda: self.warehouse.team_members(f.get("location_ids"), f.get("status")),
+            body.get("limit"), body.get("cursor"),
+        )
+
+    def search_timecards(self, query, body):
+        f = _get(body, "query", "filter") or {}
+        return self._page(
+            "timecards", self._key("tc", f),
+            lambda: self.warehouse.timecards(
+                f.get("location_ids"), _get(f, "start", "start_at"), _get(f, "end", "end_at")
+            ),
+            body.get("limit"), body.get("cursor"),
+        )
+
+    def list_payments(self, query, body):
+        params = {k: v[0] for k, v in query.items()}
+        filters = {k: v for k, v in params.items() if k not in ("cursor", "limit")}
+        return self._page(
+            "payments", self._key("pay", filters),
+            lambda: self.warehouse.payments(
+                filters.get("location_id"), filters.get("begin_time"), filters.get("end_time")
+            ),
+            params.get("limit"), params.get("cursor"),
+        )
+
+    def search_orders(self, query, body):
+        q = body.get("query") or {}
+        created = _get(q, "filter", "date_time_filter", "created_at") or {}
+        updated = _get(q, "filter", "date_time_filter", "updated_at") or {}
+        sort_order = _get(q, "sort", "sort_order") or "DESC"
+        params = {"location_ids": body.get("location_ids"), "query": q}
+        return self._page(
+            "orders", self._key("ord", params),
+            lambda: self.warehouse.orders(
+                created.get("start_at"), created.get("end_at"), body.get("location_ids"),
+                descending=sort_order == "DESC", updated_since=updated.get("start_at"),
+            ),
+            body.get("limit"), body.get("cursor"),
+        )
+
+    def batch_retrieve_orders(self, query, body):
+        orders = [row for row in (self.warehouse.order(i) for i in body.get("order_ids") or []) if row]
+        return 200, {"orders": orders}
+
+    def get_order(self, query, body, order_id):
+        row = self.warehouse.order(order_id)
+        if row is None:
+            return 404, _error("NOT_FOUND", "INVALID_REQUEST_ERROR", f"Order {order_id} not found")
+        return 200, {"order": row}
+
+    def get_customer(self, query, body, customer_id):
+        row = self.warehouse.customer(customer_id)
+        if row is None:
+            return 404, _error("NOT_FOUND", "INVALID_REQUEST_ERROR", f"Customer {customer_id} not found")
+        return 200, {"customer": row}
+
+    def close(self):
+        self.warehouse.close()
+
+
+def make_handler(api, verbose=False):
+    class MockSquareHandler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"  # keep-alive, like the real API
+        # Buffer headers and body into one send; separate small writes on a
+        # keep-alive socket hit Nagle + delayed ACK (~40ms per request).
+        wbufsize = -1
+
+        def _respond(self, status, payload, headers=()):
+            body = dumps(payload)
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            for name, value in headers:
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _handle(self, method):
+            url = urlparse(self.path)
+            length = int(self.headers.get("Content-Length") or 0)
+            raw = self.rfile.read(length) if length else b""
+            api.delay()
+            if api.throttle():
+                self._respond(429, _error("RATE_LIMITED", "RATE_LIMIT_ERROR", "Injected rate limit"),
+                              [("Retry-After", str(api.retry_after))])
+                return
+            try:
+                body = json.loads(raw) if raw else {}
+            except ValueError:
+                self._respond(400, _error("INVALID_JSON", "INVALID_REQUEST_ERROR", "Body is not JSON"))
+                return
+            status, payload = api.route(method, url.path, parse_qs(url.query), body)
+            self._respond(status, payload)
+
+        def do_GET(self):
+            self._handle("GET")
+
+        def do_POST(self):
+            self._handle("POST")
+
+        def log_message(self, format, *args):
+            if verbose:
+                super().log_message(format, *args)
+
+    return MockSquareHandler
+
+
+class MockSquareServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, api, host="127.0.0.1", port=0, verbose=False):
+        super().__init__((host, port), make_handler(api, verbose))
+        self.api = api
+
+    @property
+    def base_url(self):
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self):
+        """
+        Serve from a background thread (benchmarks, tests). Returns self.
+        """
+        threading.Thread(target=self.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.shutdown()
+        self.server_close()
+        self.api.close()
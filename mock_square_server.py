@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Generate synthetic Square data and/or serve it through a local mock of the
+Square API.
+
+Usage:
+    python mock_square_server.py --db mock_square.sqlite --generate --days 365 --orders-per-day 1500 --generate-only
+    python mock_square_server.py --db mock_square.sqlite --latency 80 --jitter 40 --rate-429 0.02
+
+    # then, in another shell
+    python tipout_main.py --base-url http://127.0.0.1:8800 --date 2025-11-24
+"""
+
+import argparse
+import time
+
+from mock_square import MockSquare, MockSquareServer, generate
+from warehouse import Warehouse
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Synthetic Square data and a local mock API server.")
+    parser.add_argument("--db", default="mock_square.sqlite", help="Warehouse holding the mock data")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8800)
+
+    gen = parser.add_argument_group("data generation")
+    gen.add_argument("--generate", action="store_true", help="Generate synthetic data into --db first")
+    gen.add_argument("--generate-only", action="store_true", help="Generate and exit without serving")
+    gen.add_argument("--locations", type=int, default=2)
+    gen.add_argument("--team-members", type=int, default=18)
+    gen.add_argument("--customers", type=int, default=5000)
+    gen.add_argument("--start", default="2025-01-01", help="First generated local date (YYYY-MM-DD)")
+    gen.add_argument("--days", type=int, default=365)
+    gen.add_argument("--orders-per-day", type=int, default=150, help="Orders per location per day")
+    gen.add_argument("--seed", type=int, default=7)
+
+    srv = parser.add_argument_group("server behaviour")
+    srv.add_argument("--latency", type=float, default=0.0, help="Milliseconds added to every response")
+    srv.add_argument("--jitter", type=float, default=0.0, help="Extra random 0..N milliseconds per response")
+    srv.add_argument("--rate-429", type=float, default=0.0, help="Share of requests refused with 429 (0-1)")
+    srv.add_argument("--retry-after", type=int, default=1, help="Retry-After seconds sent with 429s")
+    srv.add_argument("--verbose", action="store_true", help="Log every request")
+    args = parser.parse_args()
+
+    if args.generate or args.generate_only:
+        print(f"🧪 Generating {args.locations} locations x {args.days} days x {args.orders_per_day} orders into {args.db}")
+        started = time.perf_counter()
+        warehouse = Warehouse(args.db)
+        try:
+            counts = generate(
+                warehouse,
+                progress=lambda done, total: print(f"  … {done}/{total} days"),
+                locations=args.locations, team_members=args.team_members, customers=args.customers,
+                start=args.start, days=args.days, orders_per_day=args.orders_per_day, seed=args.seed,
+            )
+        finally:
+            warehouse.close()
+        print(f"✅ Generated in {time.perf_counter() - started:.1f}s: "
+              + ", ".join(f"{n} {table}" for table, n in counts.items()))
+        if args.generate_only:
+            return
+
+    api = MockSquare(args.db, latency=args.latency / 1000, jitter=args.jitter / 1000,
+                     rate_429=args.rate_429, retry_after=args.retry_after)
+    server = MockSquareServer(api, args.host, args.port, verbose=args.verbose)
+    print(f"📡 Mock Square API on {server.base_url} (latency {args.latency:g}ms "
+          f"+ 0..{args.jitter:g}ms, 429 rate {args.rate_429:g})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"\nStopped after {api.requests} requests ({api.throttled} throttled).")
+    finally:
+        server.server_close()
+        api.close()
+
+
+if __name__ == "__main__":
+    main()
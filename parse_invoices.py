@@ -1,93 +1,118 @@
 #!/usr/bin/env python3
 """
-Parse a Food Matters Again invoice into structured tabular data.
+Parse vendor invoices (vendor detected from page one) into structured tabular data.
 
 Usage:
-    python parse_invoice.py --file "Invoice_9140577_from_Food_Matters_Again.pdf" --output "parsed_invoice.csv"
+    python parse_invoices.py --file "Invoice_9140577_from_Food_Matters_Again.pdf" --output "parsed_invoice.csv"
+    python parse_invoices.py --dir invoices/2025-11/ --workers 8 --output november.csv
+    python parse_invoices.py --glob "data/Invoice_*.pdf"
 """
 
-import pdfplumber
-import pandas as pd
-import re
 import argparse
 import sys
+import time
+from datetime import date
+from pathlib import Path
 
+from invoices.cache import DEFAULT_CACHE_PATH, InvoiceCache
+from utils.profiling import add_profile_arguments, start_profiling
+from utils.tracing import tracer
 
-def parse_food_matters_invoice(pdf_path: str) -> pd.DataFrame:
+
+def export_parquet(root, df, invoice_date=None):
     """
-    Parse a Food Matters Again invoice PDF into a structured DataFrame.
-    Returns columns: ['description', 'pack', 'qty', 'unit_price', 'total']
+    Export parsed rows to the Parquet history, one invoice at a time so each
+    lands in its own invoice_date partition. `df` carries the batch columns
+    (source_file, invoice_number, invoice_date, vendor).
     """
-    rows = []
-    line_pattern = re.compile(
-        r"^(?P<desc>.+?)\s+(?P<qty>\d+(?:\.\d+)?)\s+(?P<rate>\d{1,3}(?:,\d{3})*(?:\.\d+)?)\s+(?P<total>\d{1,3}(?:,\d{3})*(?:\.\d+)?)$"
-    )
-
-    with pdfplumber.open(pdf_path) as pdf:
-        for page in pdf.pages:
-            text = page.extract_text()
-            if not text:
-                continue
-
-            for raw in text.splitlines():
-                line = raw.strip()
-                if not line:
-                    continue
-
-                # ignore headers/footers and irrelevant lines
-                if any(keyword in line.upper() for keyword in [
-                    "DESCRIPTION", "RATE", "AMOUNT", "DATE", "INVOICE",
-                    "BALANCE DUE", "THANK YOU", "CLAIMS", "PLEASE", "TERMS"
-                ]):
-                    continue
-
-                # match pattern ending in 3 numeric fields
-                m = line_pattern.search(line)
-                if not m:
-                    continue
-
-                desc = m.group("desc").strip()
-                qty = float(m.group("qty"))
-                rate = float(m.group("rate").replace(",", ""))
-                total = float(m.group("total").replace(",", ""))
-
-                # detect optional pack info
-                pack_match = re.search(r"(\d+\/[0-9.\sA-Za-z]+)", desc)
-                pack = pack_match.group(1).strip() if pack_match else ""
-                desc_clean = desc.replace(pack, "").strip()
-
-                rows.append({
-                    "description": desc_clean,
-                    "pack": pack,
-                    "qty": qty,
-                    "unit_price": rate,
-                    "total": total
-                })
-
-    df = pd.DataFrame(rows)
-    return df
-
-
-def main():
+    from utils.parquet_export import export_invoice
+
+    header_cols = ["source_file", "invoice_number", "invoice_date", "vendor"]
+    for source_file, group in df.groupby("source_file", sort=False):
+        header = group.iloc[0][header_cols].where(group.iloc[0][header_cols].notna(), None)
+        export_invoice(
+            root,
+            group.drop(columns=header_cols),
+            invoice_date or header["invoice_date"] or date.today().isoformat(),
+            source_file=source_file,
+            invoice_number=header["invoice_number"],
+            vendor=header["vendor"],
+        )
+    print(f"💾 Exported parsed data to {root}/invoices")
+
+
+def main(argv=None, prog=None):
     parser = argparse.ArgumentParser(
-        description="Parse Food Matters Again invoice PDF into structured data."
+        prog=prog,
+        description="Parse vendor invoice PDFs into structured data."
     )
-    parser.add_argument(
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
         "--file",
-        required=True,
         help="Path to the invoice PDF file."
     )
+    source.add_argument(
+        "--dir",
+        help="Parse every PDF under this directory."
+    )
+    source.add_argument(
+        "--glob",
+        help="Parse every PDF matching this glob pattern."
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=None,
+        help="Processes for batch parsing (default: one per CPU)."
+    )
     parser.add_argument(
         "--output",
         default=None,
         help="Optional CSV output path (e.g., parsed_invoice.csv)."
     )
+    parser.add_argument(
+        "--parquet",
+        metavar="DIR",
+        default=None,
+        help="Optional Parquet dataset root; rows go to DIR/invoices partitioned by invoice date."
+    )
+    parser.add_argument(
+        "--cache",
+        default=DEFAULT_CACHE_PATH,
+        help=f"Parsed-invoice cache (SQLite), keyed by PDF hash + parser version. Default: {DEFAULT_CACHE_PATH}"
+    )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Always re-parse; don't read or write the cache."
+    )
+    parser.add_argument(
+        "--invoice-date",
+        default=None,
+        help="Invoice date (YYYY-MM-DD) used as the Parquet partition. "
+             "Defaults to the date on the invoice, then today."
+    )
+    add_profile_arguments(parser)
+
+    args = parser.parse_args(argv)
+    start_profiling(args, "parse_invoices")
+    cache = None if args.no_cache else InvoiceCache(args.cache)
+
+    if args.dir or args.glob:
+        run_batch(args, cache)
+        return
 
-    args = parser.parse_args()
+    from invoices.batch import parse_cached
 
     print(f"📄 Parsing invoice: {args.file}")
     try:
-        df = parse_food_matters_invoice(args.file)
+        with tracer.span("parse"):
+            res = parse_cached(args.file, cache)
+        if res["error"]:
+            raise RuntimeError(res["error"])
+        df = res["df"]
+        if cache is not None:
+            print(f"🗄️  {cache.summary()}")
         if df.empty:
             print("⚠️ No line items were detected. Check PDF formatting.")
             sys.exit(1)
@@ -96,13 +121,56 @@ def main():
         print(df)
 
         if args.output:
-            df.to_csv(args.output, index=False)
+            with tracer.span("write csv"):
+                df.to_csv(args.output, index=False)
             print(f"💾 Saved parsed data to {args.output}")
 
+        if args.parquet:
+            with tracer.span("export parquet"):
+                export_parquet(args.parquet, df.assign(
+                    source_file=Path(args.file).name,
+                    invoice_number=df.attrs.get("invoice_number"),
+                    invoice_date=df.attrs.get("invoice_date"),
+                    vendor=df.attrs.get("vendor"),
+                ), args.invoice_date)
+
     except Exception as e:
         print(f"❌ Error parsing invoice: {e}")
         sys.exit(1)
 
 
+def run_batch(args, cache=None):
+    from invoices.batch import parse_invoice_batch, print_batch_report, resolve_invoice_paths
+
+    paths = resolve_invoice_paths(args.dir or args.glob)
+    if not paths:
+        print(f"⚠️ No PDFs found for {args.dir or args.glob}")
+        sys.exit(1)
+
+    print(f"📄 Parsing {len(paths)} invoices")
+    start = time.perf_counter()
+    with tracer.span("parse batch", invoices=len(paths)):
+        df, report = parse_invoice_batch(paths, workers=args.workers, cache=cache)
+    print_batch_report(report, wall_seconds=time.perf_counter() - start, cache=cache)
+
+    if df.empty:
+        print("⚠️ No line items were detected in any invoice.")
+        sys.exit(1)
+
+    print(f"✅ Parsed {len(df)} items from {df['source_file'].nunique()} invoices.")
+
+    if args.output:
+        with tracer.span("write csv"):
+            df.to_csv(args.output, index=False)
+        print(f"💾 Saved parsed data to {args.output}")
+
+    if args.parquet:
+        with tracer.span("export parquet"):
+            export_parquet(args.parquet, df, args.invoice_date)
+
+    if any(r["error"] for r in report):
+        sys.exit(2)
+
+
 if __name__ == "__main__":
     main()
@@ -17,7 +17,9 @@ def extract_buyer_info(order, client):
     # Fallback to customer object
     if not buyer_name and getattr(order, "customer_id", None):
         try:
-            resp = client.customers.retrieve_customer(order.customer_id)
+            # Current SDKs name it customers.get; older ones retrieve_customer
+            lookup = getattr(client.customers, "get", None) or client.customers.retrieve_customer
+            resp = lookup(order.customer_id)
             cust = getattr(resp, "customer", None)
             if cust:
                 given = getattr(cust, "given_name", "") or ""
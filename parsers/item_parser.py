@@ -1,4 +1,6 @@
 import re
+from datetime import date, datetime, time
+from functools import lru_cache
 
 DATE_PATTERNS = [
     r'\b\d{1,2}/\d{1,2}(?:/\d{2,4})?\b',                    # 11/26 or 11/26/2025
@@ -13,9 +15,150 @@ TIME_PATTERNS = [
     r'\b\d{1,2}:\d{2}\b',                       # 14:00
 ]
 
+# Same patterns as above, compiled once with named groups so a match both
+# finds and normalizes the value. Searched in list order, like the original
+# loop: the first pattern that matches anywhere wins, not the leftmost match
+# ("noon or 3pm" is 3pm, "Nov 26 (11/27 backup)" is 11/27).
+DATE_RES = [re.compile(p, re.IGNORECASE) for p in (
+    r'\b(?P<num_month>\d{1,2})/(?P<num_day>\d{1,2})(?:/(?P<num_year>\d{2,4}))?\b',
+    r'\b(?P<name_month>jan|feb|mar|apr|may|jun|jul|aug|sep|oct|nov|dec)[a-z]*\.?\s+(?P<name_day>\d{1,2})\b',
+    r'\b(?:monday|tuesday|wednesday|thursday|friday|saturday|sunday)\s+(?P<wd_month>\w+)\s+(?P<wd_day>\d{1,2})\b',
+)]
+
+TIME_RES = [re.compile(p, re.IGNORECASE) for p in (
+    r'\b(?P<hour>\d{1,2})(?::(?P<minute>\d{2}))?\s*(?P<ampm>am|pm)\b',
+    r'\b(?P<word>noon|midnight)\b',
+    r'\b(?P<h24>\d{1,2}):(?P<m24>\d{2})\b',
+)]
+
+MONTHS = {m: i for i, m in enumerate(
+    ["jan", "feb", "mar", "apr", "may", "jun", "jul", "aug", "sep", "oct", "nov", "dec"], start=1
+)}
+
+# Distinct modifier texts seen per run are a few hundred at most; the bound
+# only guards against pathological input.
+MODIFIER_CACHE_SIZE = 4096
+
+
+def _search(patterns, text):
+    for pattern in patterns:
+        m = pattern.search(text)
+        if m:
+            return m
+    return None
+
+
+def _to_date(m, year, order_month=None):
+    """
+    Turn a DATE_RES match into a date. Falls back to the raw text when the
+    month/day don't form a real calendar date (e.g. "13/45").
+
+    A date without a year takes `year`, or the next year when it falls more
+    than half a year before `order_month` ("1/2" on a December order).
+    """
+    groups = m.groupdict()
+    if groups.get("num_month"):
+        month, day = int(groups["num_month"]), int(groups["num_day"])
+        explicit_year = groups["num_year"]
+    else:
+        month_text = (groups.get("name_month") or groups["wd_month"])[:3].lower()
+        month = MONTHS.get(month_text)
+        day = int(groups.get("name_day") or groups["wd_day"])
+        explicit_year = None
+        if month is None:
+            return m.group(0)
+
+    if explicit_year:
+        year = int(explicit_year)
+        if year < 100:
+            year += 2000
+    elif order_month and order_month - month > 6:
+        year += 1
+
+    try:
+        return date(year, month, day)
+    except ValueError:
+        return m.group(0)
+
+
+def _to_time(m):
+    """
+    Turn a TIME_RES match into a time, or the raw text if it is out of range.
+    A bare "4:30" could be either half of the day, so clock times without
+    am/pm only become a time when unambiguous (0:xx, 12:xx-23:xx).
+    """
+    groups = m.groupdict()
+    if groups.get("word"):
+        return time(12, 0) if groups["word"].lower() == "noon" else time(0, 0)
+
+    try:
+        if groups.get("ampm"):
+            hour = int(groups["hour"]) % 12
+            if groups["ampm"].lower() == "pm":
+                hour += 12
+            return time(hour, int(groups["minute"] or 0))
+        hour = int(groups["h24"])
+        if 1 <= hour <= 11:
+            return m.group(0)
+        return time(hour, int(groups["m24"]))
+    except ValueError:
+        return m.group(0)
+
+
+@lru_cache(maxsize=MODIFIER_CACHE_SIZE)
+def parse_modifier_text(name, year, order_month=None):
+    """
+    Parse one modifier name into (pickup_date, pickup_time, allergies).
+    Any of the three may be None. Results are memoized per
+    (name, year, order_month).
+    """
+    text = name.strip().lower()
+
+    m = _search(DATE_RES, text)
+    pickup_date = _to_date(m, year, order_month) if m else None
+
+    m = _search(TIME_RES, text)
+    pickup_time = _to_time(m) if m else None
+
+    allergies = text.split(":", 1)[-1].strip() if "allerg" in text else None
+
+    return pickup_date, pickup_time, allergies
+
+
+def order_year(order):
+    """
+    Year the order was created in, used to complete year-less pickup dates.
+    """
+    created_at = getattr(order, "created_at", None)
+    if not created_at:
+        return None
+    try:
+        return int(created_at[:4])
+    except ValueError:
+        return None
+
+
+def order_month(order):
+    """
+    Month the order was created in, so year-less pickup dates can roll over
+    into the next year.
+    """
+    created_at = getattr(order, "created_at", None)
+    if not created_at:
+        return None
+    try:
+        return int(created_at[5:7])
+    except ValueError:
+        return None
+
+
 class ItemParser:
-    def __init__(self, item):
+    def __init__(self, item, year=None, month=None):
         self.item = item
+        # Modifiers like "11/26" carry no year; assume the order's year, or
+        # the next one for a January pickup on a December order.
+        self.year = year or datetime.now().year
+        self.month = month
         self.pickup_date = None
         self.pickup_time = None
         self.allergies = None
@@ -26,30 +169,16 @@ class ItemParser:
         if getattr(self.item, "modifiers", []) is None:
             return
         for mod in getattr(self.item, "modifiers", []):
-            text = mod.name.strip().lower()
-
-            # Find date first
-            for pattern in DATE_PATTERNS:
-                m = re.search(pattern, text, flags=re.IGNORECASE)
-                if m:
-                    self.pickup_date = m.group(0)
-                    break
-
-            # Find time
-            for pattern in TIME_PATTERNS:
-                m = re.search(pattern, text, flags=re.IGNORECASE)
-                if m:
-                    t = m.group(0)
-                    if t == "noon":
-                        t = "12:00 pm"
-                    elif t == "midnight":
-                        t = "12:00 am"
-                    self.pickup_time = t
-                    break
-
-            if "allerg" in text:
-                self.allergies = text.split(":", 1)[-1].strip()
-                continue    
+            pickup_date, pickup_time, allergies = parse_modifier_text(mod.name, self.year, self.month)
+
+            if pickup_date is not None:
+                self.pickup_date = pickup_date
+            if pickup_time is not None:
+                self.pickup_time = pickup_time
+
+            if allergies is not None:
+                self.allergies = allergies
+                continue
 
             # If neither date nor time was captured, keep as extra
             if (self.pickup_date is None) and (self.pickup_time is None) and (self.allergies is None):
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Item sales and team tip reports from the warehouse's daily rollups.
+
+Usage:
+    python rollup_report.py --period week --start 2025-11-01 --end 2026-01-01 --item board
+    python rollup_report.py --period year --item "cheese board" --compare-previous-year
+    python rollup_report.py --tips --period month --start 2025-01-01
+"""
+
+import argparse
+from collections import defaultdict
+from datetime import date
+
+from warehouse import DEFAULT_WAREHOUSE_PATH, Warehouse
+from warehouse.rollups import PERIODS
+
+
+def shift_year(day, years=-1):
+    d = date.fromisoformat(day)
+    try:
+        return d.replace(year=d.year + years).isoformat()
+    except ValueError:  # Feb 29
+        return d.replace(year=d.year + years, day=28).isoformat()
+
+
+def print_item_sales(rows, title):
+    print("\n" + title)
+    print("=" * 100)
+    print(f"{'Period':<12} {'Item':<40} {'Variation':<20} {'Units':>8} {'Revenue':>12}")
+    print("-" * 100)
+    for r in rows:
+        print(f"{r['period']:<12} {r['item_name'][:40]:<40} {r['variation_name'][:20]:<20} "
+              f"{r['units']:8.0f} {r['revenue'] / 100:12.2f}")
+    print("-" * 100)
+    print(f"{'TOTALS':<74} {sum(r['units'] for r in rows):8.0f} {sum(r['revenue'] for r in rows) / 100:12.2f}")
+
+
+def print_year_over_year(current, previous, title):
+    totals = defaultdict(lambda: [0, 0, 0, 0])
+    for r in current:
+        totals[r["item_name"]][0] += r["units"]
+        totals[r["item_name"]][1] += r["revenue"]
+    for r in previous:
+        totals[r["item_name"]][2] += r["units"]
+        totals[r["item_name"]][3] += r["revenue"]
+
+    print("\n" + title)
+    print("=" * 100)
+    print(f"{'Item':<40} {'Units':>8} {'Last Yr':>8} {'Revenue':>12} {'Last Yr':>12} {'Change':>9}")
+    print("-" * 100)
+    for name, (units, revenue, prev_units, prev_revenue) in sorted(totals.items(), key=lambda x: -x[1][1]):
+        change = f"{(revenue - prev_revenue) / prev_revenue * 100:+8.1f}%" if prev_revenue else f"{'new':>9}"
+        print(f"{name[:40]:<40} {units:8.0f} {prev_units:8.0f} {revenue / 100:12.2f} {prev_revenue / 100:12.2f} {change}")
+
+
+def print_team_tips(rows, names, title):
+    print("\n" + title)
+    print("=" * 100)
+    print(f"{'Period':<12} {'Name':<25} {'Hours':>8} {'Cash':>12} {'Card':>12} {'Auto Grat':>12}")
+    print("-" * 100)
+    for r in rows:
+        name = names.get(r["team_member_id"], "Unknown")
+        print(f"{r['period']:<12} {name[:25]:<25} {r['hours']:8.2f} {r['declared_cash_tips'] / 100:12.2f} "
+              f"{r['card_tips'] / 100:12.2f} {r['auto_gratuity'] / 100:12.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Reports from warehouse daily rollups.")
+    parser.add_argument("--db", default=DEFAULT_WAREHOUSE_PATH, help=f"Warehouse path. Default: {DEFAULT_WAREHOUSE_PATH}")
+    parser.add_argument("--period", choices=sorted(PERIODS), default="week")
+    parser.add_argument("--start", help="First local date (YYYY-MM-DD)")
+    parser.add_argument("--end", help="Local date to stop before (YYYY-MM-DD)")
+    parser.add_argument("--location", nargs="*", help="Specific location IDs to include")
+    parser.add_argument("--item", help="Partial item name filter")
+    parser.add_argument("--tips", action="store_true", help="Report team hours and tips instead of item sales")
+    parser.add_argument("--compare-previous-year", action="store_true",
+                        help="Compare item totals with the same dates one year earlier")
+    args = parser.parse_args()
+
+    warehouse = Warehouse(args.db)
+    rollups = warehouse.rollups
+    try:
+        if rollups.pending():
+            print(f"🔄 Refreshed {rollups.refresh()} rollup days")
+
+        if args.tips:
+            names = {
+                tm["id"]: f"{tm.get('given_name') or ''} {tm.get('family_name') or ''}".strip()
+                for tm in warehouse.team_members()
+            }
+            rows = rollups.team_tips(args.start, args.end, args.period, args.location)
+            print_team_tips(rows, names, f"Team Tips by {args.period}")
+            return
+
+        rows = rollups.item_sales(args.start, args.end, args.period, args.location, args.item)
+        if args.compare_previous_year:
+            if not (args.start and args.end):
+                parser.error("--compare-previous-year needs --start and --end")
+            previous = rollups.item_sales(
+                shift_year(args.start), shift_year(args.end), args.period, args.location, args.item
+            )
+            print_year_over_year(rows, previous, f"{args.start} → {args.end} vs. previous year")
+        else:
+            print_item_sales(rows, f"Item Sales by {args.period}")
+    finally:
+        warehouse.close()
+
+
+if __name__ == "__main__":
+    main()
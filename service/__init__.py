@@ -0,0 +1,11 @@
+"""
+Resident local service answering tipout and order-extraction queries from
+warm state (pooled client, caches, recent weeks' data).
+
+Usage:
+    python square_service.py --port 8790 --warm-weeks 2
+    curl "http://127.0.0.1:8790/tipout?week=2025-11-24&location=L1"
+    curl "http://127.0.0.1:8790/orders/extract?extractor=thanksgiving&start=2025-11-01&end=2025-11-28"
+"""
+from .server import ServiceServer
+from .state import ServiceState
@@ -0,0 +1,115 @@
+"""
+asyncio HTTP front end for ServiceState.
+
+The event loop only parses requests and writes responses. Each request's
+ServiceState.route() call runs on a thread pool, because the tipout and
+extractor code and the Square SDK are blocking. Connections are HTTP/1.1
+keep-alive. Only GET is served, with JSON responses.
+"""
+
+import asyncio
+import time
+import traceback
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+from urllib.parse import parse_qs, urlsplit
+
+from utils.serialization import dumps
+
+MAX_HEADER_LINES = 100
+
+
+class ServiceServer:
+    def __init__(self, state, host="127.0.0.1", port=8790, workers=4, verbose=False):
+        self.state = state
+        self.host = host
+        self.port = port
+        self.verbose = verbose
+        self.executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="service")
+        self._server = None
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    async def _respond(self, writer, status, payload, keep_alive):
+        body = dumps(payload)
+        head = (
+            f"HTTP/1.1 {status} {HTTPStatus(status).phrase}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode("latin-1") + body)
+        await writer.drain()
+
+    async def _read_request(self, reader):
+        """
+        (method, target, version, headers), or None when the client closed.
+        """
+        line = await reader.readline()
+        if not line:
+            return None
+        parts = line.decode("latin-1").split()
+        if len(parts) != 3:
+            raise ValueError(f"Malformed request line {line!r}")
+        headers = {}
+        for _ in range(MAX_HEADER_LINES):
+            header = await reader.readline()
+            if header in (b"\r\n", b"\n", b""):
+                break
+            name, _, value = header.decode("latin-1").partition(":")
+            headers[name.strip().lower()] = value.strip()
+        length = int(headers.get("content-length") or 0)
+        if length:
+            await reader.readexactly(length)  # bodies are ignored; every endpoint is GET
+        return (*parts, headers)
+
+    async def handle(self, reader, writer):
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                try:
+                    request = await self._read_request(reader)
+                except (ValueError, asyncio.IncompleteReadError) as e:
+                    await self._respond(writer, 400, {"error": str(e)}, keep_alive=False)
+                    break
+                if request is None:
+                    break
+                method, target, version, headers = request
+                keep_alive = version == "HTTP/1.1" and headers.get("connection", "").lower() != "close"
+
+                url = urlsplit(target)
+                started = time.perf_counter()
+                try:
+                    status, payload = await loop.run_in_executor(
+                        self.executor, self.state.route, method, url.path, parse_qs(url.query)
+                    )
+                except Exception as e:
+                    traceback.print_exc()
+                    status, payload = 500, {"error": f"{type(e).__name__}: {e}"}
+                await self._respond(writer, status, payload, keep_alive)
+                if self.verbose or status >= 500:
+                    print(f"{method} {target} → {status} in {(time.perf_counter() - started) * 1000:.1f} ms")
+                if not keep_alive:
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, warm_weeks=0):
+        self._server = await asyncio.start_server(self.handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        print(f"🛎️  Serving on {self.base_url} (/tipout, /orders/extract, /health, /stats)")
+        if warm_weeks:
+            loop = asyncio.get_running_loop()
+            warming = loop.run_in_executor(self.executor, self.state.warm, warm_weeks)
+            warming.add_done_callback(lambda f: print(
+                f"🔥 Warmed {warm_weeks} week(s)" if not f.exception() else f"⚠️ Warm-up failed: {f.exception()}"
+            ))
+        async with self._server:
+            await self._server.serve_forever()
+
+    def close(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,328 @@
+"""
+Warm state behind the resident service: one Square (or warehouse) client,
+cached lookups and the recent weeks' timecards, payments and results.
+
+ServiceState.route(method, path, query) returns (status, payload) and is
+plain blocking code; service.server runs it on worker threads.
+
+Caching:
+- locations, customers and catalog listings: CachingClient, process lifetime;
+- team member names, per location: `team_ttl` seconds;
+- a week's timecards and payments, tipout allocations and order searches:
+  an LRU of `max_entries`. Windows that ended before the request are kept
+  until evicted; windows still open expire after `ttl` seconds so new
+  payments show up;
+- extracted rows, per (extractor, order id): an LRU of `max_rows`, reused
+  while the order's version is unchanged; a new version replaces them.
+
+Concurrent requests for the same key wait for one computation instead of
+each calling Square. `refresh=1` on any request recomputes its keys.
+"""
+
+import threading
+import time
+from collections import OrderedDict, defaultdict
+from datetime import datetime, timedelta, timezone
+
+from dateutil import parser as date_parser
+
+from square_client import CachingClient, SquareOrderFinder
+from tipout.aggregation import aggregate_hours_and_tips_by_day
+from tipout.distribution import distribute_daily_tips, distribute_tips_by_clockin
+from tipout.payments import fetch_payments
+from tipout.reporting import combine_locations, team_member_names
+from tipout.timecards import fetch_timecards
+from tipout.utils import get_week_bounds, utc_to_local
+from utils.tracing import tracer
+
+DEFAULT_TTL = 300
+DEFAULT_TEAM_TTL = 3600
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_ROWS = 50_000
+
+ALLOCATION_FIELDS = [
+    "hours",
+    "declared_cash_tips",
+    "card_tips",
+    "tip_out_allocated",
+    "tip_out_allocated_after_card_processing",
+]
+METHODS = {
+    "daily": "daily_pool",
+    "clockin": "clockin",
+}
+
+
+class BadRequest(ValueError):
+    pass
+
+
+def _param(query, name, default=None):
+    values = query.get(name)
+    return values[-1] if values else default
+
+
+def _list_param(query, name):
+    """
+    ?location=A&location=B and ?location=A,B both give ["A", "B"].
+    """
+    return [v for value in query.get(name, []) for v in value.split(",") if v]
+
+
+def _date_param(query, name, default):
+    value = _param(query, name)
+    if value is None:
+        return default
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+    except ValueError:
+        raise BadRequest(f"{name} must be YYYY-MM-DD, got {value!r}")
+
+
+def allocation_rows(allocations, names):
+    """
+    {team_member_id: totals} -> rows sorted by name, amounts in cents.
+    """
+    rows = []
+    for tm_id, rec in allocations.items():
+        row = {"team_member_id": tm_id, "name": names.get(tm_id, "Unknown")}
+        row.update((field, round(rec[field], 2)) for field in ALLOCATION_FIELDS)
+        rows.append(row)
+    return sorted(rows, key=lambda r: r["name"].lower())
+
+
+class ServiceState:
+    def __init__(self, client, extractors, ttl=DEFAULT_TTL, team_ttl=DEFAULT_TEAM_TTL,
+                 max_entries=DEFAULT_MAX_ENTRIES, max_rows=DEFAULT_MAX_ROWS, stats=None):
+        self.client = CachingClient(client, stats)
+        self.finder = SquareOrderFinder(self.client)
+        self.extractors = {e.SHEET: e for e in extractors}
+        self.ttl = ttl
+        self.team_ttl = team_ttl
+        self.max_entries = max_entries
+        self.max_rows = max_rows
+        self.stats = stats
+        self.started = time.time()
+        self.requests = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()  # key -> (expires_at or None, value)
+        self._key_locks = defaultdict(threading.Lock)
+        self._rows = OrderedDict()  # (sheet, order_id) -> (version, rows)
+        self._lock = threading.Lock()
+        self.routes = {
+            ("GET", "/health"): self.health,
+            ("GET", "/tipout"): self.tipout,
+            ("GET", "/orders/extract"): self.extract_orders,
+            ("GET", "/stats"): self.api_stats,
+        }
+
+    # ---- plumbing ----
+
+    def route(self, method, path, query):
+        handler = self.routes.get((method, path.rstrip("/") or "/"))
+        if handler is None:
+            return 404, {"error": f"{method} {path} not found"}
+        with self._lock:
+            self.requests += 1
+        try:
+            with tracer.span(path, cat="request"):
+                return 200, handler(query, refresh=_param(query, "refresh") in ("1", "true"))
+        except BadRequest as e:
+            return 400, {"error": str(e)}
+
+    def cached(self, key, compute, ttl=None, refresh=False):
+        """
+        Value for `key`, computing it at most once at a time. `ttl` None
+        keeps it until it is evicted.
+        """
+        with self._lock:
+            key_lock = self._key_locks[key]
+        with key_lock:
+            now = time.monotonic()
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and not refresh and (entry[0] is None or entry[0] > now):
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                self.misses += 1
+
+            value = compute()
+            with self._lock:
+                self._entries[key] = (None if ttl is None else time.monotonic() + ttl, value)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_entries:
+                    evicted, _ = self._entries.popitem(last=False)
+                    self._key_locks.pop(evicted, None)
+            return value
+
+    def window_ttl(self, end_iso):
+        """
+        Closed windows don't change; open ones are re-read after `ttl`.
+        """
+        return None if date_parser.isoparse(end_iso) < datetime.now(timezone.utc) else self.ttl
+
+    # ---- warm data ----
+
+    def locations(self, location_ids=None):
+        locations = getattr(self.client.locations.list(), "locations", None) or []
+        if not location_ids:
+            return locations
+        wanted = [loc for loc in locations if loc.id in location_ids]
+        unknown = set(location_ids) - {loc.id for loc in wanted}
+        if unknown:
+            raise BadRequest(f"Unknown location(s): {', '.join(sorted(unknown))}")
+        return wanted
+
+    def team_names(self, location_id, refresh=False):
+        return self.cached(("team", location_id),
+                           lambda: team_member_names(self.client, [location_id]),
+                           ttl=self.team_ttl, refresh=refresh)
+
+    def week_data(self, start_iso, end_iso, location_id, refresh=False):
+        """
+        (timecards, payments) for one location and week.
+        """
+        def load():
+            with tracer.span("load week", location_id=location_id, week=start_iso):
+                return (
+                    fetch_timecards(self.client, location_id, start_iso, end_iso) or [],
+                    fetch_payments(self.client, location_id, start_iso, end_iso),
+                )
+        return self.cached(("week", start_iso, location_id), load, self.window_ttl(end_iso), refresh)
+
+    def allocations(self, start_iso, end_iso, location_id, ignore=(), refresh=False):
+        """
+        {"daily_pool": {...}, "clockin": {...}} allocations for one location
+        and week, as tipout_main computes them.
+        """
+        def compute():
+            timecards, payments = self.week_data(start_iso, end_iso, location_id, refresh)
+            if ignore:
+                payments = [p for p in payments if utc_to_local(getattr(p, "created_at", None)) not in ignore]
+            with tracer.span("allocate", location_id=location_id, week=start_iso):
+                daily = aggregate_hours_and_tips_by_day(timecards, payments, self.client)
+                return {
+                    "daily_pool": distribute_daily_tips(daily),
+                    "clockin": distribute_tips_by_clockin(payments, timecards, self.client),
+                }
+        key = ("allocations", start_iso, location_id, tuple(sorted(ignore)))
+        return self.cached(key, compute, self.window_ttl(end_iso), refresh)
+
+    def orders(self, start_iso, end_iso, location_ids, refresh=False):
+        def search():
+            with tracer.span("search orders", start=start_iso, end=end_iso):
+                return list(self.finder.iter_orders(start_iso, end_iso, location_ids))
+        key = ("orders", start_iso, end_iso, tuple(sorted(location_ids)))
+        return self.cached(key, search, self.window_ttl(end_iso), refresh)
+
+    def extracted_rows(self, extractor, order):
+        key = (extractor.SHEET, order.id)
+        version = getattr(order, "version", None)
+        with self._lock:
+            entry = self._rows.get(key)
+            if entry is not None and entry[0] == version:
+                self._rows.move_to_end(key)
+                return entry[1]
+
+        rows = list(extractor.extract(order, self.client))
+        with self._lock:
+            self._rows[key] = (version, rows)
+            self._rows.move_to_end(key)
+            while len(self._rows) > self.max_rows:
+                self._rows.popitem(last=False)
+        return rows
+
+    # ---- endpoints ----
+
+    def health(self, query, refresh=False):
+        with self._lock:
+            entries = len(self._entries)
+            extracted = len(self._rows)
+        return {
+            "status": "ok",
+            "uptime_seconds": round(time.time() - self.started, 1),
+            "requests": self.requests,
+            "cache": {"entries": entries, "hits": self.hits, "misses": self.misses,
+                      "extracted_orders": extracted, **self.client.cache_sizes()},
+        }
+
+    def tipout(self, query, refresh=False):
+        """
+        GET /tipout?week=YYYY-MM-DD[&location=ID,...][&method=daily|clockin][&ignore=YYYY-MM-DD,...]
+        """
+        week = _param(query, "week")
+        if week is not None:
+            _date_param(query, "week", None)  # validate
+        methods = [_param(query, "method")] if _param(query, "method") else list(METHODS)
+        if any(m not in METHODS for m in methods):
+            raise BadRequest(f"method must be one of {', '.join(METHODS)}")
+        ignore = tuple(_list_param(query, "ignore"))
+
+        start_iso, end_iso = get_week_bounds(week)
+        locations = self.locations(_list_param(query, "location"))
+        by_location = {
+            loc.id: self.allocations(start_iso, end_iso, loc.id, ignore, refresh)
+            for loc in locations
+        }
+        names = {}
+        for loc in locations:
+            names.update(self.team_names(loc.id, refresh))
+
+        result = {
+            "week_start": start_iso,
+            "week_end": end_iso,
+            "locations": [{"id": loc.id, "name": loc.name} for loc in locations],
+        }
+        for method in methods:
+            key = METHODS[method]
+            per_location = {loc_id: alloc[key] for loc_id, alloc in by_location.items()}
+            result[key] = {
+                "combined": allocation_rows(combine_locations(per_location), names),
+                "by_location": {loc_id: allocation_rows(a, names) for loc_id, a in per_location.items()},
+            }
+        return result
+
+    def extract_orders(self, query, refresh=False):
+        """
+        GET /orders/extract?extractor=NAME[,NAME...][&start=YYYY-MM-DD][&end=YYYY-MM-DD][&location=ID,...]
+        """
+        names = _list_param(query, "extractor") or list(self.extractors)
+        unknown = [n for n in names if n not in self.extractors]
+        if unknown:
+            raise BadRequest(f"Unknown extractor(s) {unknown}; available: {', '.join(self.extractors)}")
+        now = datetime.now(timezone.utc)
+        start_dt = _date_param(query, "start", now.replace(hour=0, minute=0, second=0, microsecond=0))
+        end_dt = _date_param(query, "end", start_dt + timedelta(days=1))
+        if end_dt <= start_dt:
+            raise BadRequest("end must be after start")
+
+        location_ids = [loc.id for loc in self.locations(_list_param(query, "location"))]
+        orders = self.orders(start_dt.isoformat(), end_dt.isoformat(), location_ids, refresh)
+        rows = {name: [] for name in names}
+        with tracer.span("extract", orders=len(orders)):
+            for order in orders:
+                for name in names:
+                    rows[name].extend(self.extracted_rows(self.extractors[name], order))
+        return {
+            "start": start_dt.isoformat(),
+            "end": end_dt.isoformat(),
+            "orders": len(orders),
+            "count": sum(len(r) for r in rows.values()),
+            "rows": rows,
+        }
+
+    def api_stats(self, query, refresh=False):
+        return self.stats.as_dict() if self.stats is not None else {}
+
+    def warm(self, weeks=1):
+        """
+        Load the last `weeks` weeks (this one included) for every location.
+        """
+        today = datetime.now(timezone.utc)
+        for n in range(weeks):
+            start_iso, end_iso = get_week_bounds((today - timedelta(weeks=n)).strftime("%Y-%m-%d"))
+            for loc in self.locations():
+                self.allocations(start_iso, end_iso, loc.id)
+                self.team_names(loc.id)
@@ -1,21 +1,107 @@
-from square.types.search_orders_query import SearchOrdersQuery
-from square.types.search_orders_filter import SearchOrdersFilter
-from square.types.search_orders_date_time_filter import SearchOrdersDateTimeFilter
-from square.types.search_orders_sort import SearchOrdersSort
+class _CachedCustomers:
+    def __init__(self, customers, stats=None):
+        self._customers = customers
+        self._stats = stats
+        self._cache = {}
+
+    def get(self, customer_id, **kwargs):
+        if customer_id not in self._cache:
+            lookup = getattr(self._customers, "get", None) or self._customers.retrieve_customer
+            self._cache[customer_id] = lookup(customer_id, **kwargs)
+        elif self._stats is not None:
+            self._stats.cache_hit("customers.get")
+        return self._cache[customer_id]
+
+    retrieve_customer = get
+
+    def __getattr__(self, name):
+        return getattr(self._customers, name)
+
+
+class _CachedLocations:
+    def __init__(self, locations, stats=None):
+        self._locations = locations
+        self._stats = stats
+        self._resp = None
+
+    def list(self, **kwargs):
+        if self._resp is None:
+            self._resp = self._locations.list(**kwargs)
+        elif self._stats is not None:
+            self._stats.cache_hit("locations.list")
+        return self._resp
+
+    def __getattr__(self, name):
+        return getattr(self._locations, name)
+
+
+class _CachedCatalog:
+    def __init__(self, catalog, stats=None):
+        self._catalog = catalog
+        self._stats = stats
+        self._lists = {}
+
+    def list(self, **kwargs):
+        key = tuple(sorted(kwargs.items()))
+        if key not in self._lists:
+            self._lists[key] = list(self._catalog.list(**kwargs))
+        elif self._stats is not None:
+            self._stats.cache_hit("catalog.list")
+        return self._lists[key]
+
+    def __getattr__(self, name):
+        return getattr(self._catalog, name)
+
+
+class CachingClient:
+    """
+    Wraps a Square client so customer lookups, the locations list and
+    catalog listings are fetched once per process. Everything else passes
+    straight through. Meant for long-running modes (square_order_info --watch)
+    where the same customers come up poll after poll.
+    """
+
+    def __init__(self, client, stats=None):
+        self._client = client
+        for name, wrapper in (("customers", _CachedCustomers), ("locations", _CachedLocations),
+                              ("catalog", _CachedCatalog)):
+            if hasattr(client, name):
+                setattr(self, name, wrapper(getattr(client, name), stats))
+
+    def cache_sizes(self):
+        return {
+            "customers": len(self.customers._cache) if hasattr(self, "customers") else 0,
+            "catalog_lists": len(self.catalog._lists) if hasattr(self, "catalog") else 0,
+        }
+
+    def __getattr__(self, name):
+        return getattr(self._client, name)
+
+
+def _search_query(time_field, time_range, sort_field, sort_order):
+    # The SDK's pydantic models are slow to import; load them on first search.
+    from square.types.search_orders_query import SearchOrdersQuery
+    from square.types.search_orders_filter import SearchOrdersFilter
+    from square.types.search_orders_date_time_filter import SearchOrdersDateTimeFilter
+    from square.types.search_orders_sort import SearchOrdersSort
+
+    return SearchOrdersQuery(
+        filter=SearchOrdersFilter(
+            date_time_filter=SearchOrdersDateTimeFilter(**{time_field: time_range})
+        ),
+        sort=SearchOrdersSort(sort_field=sort_field, sort_order=sort_order)
+    )
+
 
 class SquareOrderFinder:
     def __init__(self, client):
         self.client = client
 
+    def _query(self, start_iso, end_iso):
+        return _search_query("created_at", {"start_at": start_iso, "end_at": end_iso}, "CREATED_AT", "DESC")
+
     def search_orders(self, start_iso, end_iso, location_ids):
-        query = SearchOrdersQuery(
-            filter=SearchOrdersFilter(
-                date_time_filter=SearchOrdersDateTimeFilter(
-                    created_at={"start_at": start_iso, "end_at": end_iso}
-                )
-            ),
-            sort=SearchOrdersSort(sort_field="CREATED_AT", sort_order="DESC")
-        )
+        query = self._query(start_iso, end_iso)
 
         resp = self.client.orders.search(
             location_ids=location_ids,
@@ -25,3 +111,38 @@ class SquareOrderFinder:
         )
 
         return getattr(resp, "orders", []) or []
+
+    def iter_updated_orders(self, since_iso, location_ids, page_size=500):
+        """
+        Yield orders updated at or after `since_iso`, oldest update first.
+        Square only allows sorting on the field being filtered, so this
+        sorts by UPDATED_AT.
+        """
+        query = _search_query("updated_at", {"start_at": since_iso}, "UPDATED_AT", "ASC")
+        yield from self._paged(query, location_ids, page_size)
+
+    def iter_orders(self, start_iso, end_iso, location_ids, page_size=500):
+        """
+        Yield orders one page at a time, following the search cursor, so
+        callers never hold more than a single page in memory.
+        """
+        yield from self._paged(self._query(start_iso, end_iso), location_ids, page_size)
+
+    def _paged(self, query, location_ids, page_size):
+        cursor = None
+
+        while True:
+            kwargs = {"cursor": cursor} if cursor else {}
+            resp = self.client.orders.search(
+                location_ids=location_ids,
+                query=query,
+                limit=page_size,
+                return_entries=False,
+                **kwargs
+            )
+
+            yield from getattr(resp, "orders", []) or []
+
+            cursor = getattr(resp, "cursor", None)
+            if not cursor:
+                break
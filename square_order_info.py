@@ -1,12 +1,17 @@
 #!/usr/bin/env python3
 import argparse
-from datetime import datetime, timezone
+from datetime import datetime, timedelta, timezone
 import os
-import pandas as pd
-from square import Square
+import time
+from dateutil import parser as date_parser
+from utils.api_fixtures import add_fixture_arguments, require_explicit_dates, square_client_for
+from utils.api_stats import ApiStats, InstrumentedClient, add_stats_arguments
+from utils.profiling import add_profile_arguments, start_profiling
+from utils.tracing import add_trace_arguments, tracer
 
-from square_client import SquareOrderFinder
-from utils.square_file_output import save_results
+from square_client import CachingClient, SquareOrderFinder
+from utils.checkpoints import DEFAULT_CHECKPOINT_PATH, ExtractionCheckpoint
+from utils.streaming_output import ResultWriters, WRITERS
 
 from extractors.cheese_board import CheeseBoardExtractor
 from extractors.thanksgiving_board import ThanksgivingBoardExtractor
@@ -34,22 +39,141 @@ def get_extractors(item, run_all=False):
     raise ValueError(f"No extractor matches item '{item}'")
 
 
-
-def main():
-    parser = argparse.ArgumentParser(description="Search Square item sales.")
+def iter_results(orders, extractors, client, checkpoint=None):
+    """
+    Stream (extractor, row) pairs as each order passes through the extractors.
+    With a checkpoint, unchanged orders reuse their stored rows.
+    """
+    for order in orders:
+        for extractor in extractors:
+            with tracer.span(f"extract {extractor.SHEET}"):
+                if checkpoint is not None:
+                    rows = checkpoint.extract(order, extractor, client)
+                else:
+                    rows = extractor.extract(order, client)
+            for row in rows:
+                yield extractor, row
+
+
+def write_snapshot(rows_by_order, formats, prefix, compress=None, parquet=None, window=(None, None)):
+    """
+    Rewrite the full output from the in-memory rows, newest order first like
+    a one-shot run. Files are written under a temporary name and renamed
+    into place, so readers never see a half-written file. `window` is the
+    (start, end) the rows cover, for the Parquet export.
+    """
+    with tracer.span("write snapshot"), \
+            ResultWriters(formats, prefix=f"{prefix}.partial", compress=compress, timestamp=False) as out:
+        if parquet:
+            from utils.parquet_export import OrderRowsParquetWriter
+            out.add(OrderRowsParquetWriter(parquet, *window))
+
+        for created, rows in sorted(rows_by_order.values(), key=lambda x: x[0], reverse=True):
+            for extractor, row in rows:
+                out.write(row, sheet=extractor.SHEET)
+
+    for w in out.writers:
+        if isinstance(w.path, str) and ".partial." in w.path:
+            os.replace(w.path, w.path.replace(".partial.", ".", 1))
+    return out.count
+
+
+def watch(client, finder, extractors, location_ids, start_dt, end_dt, args, checkpoint=None, stats=None):
+    """
+    Stay resident: one full search, then poll for orders updated since the
+    previous poll and re-extract only those whose version changed. Customer,
+    location and catalog lookups are cached for the life of the process.
+    """
+    client = CachingClient(client, stats)
+    rows_by_order = {}  # order_id -> (created_at, [(extractor, row), ...])
+    versions = {}
+
+    def ingest(orders):
+        changed = 0
+        for order in orders:
+            created = date_parser.isoparse(order.created_at)
+            if created < start_dt or (end_dt and created >= end_dt):
+                continue
+            version = getattr(order, "version", None)
+            if version is not None and versions.get(order.id) == version:
+                continue
+            versions[order.id] = version
+            rows = list(iter_results([order], extractors, client, checkpoint))
+            if rows:
+                rows_by_order[order.id] = (created, rows)
+            else:
+                rows_by_order.pop(order.id, None)
+            changed += 1
+        return changed
+
+    poll_started = datetime.now(timezone.utc)
+    end_iso = (end_dt or datetime.now(timezone.utc) + timedelta(days=1)).isoformat()
+    ingest(finder.iter_orders(start_dt.isoformat(), end_iso, location_ids))
+    count = write_snapshot(rows_by_order, args.format, args.watch_prefix, args.compress, args.parquet,
+                           (start_dt, end_dt))
+    print(f"👀 Watching {len(versions)} orders, {count} records → {args.watch_prefix}.* "
+          f"(polling every {args.interval}s, Ctrl-C to stop)")
+
+    try:
+        while True:
+            time.sleep(args.interval)
+            # Overlap polls slightly so clock skew can't drop an update
+            since = (poll_started - timedelta(seconds=args.overlap)).isoformat()
+            poll_started = datetime.now(timezone.utc)
+            with tracer.span("poll"):
+                changed = ingest(finder.iter_updated_orders(since, location_ids))
+            stamp = datetime.now().strftime("%H:%M:%S")
+            if changed:
+                count = write_snapshot(rows_by_order, args.format, args.watch_prefix, args.compress,
+                                       args.parquet, (start_dt, end_dt))
+                print(f"[{stamp}] 🔄 {changed} new/updated orders, {count} records written")
+            else:
+                print(f"[{stamp}] no changes ({client.cache_sizes()['customers']} customers cached)")
+    except KeyboardInterrupt:
+        print("\nStopped watching.")
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Search Square item sales.")
     group = parser.add_mutually_exclusive_group(required=True)
     group.add_argument("--item", help="Single item name")
     group.add_argument("--all", action="store_true", help="Run ALL extractors")
     parser.add_argument("--start")
     parser.add_argument("--end")
     parser.add_argument("--output", default="orders.xlsx")
-    args = parser.parse_args()
-
-    token = os.getenv("SQUARE_ACCESS_TOKEN") or "EAAAly8mEyanb9A8n_mDWkIXvzMj74XtZOM6gDTChMPpyBSro1CSFTqtw9uNF80D"
-    if not token:
-        raise RuntimeError("Missing SQUARE_ACCESS_TOKEN environment variable.")
-
-    client = Square(token=token)
+    parser.add_argument(
+        "--format", nargs="+", choices=sorted(WRITERS), default=["jsonl", "xlsx"],
+        help="Output formats, written incrementally as rows are extracted"
+    )
+    parser.add_argument("--compress", choices=["gzip", "zstd"], help="Compress JSONL/CSV output on the fly")
+    parser.add_argument("--parquet", metavar="DIR", help="Also export rows to a Parquet dataset under DIR")
+    parser.add_argument("--warehouse", metavar="DB", help="Run offline against a local warehouse (see warehouse_sync.py)")
+    add_fixture_arguments(parser)
+    add_stats_arguments(parser)
+    add_trace_arguments(parser)
+    add_profile_arguments(parser)
+    parser.add_argument(
+        "--checkpoint", nargs="?", const=DEFAULT_CHECKPOINT_PATH, metavar="DB",
+        help=f"Only re-extract new or changed orders, reusing stored rows (default: {DEFAULT_CHECKPOINT_PATH})"
+    )
+    parser.add_argument("--watch", action="store_true", help="Stay running and poll for new or updated orders")
+    parser.add_argument("--interval", type=int, default=120, help="Seconds between --watch polls")
+    parser.add_argument("--overlap", type=int, default=60, help="Seconds each --watch poll overlaps the previous one")
+    parser.add_argument("--watch-prefix", default="orders_watch", help="Output file prefix for --watch (no timestamp)")
+    args = parser.parse_args(argv)
+    require_explicit_dates(parser, args, "--start", "--end")
+    if args.trace:
+        tracer.enable()
+    start_profiling(args, "square_order_info")
+
+    stats = ApiStats()
+    if args.warehouse:
+        from warehouse import Warehouse, WarehouseClient
+        client = WarehouseClient(Warehouse(args.warehouse))
+    else:
+        token = os.getenv("SQUARE_ACCESS_TOKEN") or "EAAAly8mEyanb9A8n_mDWkIXvzMj74XtZOM6gDTChMPpyBSro1CSFTqtw9uNF80D"
+        client = square_client_for(token, args.record, args.replay, args.replay_latency, args.base_url, stats=stats)
+    client = InstrumentedClient(client, stats)
     finder = SquareOrderFinder(client)
 
     # Determine extractor
@@ -67,29 +191,58 @@ def main():
     )
 
     # Location IDs
-    locations = client.locations.list()
+    with tracer.span("list locations"):
+        locations = client.locations.list()
     location_ids = [loc.id for loc in locations.locations]
 
-    # Search Orders
-    orders = finder.search_orders(start_dt.isoformat(), end_dt.isoformat(), location_ids)
-
-    # Extract structured info
-    all_results = []
-
-    for extractor in extractors:
-        for order in orders:
-            results = extractor.extract(order, client)
-            all_results.extend(results)
-
-
-    if not all_results:
-        print("No matching items found.")
+    checkpoint = ExtractionCheckpoint(args.checkpoint) if args.checkpoint else None
+
+    if args.watch:
+        try:
+            watch(client, finder, extractors, location_ids, start_dt,
+                  end_dt if args.end else None, args, checkpoint, stats)
+        finally:
+            if checkpoint is not None:
+                checkpoint.close()
+            stats.report(args.api_stats)
+            if args.trace:
+                tracer.print_summary()
+                tracer.write(args.trace, process_name="square_order_info --watch")
         return
 
-    # Output file writing
-    save_results(all_results)
-
-    print(f"Done. Extracted {len(all_results)} records.")
+    # Search Orders (paged lazily; nothing below holds the full result set)
+    orders = finder.iter_orders(start_dt.isoformat(), end_dt.isoformat(), location_ids)
+
+    # Extract structured info and write as we go
+    try:
+        with ResultWriters(args.format, compress=args.compress) as out:
+            if args.parquet:
+                from utils.parquet_export import OrderRowsParquetWriter
+                out.add(OrderRowsParquetWriter(args.parquet, start_dt, end_dt))
+
+            for extractor, row in iter_results(orders, extractors, client, checkpoint):
+                with tracer.span("write row"):
+                    out.write(row, sheet=extractor.SHEET)
+    finally:
+        # Commits the rows extracted since the last periodic commit, even
+        # when the run dies or is interrupted part way
+        if checkpoint is not None:
+            print(f"🗄️  {checkpoint.summary()}")
+            checkpoint.close()
+
+    if not out.count:
+        for w in out.writers:
+            if os.path.isfile(w.path):
+                os.remove(w.path)
+        print("No matching items found.")
+    else:
+        print(f"Done. Extracted {out.count} records:")
+        for w in out.writers:
+            print(f" - {w.path}")
+    stats.report(args.api_stats)
+    if args.trace:
+        tracer.print_summary()
+        tracer.write(args.trace, process_name="square_order_info")
 
 
 if __name__ == "__main__":
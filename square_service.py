@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Run the resident tipout / order-extraction service.
+
+Usage:
+    python square_service.py --warm-weeks 2
+    python square_service.py --warehouse square_warehouse.sqlite --port 8790
+    python square_service.py --base-url http://127.0.0.1:8800      # against mock_square_server.py
+
+    curl "http://127.0.0.1:8790/tipout?week=2025-11-24"
+    curl "http://127.0.0.1:8790/tipout?week=2025-11-24&location=L1&method=clockin&ignore=2025-11-27"
+    curl "http://127.0.0.1:8790/orders/extract?extractor=thanksgiving,countdown&start=2025-11-01&end=2025-11-28"
+    curl "http://127.0.0.1:8790/health"
+
+The first request for a week or order window calls Square; repeats are
+answered from memory. Add refresh=1 to re-read from Square.
+"""
+
+import argparse
+import asyncio
+import os
+
+from service import ServiceServer, ServiceState
+from service.state import DEFAULT_MAX_ENTRIES, DEFAULT_MAX_ROWS, DEFAULT_TEAM_TTL, DEFAULT_TTL
+from utils.api_fixtures import add_fixture_arguments, square_client_for
+from utils.api_stats import ApiStats, InstrumentedClient, add_stats_arguments
+
+
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Resident tipout and order-extraction service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8790)
+    parser.add_argument("--workers", type=int, default=4, help="Threads running requests against Square")
+    parser.add_argument("--warehouse", metavar="DB", help="Serve from a local warehouse instead of the API")
+    parser.add_argument("--ttl", type=int, default=DEFAULT_TTL,
+                        help=f"Seconds before data for a still-open week or window is re-read (default {DEFAULT_TTL})")
+    parser.add_argument("--team-ttl", type=int, default=DEFAULT_TEAM_TTL,
+                        help=f"Seconds team member names are cached (default {DEFAULT_TEAM_TTL})")
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_ENTRIES,
+                        help=f"Weeks, results and order windows kept in memory (default {DEFAULT_MAX_ENTRIES})")
+    parser.add_argument("--row-cache-size", type=int, default=DEFAULT_MAX_ROWS,
+                        help=f"Extracted (extractor, order) results kept in memory (default {DEFAULT_MAX_ROWS})")
+    parser.add_argument("--warm-weeks", type=int, default=0, help="Load this many recent weeks at startup")
+    parser.add_argument("--verbose", action="store_true", help="Log every request")
+    add_fixture_arguments(parser)
+    add_stats_arguments(parser)
+    args = parser.parse_args(argv)
+
+    stats = ApiStats()
+    workers = args.workers
+    if args.warehouse:
+        from warehouse import Warehouse, WarehouseClient
+        # One SQLite connection, used from one worker thread at a time.
+        client = WarehouseClient(Warehouse(args.warehouse, check_same_thread=False))
+        workers = 1
+    else:
+        token = os.getenv("SQUARE_ACCESS_TOKEN")
+        client = square_client_for(token, args.record, args.replay, args.replay_latency, args.base_url, stats=stats)
+    client = InstrumentedClient(client, stats)
+
+    from square_order_info import EXTRACTORS
+
+    state = ServiceState(client, EXTRACTORS, ttl=args.ttl, team_ttl=args.team_ttl,
+                         max_entries=args.cache_size, max_rows=args.row_cache_size, stats=stats)
+    server = ServiceServer(state, args.host, args.port, workers=workers, verbose=args.verbose)
+    try:
+        asyncio.run(server.serve(warm_weeks=args.warm_weeks))
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    finally:
+        server.close()
+        stats.report(args.api_stats)
+
+
+if __name__ == "__main__":
+    main()
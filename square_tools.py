@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+One CLI for the Square tools.
+
+Usage:
+    square-tools tipout --date 2025-11-20
+    square-tools orders --all --start 2025-11-01 --format jsonl xlsx
+    square-tools item-sales --item "cheese board" --start 2025-11-01
+    square-tools invoices --dir invoices/2025-11/ --output november.csv
+    square-tools serve --warm-weeks 2
+    square-tools tipout --help
+
+Each subcommand is the matching script's main() with the remaining
+arguments. Only the chosen command's module is imported, after the command
+is known, so `square-tools --help` loads none of the Square SDK, pandas,
+pdfplumber or openpyxl. The scripts defer those imports until a run needs
+them.
+"""
+
+import argparse
+import importlib
+import sys
+
+# subcommand -> (module, help)
+COMMANDS = {
+    "tipout": ("tipout_main", "Weekly tip pool and payroll report"),
+    "orders": ("square_order_info", "Extract board / countdown orders to JSONL, CSV or Excel"),
+    "item-sales": ("find_item_sales", "Find transactions containing an item"),
+    "invoices": ("parse_invoices", "Parse vendor invoice PDFs"),
+    "serve": ("square_service", "Resident service answering tipout and extraction queries over HTTP"),
+}
+
+
+def main(argv=None):
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv and argv[0] in COMMANDS:
+        # Everything after the command, --help included, is the command's.
+        module = importlib.import_module(COMMANDS[argv[0]][0])
+        return module.main(argv[1:], prog=f"square-tools {argv[0]}")
+
+    parser = argparse.ArgumentParser(prog="square-tools", description="Square reporting and extraction tools.")
+    sub = parser.add_subparsers(dest="command", required=True, metavar="COMMAND")
+    for name, (_, help_text) in COMMANDS.items():
+        sub.add_parser(name, help=help_text)
+    parser.parse_args(argv)  # prints help or a usage error and exits
+
+
+if __name__ == "__main__":
+    sys.exit(main())
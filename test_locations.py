@@ -1,8 +1,9 @@
-from square import Square
 from square.environment import SquareEnvironment
 
+from utils.square_http import make_square_client
+
 # Initialize the Square client
-client = Square(
+client = make_square_client(
     token="EAAAly8mEyanb9A8n_mDWkIXvzMj74XtZOM6gDTChMPpyBSro1CSFTqtw9uNF80D",
     environment=SquareEnvironment.PRODUCTION  # or Environment.SANDBOX
 )
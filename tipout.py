@@ -1,6 +1,7 @@
 import os
 import datetime
 from square import Square
+from utils.square_http import make_square_client
 from dateutil import tz
 from dateutil import parser as date_parser
 from collections import defaultdict
@@ -438,7 +439,7 @@ def main(target_date=None, ignore_dates=None, start_of_week=0):
     token = os.getenv("SQUARE_ACCESS_TOKEN") or "EAAAly8mEyanb9A8n_mDWkIXvzMj74XtZOM6gDTChMPpyBSro1CSFTqtw9uNF80D"
     location_id = os.getenv("SQUARE_LOCATION_ID") or "LRJKGMZV2MY77"
 
-    client = Square(token=token)
+    client = make_square_client(token)
     location_list = client.locations.list()
     # location_list = location_list.locations()
     for location in location_list.locations or []:
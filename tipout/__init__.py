@@ -9,5 +9,5 @@ from .timecards import fetch_timecards
 from .payments import fetch_payments
 from .aggregation import aggregate_hours_and_tips_by_day, aggregate_tips_by_hour
 from .distribution import distribute_daily_tips, distribute_tips_by_clockin
-from .reporting import print_weekly_report, print_hourly_tip_summary
+from .reporting import print_weekly_report, print_hourly_tip_summary, print_combined_report, combine_locations, team_member_names
 from .utils import get_week_bounds, utc_to_local    
@@ -1,6 +1,8 @@
 from dateutil import parser as date_parser
 from dateutil import tz
 
+from utils.tracing import traced
+
 LOCAL_TZ = tz.gettz("America/New_York")
 
 
@@ -21,6 +23,7 @@ def fetch_payments(client, location_id, start_iso, end_iso):
         return []
 
 
+@traced("resolve service charges")
 def fetch_order_service_charges(client, order_id):
     """
     Fetch auto-gratuity from the Order object.
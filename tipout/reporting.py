@@ -66,25 +66,25 @@ def print_hourly_tip_summary(hourly_data):
         print(f"{hour:<25} {card:12.2f} {auto:12.2f} {card + auto:12.2f}")
 
 
-def print_combined_report(client, all_location_data, title="Combined Payroll Summary"):
+def team_member_names(client, location_ids):
     """
-    all_location_data = {
-        location_id: agg_dict_for_that_location,
-        ...
-    }
+    {team_member_id: "Given Family"} for the active team at these locations.
     """
-
-    # Build team member name map across ALL locations
     team_map = {}
-    for location_id in all_location_data.keys():
+    for location_id in location_ids:
         tm_search = client.team_members.search(
             query={"filter": {"location_ids": [location_id], "status": "ACTIVE"}}
         )
         for tm in getattr(tm_search, "team_members", []) or []:
             name = f"{tm.given_name or ''} {tm.family_name or ''}".strip()
             team_map[tm.id] = name
+    return team_map
+
 
-    # Combine totals from all locations
+def combine_locations(all_location_data):
+    """
+    Sum per-location allocations into one {team_member_id: totals} dict.
+    """
     combined = defaultdict(lambda: {
         "hours": 0,
         "declared_cash_tips": 0,
@@ -100,6 +100,20 @@ def print_combined_report(client, all_location_data, title="Combined Payroll Sum
             combined[tm_id]["card_tips"] += rec["card_tips"]
             combined[tm_id]["tip_out_allocated"] += rec["tip_out_allocated"]
             combined[tm_id]["tip_out_allocated_after_card_processing"] += rec["tip_out_allocated_after_card_processing"]
+    return combined
+
+
+def print_combined_report(client, all_location_data, title="Combined Payroll Summary"):
+    """
+    all_location_data = {
+        location_id: agg_dict_for_that_location,
+        ...
+    }
+    """
+
+    # Build team member name map across ALL locations
+    team_map = team_member_names(client, all_location_data.keys())
+    combined = combine_locations(all_location_data)
 
     # --- Print Report ---
     print("\n" + title)
@@ -1,10 +1,6 @@
 from datetime import datetime
 from dateutil import parser as date_parser
 from dateutil import tz
-from square.types.time_range import TimeRange
-from square.types.timecard_workday import TimecardWorkday
-from square.types.timecard_filter import TimecardFilter
-from square.types.timecard_query import TimecardQuery
 
 LOCAL_TZ = tz.gettz("America/New_York")
 
@@ -13,6 +9,13 @@ def fetch_timecards(client, location_id, start_iso, end_iso):
     """
     Returns list of timecard objects in the window.
     """
+    # Imported here: the SDK's pydantic models are slow to import and
+    # aren't needed for --help or reporting-only paths.
+    from square.types.time_range import TimeRange
+    from square.types.timecard_workday import TimecardWorkday
+    from square.types.timecard_filter import TimecardFilter
+    from square.types.timecard_query import TimecardQuery
+
     try:
         filter_obj = TimecardFilter(
             location_ids=[location_id],
@@ -1,6 +1,7 @@
 import os
 import datetime
 from square import Square
+from utils.square_http import make_square_client
 from dateutil import tz
 from dateutil import parser as date_parser
 from collections import defaultdict
@@ -590,7 +591,7 @@ def main(target_date=None, ignore_dates=None, start_of_week=0):
     run_tipout_hourly_report = False
     run_tipout_report = True
 
-    client = Square(token=token)
+    client = make_square_client(token)
     location_list = client.locations.list()
     # location_list = location_list.locations()
     for location in location_list.locations or []:
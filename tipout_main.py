@@ -1,6 +1,9 @@
 import argparse
 import os
-from square import Square
+from utils.api_fixtures import add_fixture_arguments, require_explicit_dates, square_client_for
+from utils.api_stats import ApiStats, InstrumentedClient, add_stats_arguments
+from utils.profiling import add_profile_arguments, start_profiling
+from utils.tracing import add_trace_arguments, tracer
 
 from tipout.timecards import fetch_timecards
 from tipout.payments import fetch_payments
@@ -9,21 +12,35 @@ from tipout.distribution import distribute_daily_tips, distribute_tips_by_clocki
 from tipout.reporting import print_weekly_report, print_hourly_tip_summary, print_combined_report
 from tipout.utils import get_week_bounds, utc_to_local
 
-def main():
-    parser = argparse.ArgumentParser(description="Weekly Square Tipout Report")
+def main(argv=None, prog=None):
+    parser = argparse.ArgumentParser(prog=prog, description="Weekly Square Tipout Report")
     parser.add_argument("--date", help="Date inside the target week (YYYY-MM-DD)")
     parser.add_argument("--ignore", nargs="*", default=[], help="Dates to ignore")
     parser.add_argument("--location", nargs="*", help="Specific location IDs to include")
-    args = parser.parse_args()
-
-    token = os.getenv("SQUARE_ACCESS_TOKEN") or "EAAAly8mEyanb9A8n_mDWkIXvzMj74XtZOM6gDTChMPpyBSro1CSFTqtw9uNF80D"
-    if not token:
-        raise RuntimeError("Missing SQUARE_ACCESS_TOKEN environment variable.")
-
-    client = Square(token=token)
+    parser.add_argument("--parquet", metavar="DIR", help="Also export allocations to a Parquet dataset under DIR")
+    parser.add_argument("--warehouse", metavar="DB", help="Run offline against a local warehouse (see warehouse_sync.py)")
+    add_fixture_arguments(parser)
+    add_stats_arguments(parser)
+    add_trace_arguments(parser)
+    add_profile_arguments(parser)
+    args = parser.parse_args(argv)
+    require_explicit_dates(parser, args, "--date")
+    if args.trace:
+        tracer.enable()
+    start_profiling(args, "tipout_main")
+
+    stats = ApiStats()
+    if args.warehouse:
+        from warehouse import Warehouse, WarehouseClient
+        client = WarehouseClient(Warehouse(args.warehouse))
+    else:
+        token = os.getenv("SQUARE_ACCESS_TOKEN") or "EAAAly8mEyanb9A8n_mDWkIXvzMj74XtZOM6gDTChMPpyBSro1CSFTqtw9uNF80D"
+        client = square_client_for(token, args.record, args.replay, args.replay_latency, args.base_url, stats=stats)
+    client = InstrumentedClient(client, stats)
 
     # --- Fetch all locations ---
-    loc_resp = client.locations.list()
+    with tracer.span("list locations"):
+        loc_resp = client.locations.list()
     all_locations = {loc.id: loc for loc in (loc_resp.locations or [])}
 
     # --- Filter locations if --location flag is given ---
@@ -47,27 +64,33 @@ def main():
         location_id = loc.id
         print(f"\n📍 Processing Location: {loc.name} (ID: {location_id})")
 
-        timecards = fetch_timecards(client, location_id, start_iso, end_iso)
-        payments  = fetch_payments(client, location_id, start_iso, end_iso)
-
-        if args.ignore:
-            filtered = []
-            for p in payments:
-                local_date = utc_to_local(getattr(p, "created_at", None))
-                if local_date not in args.ignore:
-                    filtered.append(p)
-            payments = filtered
-
-        # --- Aggregation ---
-        daily = aggregate_hours_and_tips_by_day(timecards, payments, client)
-
-        # --- Distribute ---
-        daily_alloc   = distribute_daily_tips(daily)
-        clockin_alloc = distribute_tips_by_clockin(
-            payments, timecards, client,
-            simulate_tm_id=None,
-            simulate_cutoff=None
-        )
+        with tracer.span("location", location=loc.name, location_id=location_id):
+            with tracer.span("fetch timecards"):
+                timecards = fetch_timecards(client, location_id, start_iso, end_iso)
+            with tracer.span("fetch payments"):
+                payments  = fetch_payments(client, location_id, start_iso, end_iso)
+
+            if args.ignore:
+                filtered = []
+                for p in payments:
+                    local_date = utc_to_local(getattr(p, "created_at", None))
+                    if local_date not in args.ignore:
+                        filtered.append(p)
+                payments = filtered
+
+            # --- Aggregation ---
+            with tracer.span("aggregate hours and tips", payments=len(payments), timecards=len(timecards)):
+                daily = aggregate_hours_and_tips_by_day(timecards, payments, client)
+
+            # --- Distribute ---
+            with tracer.span("distribute daily pool"):
+                daily_alloc   = distribute_daily_tips(daily)
+            with tracer.span("distribute by clock-in"):
+                clockin_alloc = distribute_tips_by_clockin(
+                    payments, timecards, client,
+                    simulate_tm_id=None,
+                    simulate_cutoff=None
+                )
 
         # --- Reporting ---
         # print_weekly_report(client, location_id, daily_alloc, title=f"{loc.name} • Daily Pool Tip Report")
@@ -77,9 +100,24 @@ def main():
         all_location_clockin_results[location_id] = clockin_alloc
         # hourly = aggregate_tips_by_hour(payments, client)
         # print_hourly_tip_summary(hourly)
-    print_combined_report(client, all_location_results, title="Combined Tip + Payroll Summary Across All Locations")
-    print_combined_report(client, all_location_clockin_results, title="Combined Clock-In Tip Summary Across All Locations")
-
+    with tracer.span("render reports"):
+        print_combined_report(client, all_location_results, title="Combined Tip + Payroll Summary Across All Locations")
+        print_combined_report(client, all_location_clockin_results, title="Combined Clock-In Tip Summary Across All Locations")
+
+    if args.parquet:
+        from utils.parquet_export import export_tipout
+
+        with tracer.span("parquet export"):
+            count = export_tipout(args.parquet, utc_to_local(start_iso), {
+                "daily_pool": all_location_results,
+                "clockin": all_location_clockin_results,
+            })
+        print(f"\n💾 Exported {count} tipout rows to {args.parquet}/tipout")
+
+    stats.report(args.api_stats)
+    if args.trace:
+        tracer.print_summary()
+        tracer.write(args.trace, process_name="tipout_main")
 
 
 if __name__ == "__main__":
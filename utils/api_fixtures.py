@@ -0,0 +1,228 @@
+"""
+Record and replay Square API traffic at the HTTP transport.
+
+Record mode forwards every request to Square and saves the request and the
+response as a gzip'd JSON fixture. Replay mode serves those fixtures without
+touching the network, so whole pipelines (tipout_main, square_order_info,
+find_item_sales) can be profiled, benchmarked and regression-tested offline
+on identical data.
+
+Fixtures are keyed by method, path, sorted query string and canonical JSON
+body. When the same request is made several times in one run (polling,
+retries), each response is stored under its own sequence number and replayed
+in order; the last one repeats. The Authorization header is never stored.
+
+    client = square_client_for(token, record="fixtures/week47")
+    client = square_client_for(None, replay="fixtures/week47", latency="recorded")
+"""
+
+import gzip
+import hashlib
+import json
+import re
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+
+import httpx
+
+# Hop-by-hop / encoding headers; the stored body is already decoded.
+DROPPED_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection"}
+
+
+class MissingFixtureError(LookupError):
+    pass
+
+
+def request_key(request):
+    """
+    (key, label) for a request. Equivalent requests get the same key
+    regardless of query parameter order or JSON key order.
+    """
+    body = request.content or b""
+    if body:
+        try:
+            body = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode("utf-8")
+        except ValueError:
+            pass
+    query = "&".join(sorted(request.url.query.decode("ascii").split("&"))) if request.url.query else ""
+    raw = b"\n".join([request.method.encode(), request.url.path.encode(), query.encode(), body])
+    label = re.sub(r"[^A-Za-z0-9]+", "_", request.url.path).strip("_")[:60]
+    return hashlib.sha1(raw).hexdigest()[:16], f"{request.method}_{label}"
+
+
+def _fixture_name(label, key, seq):
+    return f"{label}_{key}_{seq:04d}.json.gz"
+
+
+class RecordingTransport(httpx.BaseTransport):
+    """
+    Forwards requests to `inner` (a real HTTP transport) and saves each
+    exchange under `directory`.
+    """
+
+    def __init__(self, directory, inner=None):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.inner = inner or httpx.HTTPTransport()
+        self.count = 0
+        self._seq = defaultdict(int)
+        self._lock = threading.Lock()
+
+    def handle_request(self, request):
+        started = time.perf_counter()
+        response = self.inner.handle_request(request)
+        content = response.read()
+        elapsed = time.perf_counter() - started
+        headers = [(k, v) for k, v in response.headers.items() if k.lower() not in DROPPED_HEADERS]
+
+        key, label = request_key(request)
+        with self._lock:
+            seq = self._seq[key]
+            self._seq[key] += 1
+            self.count += 1
+        fixture = {
+            "request": {
+                "method": request.method,
+                "url": str(request.url),
+                "body": (request.content or b"").decode("utf-8", "replace"),
+            },
+            "response": {
+                "status": response.status_code,
+                "headers": headers,
+                "body": content.decode("utf-8", "replace"),
+            },
+            "elapsed": round(elapsed, 4),
+        }
+        with gzip.open(self.directory / _fixture_name(label, key, seq), "wt", encoding="utf-8") as f:
+            json.dump(fixture, f)
+
+        return httpx.Response(response.status_code, headers=headers, content=content, request=request)
+
+    def close(self):
+        self.inner.close()
+
+
+class ReplayTransport(httpx.BaseTransport):
+    """
+    Serves recorded fixtures. `latency` is None (no delay), seconds to sleep
+    per request, or "recorded" to sleep as long as the original call took.
+    """
+
+    def __init__(self, directory, latency=None):
+        self.directory = Path(directory)
+        if not self.directory.is_dir():
+            raise MissingFixtureError(f"No fixture directory at {self.directory}")
+        self.latency = latency
+        self.count = 0
+        self._files = defaultdict(list)
+        for path in sorted(self.directory.glob("*.json.gz")):
+            key = path.name[:-len(".json.gz")].rsplit("_", 2)[-2]
+            self._files[key].append(path)
+        self._seq = defaultdict(int)
+        self._loaded = {}
+        self._lock = threading.Lock()
+
+    def _fixture(self, path):
+        if path not in self._loaded:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                self._loaded[path] = json.load(f)
+        return self._loaded[path]
+
+    def handle_request(self, request):
+        key, label = request_key(request)
+        with self._lock:
+            files = self._files.get(key)
+            if not files:
+                raise MissingFixtureError(
+                    f"No recorded response for {request.method} {request.url} ({label}_{key}) in {self.directory}"
+                )
+            path = files[min(self._seq[key], len(files) - 1)]
+            self._seq[key] += 1
+            self.count += 1
+            fixture = self._fixture(path)
+
+        if self.latency == "recorded":
+            time.sleep(fixture.get("elapsed", 0))
+        elif self.latency:
+            time.sleep(self.latency)
+
+        resp = fixture["response"]
+        return httpx.Response(
+            resp["status"],
+            headers=resp["headers"],
+            content=resp["body"].encode("utf-8"),
+            request=request,
+        )
+
+
+def parse_latency(value):
+    """
+    argparse type for --replay-latency: milliseconds, or "recorded".
+    """
+    if value == "recorded":
+        return value
+    return float(value) / 1000.0
+
+
+def add_fixture_arguments(parser):
+    parser.add_argument("--record", metavar="DIR",
+                        help="Save every Square API exchange to DIR for --replay (dates must be given explicitly)")
+    parser.add_argument("--replay", metavar="DIR",
+                        help="Serve Square API calls from fixtures in DIR (no network). Give the same explicit "
+                             "dates as the recording; defaults like 'until now' change the request")
+    parser.add_argument("--replay-latency", type=parse_latency, metavar="MS|recorded",
+                        help="Delay each replayed call by MS milliseconds, or by its recorded duration")
+    parser.add_argument("--base-url", help="Send API calls here instead of Square (e.g. mock_square_server.py)")
+
+
+def require_explicit_dates(parser, args, *options):
+    """
+    Fixtures are keyed by request body, and a date option that defaults to
+    today or now puts a different timestamp there on every run, so the
+    replay never matches. Exit with a usage error when --record or --replay
+    is used without `options` (e.g. "--start", "--end").
+    """
+    if not (args.record or args.replay):
+        return
+    missing = [o for o in options if getattr(args, o.lstrip("-").replace("-", "_")) is None]
+    if missing:
+        parser.error(f"--record/--replay need {' and '.join(missing)}; the default depends on the current time")
+
+
+def square_client_for(token, record=None, replay=None, latency=None, base_url=None, stats=None):
+    """
+    Build a Square client, optionally recording to or replaying from a
+    fixture directory, or pointed at another base URL. Replay needs no token.
+    `stats` (utils.api_stats.ApiStats) gets every HTTP request and response.
+    Without fixtures the client uses the shared pooled HTTP client
+    (utils.square_http), with the stats hooks added to it.
+    """
+    from utils.square_http import (
+        add_event_hooks,
+        make_http_client,
+        make_square_client,
+        pooled_transport,
+        shared_http_client,
+    )
+
+    if record and replay:
+        raise ValueError("Use either record or replay, not both.")
+    if not (token or replay):
+        raise RuntimeError("Missing SQUARE_ACCESS_TOKEN environment variable.")
+
+    transport = None
+    if replay:
+        transport = ReplayTransport(replay, latency=latency)
+    elif record:
+        transport = RecordingTransport(record, inner=pooled_transport())
+
+    event_hooks = stats.http_hooks() if stats else None
+    if transport:
+        http_client = make_http_client(transport=transport, event_hooks=event_hooks)
+    else:
+        http_client = shared_http_client()
+        if event_hooks:
+            add_event_hooks(http_client, event_hooks)
+    return make_square_client(token or "replay", base_url=base_url, http_client=http_client)
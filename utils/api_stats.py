@@ -0,0 +1,251 @@
+"""
+Per-endpoint instrumentation of Square API usage.
+
+Two layers are measured:
+- client calls ("orders.get", "customers.get", ...) through InstrumentedClient,
+  a proxy around Square(...) or WarehouseClient: count, errors, latency;
+- HTTP requests ("GET /v2/orders/{id}") through httpx event hooks on the
+  client's transport: count, latency, retried responses (429/5xx, which the
+  SDK retries), bytes sent and received.
+
+CachingClient reports cache hits into the same ApiStats. One call can be
+several HTTP requests (retries, pager pages) or none (cache hits, offline
+warehouse).
+
+    stats = ApiStats()
+    client = InstrumentedClient(square_client_for(token, stats=stats), stats)
+    ...
+    stats.report(json_path=args.api_stats)
+"""
+
+import json
+import random
+import re
+import threading
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime
+from pathlib import Path
+
+from utils.tracing import tracer
+
+# Upper bounds (ms) of the latency histogram buckets; the last is open-ended.
+LATENCY_BUCKETS_MS = [5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000]
+RETRIED_STATUSES = {408, 409, 429}
+# Latencies kept per endpoint for p50/p95. Counts, totals, max and the
+# histogram are exact; past this many calls the percentiles come from a
+# uniform sample, so --watch and the service don't grow without bound.
+RESERVOIR_SIZE = 1024
+
+# Square IDs are long and contain capitals or digits; collection and action
+# names ("team-members", "batch-retrieve") are lower-case words.
+_ID_SEGMENT = re.compile(r"^(?=.*[A-Z0-9])[A-Za-z0-9_\-:]{8,}$")
+
+
+def endpoint_template(method, path):
+    """
+    "GET /v2/orders/ABC123XYZ" -> "GET /v2/orders/{id}".
+    """
+    parts = ["{id}" if _ID_SEGMENT.match(p) else p for p in path.split("/")]
+    return f"{method} {'/'.join(parts)}"
+
+
+class EndpointStats:
+    def __init__(self):
+        self.calls = 0
+        self.errors = 0
+        self.cache_hits = 0
+        self.retried = 0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.observed = 0
+        self.total_seconds = 0.0
+        self.max_seconds = None
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.samples = []
+        self._rng = random.Random()
+
+    def observe(self, seconds):
+        self.observed += 1
+        self.total_seconds += seconds
+        self.max_seconds = seconds if self.max_seconds is None else max(self.max_seconds, seconds)
+        self.buckets[bisect_left(LATENCY_BUCKETS_MS, seconds * 1000)] += 1
+        # Reservoir sampling: every observation is kept with equal probability
+        if len(self.samples) < RESERVOIR_SIZE:
+            self.samples.append(seconds)
+        else:
+            slot = self._rng.randrange(self.observed)
+            if slot < RESERVOIR_SIZE:
+                self.samples[slot] = seconds
+
+    def histogram(self):
+        labels = [f"<={b}ms" for b in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}ms"]
+        return dict(zip(labels, self.buckets))
+
+    def percentile(self, q):
+        if not self.samples:
+            return None
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+    def as_dict(self):
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "cache_hits": self.cache_hits,
+            "retried": self.retried,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "total_seconds": round(self.total_seconds, 4),
+            "p50_ms": _ms(self.percentile(0.5)),
+            "p95_ms": _ms(self.percentile(0.95)),
+            "max_ms": _ms(self.max_seconds),
+            "histogram": self.histogram(),
+        }
+
+
+def _ms(seconds):
+    return round(seconds * 1000, 2) if seconds is not None else None
+
+
+class ApiStats:
+    def __init__(self):
+        self.calls = defaultdict(EndpointStats)
+        self.http = defaultdict(EndpointStats)
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+
+    # ---- recording ----
+
+    def record_call(self, endpoint, seconds, error=False):
+        with self._lock:
+            s = self.calls[endpoint]
+            s.calls += 1
+            s.errors += bool(error)
+            s.observe(seconds)
+
+    def cache_hit(self, endpoint):
+        with self._lock:
+            self.calls[endpoint].cache_hits += 1
+
+    def _on_request(self, request):
+        request.extensions["api_stats_started"] = time.perf_counter()
+
+    def _on_response(self, response):
+        response.read()
+        request = response.request
+        seconds = time.perf_counter() - request.extensions.get("api_stats_started", time.perf_counter())
+        with self._lock:
+            s = self.http[endpoint_template(request.method, request.url.path)]
+            s.calls += 1
+            s.observe(seconds)
+            s.bytes_sent += len(request.content or b"")
+            s.bytes_received += len(response.content)
+            if response.status_code >= 400:
+                s.errors += 1
+            if response.status_code in RETRIED_STATUSES or response.status_code >= 500:
+                s.retried += 1
+
+    def http_hooks(self):
+        """
+        event_hooks for httpx.Client.
+        """
+        return {"request": [self._on_request], "response": [self._on_response]}
+
+    # ---- reporting ----
+
+    def as_dict(self):
+        return {
+            "created_at": datetime.now().isoformat(timespec="seconds"),
+            "wall_seconds": round(time.perf_counter() - self.started, 3),
+            "calls": {name: s.as_dict() for name, s in sorted(self.calls.items())},
+            "http": {name: s.as_dict() for name, s in sorted(self.http.items())},
+        }
+
+    def print_summary(self):
+        wall = time.perf_counter() - self.started
+        print("\nAPI usage")
+        print("=" * 110)
+        print(f"{'Endpoint':<42} {'Calls':>7} {'Errors':>6} {'Cached':>7} {'Retried':>7} "
+              f"{'p50 ms':>8} {'p95 ms':>8} {'Total s':>8} {'% wall':>7} {'KB in':>8}")
+        for title, table in (("client", self.calls), ("http", self.http)):
+            if not table:
+                continue
+            print(f"-- {title} " + "-" * (107 - len(title)))
+            for name, s in sorted(table.items(), key=lambda kv: -kv[1].total_seconds):
+                total = s.total_seconds
+                p50, p95 = s.percentile(0.5), s.percentile(0.95)
+                print(f"{name[:42]:<42} {s.calls:7d} {s.errors:6d} {s.cache_hits:7d} {s.retried:7d} "
+                      f"{(p50 or 0) * 1000:8.1f} {(p95 or 0) * 1000:8.1f} {total:8.2f} "
+                      f"{total / wall * 100 if wall else 0:6.1f}% {s.bytes_received / 1024:8.1f}")
+        print("=" * 110)
+        print(f"Wall time {wall:.2f}s")
+
+    def report(self, json_path=None):
+        """
+        Print the summary table and, if `json_path` is given, write the full
+        stats (including latency histograms) there.
+        """
+        if not (self.calls or self.http):
+            return
+        self.print_summary()
+        if json_path:
+            Path(json_path).write_text(json.dumps(self.as_dict(), indent=2))
+            print(f"💾 API stats written to {json_path}")
+
+
+def add_stats_arguments(parser):
+    parser.add_argument("--api-stats", metavar="JSON",
+                        help="Also write per-endpoint API call stats (latency histograms, bytes) to JSON")
+
+
+def _timed(stats, endpoint, fn):
+    def timed(*args, **kwargs):
+        start = time.perf_counter()
+        try:
+            with tracer.span(endpoint, cat="api"):
+                result = fn(*args, **kwargs)
+        except Exception:
+            stats.record_call(endpoint, time.perf_counter() - start, error=True)
+            raise
+        stats.record_call(endpoint, time.perf_counter() - start)
+        return result
+    return timed
+
+
+class _InstrumentedResource:
+    def __init__(self, resource, name, stats):
+        self._resource = resource
+        self._name = name
+        self._stats = stats
+
+    def __getattr__(self, attr):
+        value = getattr(self._resource, attr)
+        if not callable(value) or attr.startswith("_"):
+            return value
+        return _timed(self._stats, f"{self._name}.{attr}", value)
+
+
+class InstrumentedClient:
+    """
+    Proxy that times every `client.<resource>.<method>(...)` call (and
+    client-level helpers such as WarehouseClient.orders_with_item). Pagers
+    returned by list calls fetch later pages lazily; those show up in the
+    HTTP table, not in the call's latency.
+    """
+
+    def __init__(self, client, stats):
+        self._client = client
+        self._stats = stats
+        self._resources = {}
+
+    def __getattr__(self, name):
+        value = getattr(self._client, name)
+        if name.startswith("_") or isinstance(value, (str, int, float, bool, type(None))):
+            return value
+        if callable(value):
+            return _timed(self._stats, name, value)
+        if name not in self._resources:
+            self._resources[name] = _InstrumentedResource(value, name, self._stats)
+        return self._resources[name]
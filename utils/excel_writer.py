@@ -0,0 +1,199 @@
+"""
+Streaming Excel output built on openpyxl's write-only mode.
+
+Rows are appended as they are produced and never held as a DataFrame. Each
+sheet buffers only its first `sample_size` rows, which are used to pick the
+columns, number formats and column widths before the header is written.
+
+openpyxl is imported when the first workbook is created, so importing this
+module (and utils.streaming_output) stays cheap.
+"""
+
+from datetime import date, datetime, time
+
+DEFAULT_SHEET = "orders"
+SAMPLE_SIZE = 200
+MAX_COLUMN_WIDTH = 60
+
+# Checked in order: datetime is a subclass of date, bool of int.
+NUMBER_FORMATS = [
+    (datetime, "yyyy-mm-dd hh:mm"),
+    (date, "yyyy-mm-dd"),
+    (time, "h:mm AM/PM"),
+    (bool, None),
+    (float, "#,##0.00"),
+    (int, "0"),
+]
+
+INVALID_TITLE_CHARS = str.maketrans({c: "_" for c in "[]:*?/\\"})
+
+
+def sheet_title(name):
+    return (name or DEFAULT_SHEET).translate(INVALID_TITLE_CHARS)[:31]
+
+
+def to_cell_value(value):
+    if isinstance(value, (list, tuple)):
+        return "; ".join(str(v) for v in value)
+    if isinstance(value, dict):
+        return str(value)
+    return value
+
+
+def infer_number_format(values):
+    """
+    Return the number format shared by every non-empty sample value, if any.
+    """
+    fmt = None
+    for v in values:
+        if v is None or v == "":
+            continue
+        for typ, typ_fmt in NUMBER_FORMATS:
+            if isinstance(v, typ):
+                break
+        else:
+            return None
+        if fmt is None:
+            fmt = typ_fmt
+        elif fmt != typ_fmt:
+            return None
+    return fmt
+
+
+def display_width(value):
+    if value is None:
+        return 0
+    if isinstance(value, float):
+        return len(f"{value:,.2f}")
+    if isinstance(value, (date, time)):
+        return len(value.isoformat())
+    return len(str(value))
+
+
+class _Sheet:
+    def __init__(self, wb, title, sample_size):
+        self.wb = wb
+        self.title = title
+        self.sample_size = sample_size
+        self.sample = []
+        self.columns = None
+        self.column_set = None
+        self.formats = None
+        self.ws = None
+        self.dropped = set()
+
+    def append(self, row):
+        if self.ws is None:
+            self.sample.append(row)
+            if len(self.sample) >= self.sample_size:
+                self._start()
+            return
+        self._write(row)
+
+    def _start(self):
+        from openpyxl.cell import WriteOnlyCell
+        from openpyxl.styles import Font
+        from openpyxl.utils import get_column_letter
+
+        # Column order follows first appearance across the sample.
+        columns = []
+        for row in self.sample:
+            for key in row:
+                if key not in columns:
+                    columns.append(key)
+        self.columns = columns
+        self.column_set = set(columns)
+
+        values_by_col = {c: [to_cell_value(r.get(c)) for r in self.sample] for c in columns}
+        self.formats = {c: infer_number_format(values_by_col[c]) for c in columns}
+
+        self.ws = self.wb.create_sheet(self.title)
+        for idx, col in enumerate(columns, start=1):
+            width = max([len(col)] + [display_width(v) for v in values_by_col[col]])
+            self.ws.column_dimensions[get_column_letter(idx)].width = min(width + 2, MAX_COLUMN_WIDTH)
+        self.ws.freeze_panes = "A2"
+
+        header = []
+        for col in columns:
+            cell = WriteOnlyCell(self.ws, value=col)
+            cell.font = Font(bold=True)
+            header.append(cell)
+        self.ws.append(header)
+
+        for row in self.sample:
+            self._write(row)
+        self.sample = []
+
+    def _write(self, row):
+        from openpyxl.cell import WriteOnlyCell
+
+        extra = row.keys() - self.column_set
+        if extra and extra - self.dropped:
+            new = sorted(extra - self.dropped)
+            print(f"⚠️ Sheet '{self.title}': columns {new} not in sampled header, skipping them.")
+            self.dropped |= extra
+
+        cells = []
+        for col in self.columns:
+            value = to_cell_value(row.get(col))
+            fmt = self.formats[col]
+            if fmt and value is not None:
+                cell = WriteOnlyCell(self.ws, value=value)
+                cell.number_format = fmt
+                cells.append(cell)
+            else:
+                cells.append(value)
+        self.ws.append(cells)
+
+    def finish(self):
+        if self.ws is None and self.sample:
+            self._start()
+
+
+class StreamingExcelWriter:
+    """
+    Write-only workbook with one sheet per `sheet` name passed to write().
+
+    Usage:
+        writer = StreamingExcelWriter("orders.xlsx")
+        writer.write(row, sheet="thanksgiving")
+        writer.close()
+    """
+
+    def __init__(self, path, sample_size=SAMPLE_SIZE):
+        from openpyxl import Workbook
+
+        self.path = path
+        self.count = 0
+        self.sample_size = sample_size
+        self._wb = Workbook(write_only=True)
+        self._sheets = {}
+
+    def write(self, row, sheet=None):
+        title = sheet_title(sheet)
+        target = self._sheets.get(title)
+        if target is None:
+            target = self._sheets[title] = _Sheet(self._wb, title, self.sample_size)
+        target.append(row)
+        self.count += 1
+
+    def close(self):
+        for sheet in self._sheets.values():
+            sheet.finish()
+        if not self._sheets:
+            # A workbook needs at least one sheet to be valid.
+            self._wb.create_sheet(DEFAULT_SHEET)
+        self._wb.save(self.path)
+
+
+def write_excel(rows, path, sheet=None):
+    """
+    Convenience wrapper for callers that already have a list of rows.
+    """
+    writer = StreamingExcelWriter(path)
+    try:
+        for row in rows:
+            writer.write(row, sheet=sheet)
+    finally:
+        writer.close()
+    return writer.count
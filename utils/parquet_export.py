@@ -0,0 +1,340 @@
+"""
+Columnar (Parquet) export of extraction rows, tipout allocations and parsed
+invoices.
+
+Each dataset lives in its own directory under a root and is hive-partitioned
+(`order_date=2025-11-26/location_id=L123/part-....parquet`), so readers such
+as `pyarrow.dataset` or pandas only open the partitions and columns they ask
+for:
+
+    pd.read_parquet("history/orders", filters=[("order_date", ">=", "2025-11-01")],
+                    columns=["item_name", "qty", "total"])
+
+Re-exporting replaces the rows the export owns instead of adding duplicate
+rows, so the same date range can be exported again safely. Order rows are
+also partitioned by extractor, and an export only owns its own extractors'
+rows created inside its window; see OrderRowsParquetWriter.
+
+Requires pyarrow (the `parquet` extra in pyproject.toml).
+"""
+
+import os
+import re
+import shutil
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from pathlib import Path
+
+from dateutil import parser as date_parser
+from dateutil import tz
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # optional dependency
+    pa = None
+    pq = None
+
+LOCAL_TZ = tz.gettz("America/New_York")
+
+BATCH_SIZE = 5000
+
+
+def _require_pyarrow():
+    if pa is None:
+        raise RuntimeError("Parquet export needs pyarrow: pip install pyarrow")
+
+
+def order_schema():
+    return pa.schema([
+        ("order_id", pa.string()),
+        ("created_at", pa.timestamp("us", tz="UTC")),
+        ("order_state", pa.string()),
+        ("extractor", pa.string()),
+        ("buyer_name", pa.string()),
+        ("email", pa.string()),
+        ("phone", pa.string()),
+        ("item_name", pa.string()),
+        ("variation", pa.string()),
+        ("qty", pa.float64()),
+        ("total", pa.float64()),
+        ("pickup_date", pa.date32()),
+        ("pickup_time", pa.time64("us")),
+        ("allergies", pa.string()),
+        ("extra_modifiers", pa.list_(pa.string())),
+        ("order_date", pa.string()),
+        ("location_id", pa.string()),
+    ])
+
+
+def tipout_schema():
+    return pa.schema([
+        ("team_member_id", pa.string()),
+        ("policy", pa.string()),
+        ("hours", pa.float64()),
+        ("declared_cash_tips", pa.int64()),
+        ("card_tips", pa.float64()),
+        ("tip_out_allocated", pa.float64()),
+        ("tip_out_allocated_after_card_processing", pa.float64()),
+        ("week_start", pa.string()),
+        ("location_id", pa.string()),
+    ])
+
+
+def invoice_schema():
+    return pa.schema([
+        ("description", pa.string()),
+        ("pack", pa.string()),
+        ("qty", pa.float64()),
+        ("unit_price", pa.float64()),
+        ("total", pa.float64()),
+        ("source_file", pa.string()),
+        ("invoice_number", pa.string()),
+        ("vendor", pa.string()),
+        ("invoice_date", pa.string()),
+    ])
+
+
+def local_date(created_at):
+    """
+    Local (America/New_York) calendar date for an ISO timestamp, as YYYY-MM-DD.
+    """
+    if not created_at:
+        return "unknown"
+    try:
+        return date_parser.isoparse(created_at).astimezone(LOCAL_TZ).date().isoformat()
+    except (TypeError, ValueError):
+        return "unknown"
+
+
+def _coerce(value, typ):
+    """
+    Fit a row value to the column type, dropping values that can't be
+    represented rather than failing the whole batch.
+    """
+    if value is None:
+        return None
+    if pa.types.is_timestamp(typ):
+        if isinstance(value, str):
+            try:
+                return date_parser.isoparse(value)
+            except ValueError:
+                return None
+        return value if isinstance(value, datetime) else None
+    if pa.types.is_date(typ):
+        return value if isinstance(value, date) else None
+    if pa.types.is_time(typ):
+        return value if isinstance(value, time) else None
+    if pa.types.is_list(typ):
+        return [str(v) for v in value] if isinstance(value, (list, tuple)) else [str(value)]
+    if pa.types.is_floating(typ):
+        return float(value)
+    if pa.types.is_integer(typ):
+        return int(value)
+    return str(value)
+
+
+class ParquetDatasetWriter:
+    """
+    Buffer rows and write them to a partitioned Parquet dataset in batches.
+
+    With replace_partitions=True every partition directory is cleared the
+    first time this writer touches it, so a re-run replaces old rows. Without
+    it, files are named `<basename>-<rows so far>-<i>.parquet` and nothing is
+    removed; callers that re-export must delete their old files themselves
+    (see export_invoice).
+    """
+
+    def __init__(self, root, schema, partition_cols, batch_size=BATCH_SIZE,
+                 replace_partitions=True, basename=None):
+        _require_pyarrow()
+        self.path = str(root)
+        self.root = Path(root)
+        self.schema = schema
+        self.partition_cols = partition_cols
+        self.batch_size = batch_size
+        self.replace_partitions = replace_partitions
+        self.basename = basename or f"part-{uuid.uuid4().hex}"
+        self.count = 0
+        self._buffer = []
+        self._touched = set()
+
+    def write(self, row, sheet=None):
+        self._buffer.append(row)
+        self.count += 1
+        if len(self._buffer) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._buffer:
+            return
+
+        columns = {
+            field.name: [_coerce(r.get(field.name), field.type) for r in self._buffer]
+            for field in self.schema
+        }
+        table = pa.Table.from_pydict(columns, schema=self.schema)
+
+        if self.replace_partitions:
+            for key in set(tuple(r.get(c) for c in self.partition_cols) for r in self._buffer):
+                if key in self._touched:
+                    continue
+                self._touched.add(key)
+                self._replace_partition(self._partition_dir(key), key)
+
+        pq.write_to_dataset(
+            table,
+            root_path=str(self.root),
+            partition_cols=self.partition_cols,
+            # Unique per flush of this writer; the basename tells writers apart.
+            basename_template=f"{self.basename}-{self.count}-{{i}}.parquet",
+            existing_data_behavior="overwrite_or_ignore",
+        )
+        self._buffer = []
+
+    def close(self):
+        self.flush()
+
+    def _partition_dir(self, key):
+        return self.root.joinpath(*(f"{c}={v}" for c, v in zip(self.partition_cols, key)))
+
+    def _replace_partition(self, part_dir, key):
+        """
+        Called the first time this writer touches a partition, before any of
+        its rows are written there.
+        """
+        if part_dir.exists():
+            shutil.rmtree(part_dir)
+
+
+def _local_day_bounds(order_date):
+    """
+    [start, end) of a YYYY-MM-DD local calendar day, or None for "unknown".
+    """
+    try:
+        day = date.fromisoformat(order_date)
+    except (TypeError, ValueError):
+        return None
+    return (datetime.combine(day, time.min, LOCAL_TZ),
+            datetime.combine(day + timedelta(days=1), time.min, LOCAL_TZ))
+
+
+class OrderRowsParquetWriter(ParquetDatasetWriter):
+    """
+    Extractor rows, partitioned by local order date, extractor and location.
+    Plugs into utils.streaming_output.ResultWriters like any other writer.
+
+    An export owns the rows of the extractors it runs for orders created in
+    [start, end) (end=None: no upper bound). Partitions whose local day lies
+    entirely inside that window are replaced. The first and last local days
+    are only partly covered, since the window is cut in UTC, so there older
+    files are rewritten at close() without the rows this export owns. With
+    no window the export owns the order ids it wrote.
+    """
+
+    def __init__(self, root, start=None, end=None, batch_size=BATCH_SIZE):
+        _require_pyarrow()
+        super().__init__(Path(root) / "orders", order_schema(), ["order_date", "extractor", "location_id"],
+                         batch_size=batch_size)
+        self.start = start
+        self.end = end
+        self._merge = {}  # partition dir -> files that were there before this export
+        self._order_ids = defaultdict(set)
+
+    def write(self, row, sheet=None):
+        order_date = local_date(row.get("created_at"))
+        location_id = row.get("location_id") or "unknown"
+        self._order_ids[(order_date, sheet, location_id)].add(row.get("order_id"))
+        super().write({
+            **row,
+            "extractor": sheet,
+            "order_date": order_date,
+            "location_id": location_id,
+        })
+
+    def _covers(self, order_date):
+        if self.start is None:
+            return False
+        bounds = _local_day_bounds(order_date)
+        return bounds is not None and self.start <= bounds[0] and (self.end is None or bounds[1] <= self.end)
+
+    def _replace_partition(self, part_dir, key):
+        if self._covers(key[0]):
+            super()._replace_partition(part_dir, key)
+        elif part_dir.exists():
+            self._merge[key] = sorted(part_dir.glob("*.parquet"))
+
+    def _owned(self, table, key):
+        if self.start is None:
+            order_ids = self._order_ids[key]
+            return [order_id in order_ids for order_id in table.column("order_id").to_pylist()]
+        return [
+            created is not None and self.start <= created and (self.end is None or created < self.end)
+            for created in table.column("created_at").to_pylist()
+        ]
+
+    def close(self):
+        super().close()
+        for key, paths in self._merge.items():
+            for path in paths:
+                table = pq.ParquetFile(path).read()
+                keep = [not owned for owned in self._owned(table, key)]
+                if all(keep):
+                    continue
+                if not any(keep):
+                    path.unlink()
+                    continue
+                tmp = path.with_name(f".{path.name}.tmp")
+                pq.write_table(table.filter(pa.array(keep)), tmp)
+                os.replace(tmp, path)
+        self._merge = {}
+
+
+def export_tipout(root, week_start, results_by_policy):
+    """
+    results_by_policy = {
+        "daily_pool": {location_id: {team_member_id: totals_dict}},
+        "clockin":    {...},
+    }
+    """
+    _require_pyarrow()
+    writer = ParquetDatasetWriter(Path(root) / "tipout", tipout_schema(), ["week_start", "location_id"])
+    for policy, by_location in results_by_policy.items():
+        for location_id, agg in by_location.items():
+            for tm_id, rec in agg.items():
+                writer.write({
+                    "team_member_id": tm_id,
+                    "policy": policy,
+                    "week_start": week_start,
+                    "location_id": location_id,
+                    **rec,
+                })
+    writer.close()
+    return writer.count
+
+
+def export_invoice(root, df, invoice_date, source_file=None, invoice_number=None, vendor=None):
+    """
+    Parsed invoice rows, partitioned by invoice date. Files are named after
+    the invoice, and its earlier files are deleted first (under any invoice
+    date), so exporting the same invoice again replaces its rows.
+    """
+    _require_pyarrow()
+    key = invoice_number or (Path(source_file).stem if source_file else uuid.uuid4().hex)
+    own_file = re.compile(rf"invoice-{re.escape(str(key))}-\d+-\d+\.parquet")
+    for path in (Path(root) / "invoices").glob("invoice_date=*/invoice-*.parquet"):
+        if own_file.fullmatch(path.name):
+            path.unlink()
+    writer = ParquetDatasetWriter(Path(root) / "invoices", invoice_schema(), ["invoice_date"],
+                                  replace_partitions=False, basename=f"invoice-{key}")
+    for row in df.to_dict("records"):
+        writer.write({
+            "source_file": source_file,
+            "invoice_number": invoice_number,
+            "vendor": vendor,
+            **row,
+            "invoice_date": invoice_date,
+        })
+    writer.close()
+    return writer.count
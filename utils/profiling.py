@@ -0,0 +1,140 @@
+"""
+--profile and --memprofile for the entry points.
+
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    start_profiling(args, "tipout_main")
+
+--profile runs the rest of the process under cProfile, dumps the raw stats
+to a .pstats file (`python -m pstats`, snakeviz) and prints the top
+functions by cumulative time.
+
+--memprofile traces allocations with tracemalloc. At every stage boundary
+(the "stage" spans of utils.tracing) it notes traced memory, and at exit
+prints per-stage growth, the overall peak and the top allocation sites at
+the highest stage boundary seen. Allocation tracing slows the run down, so
+time it separately.
+
+Reports are printed at interpreter exit, which covers early returns and
+sys.exit(). With neither flag nothing is installed. cProfile and
+tracemalloc only see this process, not invoice batch worker processes.
+"""
+
+import atexit
+import linecache
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime
+
+from utils.tracing import tracer
+
+DEFAULT_TOP = 25
+# A new allocation snapshot is taken when memory at a stage boundary is at
+# least this much above the one where the previous snapshot was taken.
+SNAPSHOT_STEP = 1 << 20
+MB = 1024 * 1024
+
+
+def add_profile_arguments(parser):
+    parser.add_argument("--profile", nargs="?", const="", metavar="PSTATS",
+                        help="Run under cProfile; dump stats to PSTATS (default: <script>_<timestamp>.pstats)")
+    parser.add_argument("--memprofile", action="store_true",
+                        help="Trace memory with tracemalloc: per-stage growth, peak and top allocation sites")
+    parser.add_argument("--profile-top", type=int, default=DEFAULT_TOP, metavar="N",
+                        help=f"Rows in the --profile / --memprofile summaries (default {DEFAULT_TOP})")
+
+
+class MemoryProfiler:
+    def __init__(self, top=DEFAULT_TOP, frames=1):
+        self.top = top
+        self.frames = frames
+        self.stages = defaultdict(lambda: [0, 0, 0])  # name -> [spans, growth, max at exit]
+        self.sites = []
+        self.sites_at = None
+        self._snapshot_level = 0
+        self._open = []
+
+    def start(self):
+        tracemalloc.start(self.frames)
+        tracer.listeners.append(self.on_span)
+        tracer.enable(record=False)
+
+    def on_span(self, phase, name, cat):
+        if cat != "stage":
+            return
+        current, _ = tracemalloc.get_traced_memory()
+        if phase == "B":
+            self._open.append(current)
+            return
+        stage = self.stages[name]
+        stage[0] += 1
+        stage[1] += current - self._open.pop()
+        stage[2] = max(stage[2], current)
+        if current >= self._snapshot_level + SNAPSHOT_STEP:
+            self._take_snapshot(f"after {name!r}", current)
+
+    def _take_snapshot(self, label, current):
+        # Keep only the formatted top sites: a held Snapshot is itself traced
+        # memory and would inflate every later measurement.
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, linecache.__file__),
+            tracemalloc.Filter(False, __file__),
+        ])
+        self.sites = [
+            (f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", stat.size, stat.count)
+            for stat in snapshot.statistics("lineno")[:self.top]
+        ]
+        self.sites_at = (label, current)
+        self._snapshot_level = current
+
+    def report(self):
+        current, peak = tracemalloc.get_traced_memory()
+        if current >= self._snapshot_level + SNAPSHOT_STEP or not self.sites:
+            self._take_snapshot("at exit", current)
+        tracemalloc.stop()
+
+        if self.stages:
+            print(f"\n{'Memory by stage':<44} {'Spans':>7} {'Growth MB':>10} {'Max MB':>9}")
+            print("-" * 73)
+            for name, (count, growth, high) in sorted(self.stages.items(), key=lambda kv: -kv[1][2]):
+                print(f"{name[:44]:<44} {count:7d} {growth / MB:10.1f} {high / MB:9.1f}")
+        print(f"\n🧠 Peak traced memory {peak / MB:.1f} MB, {current / MB:.1f} MB at exit")
+
+        label, level = self.sites_at
+        print(f"\nTop allocation sites {label} ({level / MB:.1f} MB traced)")
+        print(f"{'Site':<70} {'MB':>8} {'Blocks':>9}")
+        print("-" * 89)
+        for site, size, count in self.sites:
+            if len(site) > 70:
+                site = "…" + site[-69:]
+            print(f"{site:<70} {size / MB:8.2f} {count:9,d}")
+
+
+def _report_profile(profiler, path, top):
+    import pstats
+
+    profiler.disable()
+    profiler.dump_stats(path)
+    print(f"\n⏱  Top {top} functions by cumulative time (full stats in {path})")
+    pstats.Stats(profiler).strip_dirs().sort_stats("cumulative").print_stats(top)
+
+
+def start_profiling(args, name):
+    """
+    Start whatever --profile / --memprofile asked for and report it at exit.
+    """
+    if args.memprofile:
+        memory = MemoryProfiler(top=args.profile_top)
+        memory.start()
+        atexit.register(memory.report)
+
+    if args.profile is not None:
+        import cProfile
+
+        path = args.profile or f"{name}_{datetime.now():%Y%m%d_%H%M%S}.pstats"
+        profiler = cProfile.Profile()
+        # atexit runs handlers last-in first-out: the profile is reported
+        # before the memory summary and doesn't include its work.
+        atexit.register(_report_profile, profiler, path, args.profile_top)
+        profiler.enable()
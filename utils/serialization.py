@@ -0,0 +1,137 @@
+"""
+Shared JSON / JSONL serialization for every script that writes results.
+
+- Compact output (no indent) by default.
+- Uses orjson when it is installed and falls back to the stdlib otherwise.
+  Both produce the same values: dates as "2025-11-26", times as "14:00:00",
+  lists such as extra_modifiers as JSON arrays.
+- Compression is chosen by file suffix: ".gz" for gzip, ".zst" for zstd
+  (needs the zstandard package).
+"""
+
+import gzip
+import io
+import json
+from datetime import date, time
+
+try:
+    import orjson
+except ImportError:  # optional dependency
+    orjson = None
+
+try:
+    import zstandard
+except ImportError:  # optional dependency
+    zstandard = None
+
+BACKEND = "orjson" if orjson else "json"
+
+# Compressed streams are flushed in batches; flushing them every row ruins
+# the compression ratio.
+COMPRESSED_FLUSH_EVERY = 1000
+
+
+def _default(value):
+    if isinstance(value, (date, time)):
+        return value.isoformat()
+    if isinstance(value, (set, tuple)):
+        return list(value)
+    return str(value)
+
+
+def dumps(obj, indent=False):
+    """
+    Serialize to UTF-8 bytes.
+    """
+    if orjson is not None:
+        option = orjson.OPT_INDENT_2 if indent else 0
+        return orjson.dumps(obj, default=_default, option=option)
+    if indent:
+        return json.dumps(obj, indent=2, ensure_ascii=False, default=_default).encode("utf-8")
+    return json.dumps(obj, separators=(",", ":"), ensure_ascii=False, default=_default).encode("utf-8")
+
+
+def loads(data):
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def compression_for(path):
+    path = str(path)
+    if path.endswith(".gz"):
+        return "gzip"
+    if path.endswith(".zst"):
+        return "zstd"
+    return None
+
+
+def open_binary(path, mode="wb"):
+    """
+    Open a file for binary reading or writing, compressing or decompressing
+    on the fly according to its suffix.
+    """
+    compression = compression_for(path)
+    if compression == "gzip":
+        return gzip.open(path, mode, compresslevel=6)
+    if compression == "zstd":
+        if zstandard is None:
+            raise RuntimeError("zstd output needs the zstandard package: pip install zstandard")
+        if "r" in mode:
+            # The raw zstd reader can't iterate lines; buffering adds that.
+            return io.BufferedReader(zstandard.open(path, "rb"))
+        return zstandard.open(path, "wb", cctx=zstandard.ZstdCompressor(level=3))
+    return open(path, mode)
+
+
+def with_suffix(path, compress=None):
+    """
+    Append the suffix for `compress` ("gzip", "zstd" or None) to a path.
+    """
+    return {None: path, "gzip": f"{path}.gz", "zstd": f"{path}.zst"}[compress]
+
+
+class JsonlWriter:
+    """
+    One JSON document per line. Plain files are flushed after every row so a
+    crashed run keeps everything written so far.
+    """
+
+    def __init__(self, path, flush_every=None):
+        self.path = path
+        self.count = 0
+        if flush_every is None:
+            flush_every = COMPRESSED_FLUSH_EVERY if compression_for(path) else 1
+        self.flush_every = flush_every
+        self._f = open_binary(path, "wb")
+
+    def write(self, row, sheet=None):
+        self._f.write(dumps(row) + b"\n")
+        self.count += 1
+        if self.count % self.flush_every == 0:
+            self._f.flush()
+
+    def close(self):
+        self._f.close()
+
+
+def write_jsonl(rows, path):
+    writer = JsonlWriter(path, flush_every=COMPRESSED_FLUSH_EVERY)
+    try:
+        for row in rows:
+            writer.write(row)
+    finally:
+        writer.close()
+    return writer.count
+
+
+def read_jsonl(path):
+    with open_binary(path, "rb") as f:
+        for line in f:
+            if line.strip():
+                yield loads(line)
+
+
+def write_json(obj, path, indent=False):
+    with open_binary(path, "wb") as f:
+        f.write(dumps(obj, indent=indent))
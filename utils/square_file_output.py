@@ -1,19 +1,18 @@
-import json
-import pandas as pd
 from datetime import datetime
 
-def save_results(results):
+from .excel_writer import write_excel
+from .serialization import with_suffix, write_json
+
+def save_results(results, compress=None):
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    json_path = f"orders_{timestamp}.json"
+    json_path = with_suffix(f"orders_{timestamp}.json", compress)
     xlsx_path = f"orders_{timestamp}.xlsx"
 
     # Save JSON
-    with open(json_path, "w", encoding="utf-8") as f:
-        json.dump(results, f, indent=2, ensure_ascii=False)
+    write_json(results, json_path)
 
     # Save Excel
-    df = pd.DataFrame(results)
-    df.to_excel(xlsx_path, index=False)
+    write_excel(results, xlsx_path)
 
     print(f"Saved {len(results)} results:")
     print(f" - JSON:  {json_path}")
@@ -0,0 +1,152 @@
+"""
+One place to build Square clients and the httpx clients under them.
+
+    from utils.square_http import make_square_client
+    client = make_square_client(token)
+
+Every Square client built here without its own http_client shares one
+process-wide httpx.Client:
+- connection pool of MAX_CONNECTIONS, with idle keep-alive connections kept
+  for KEEPALIVE_EXPIRY seconds. httpx's default is 5s, so every burst of
+  calls a few seconds apart paid a new TLS handshake.
+- HTTP/2 when the h2 package is installed (pip install httpx[http2]), so
+  concurrent calls multiplex over one connection.
+- DEFAULT_TIMEOUT seconds per request. The SDK passes this one value to
+  httpx, which applies it to connect, read, write and pool waits alike.
+
+Instrumentation (ApiStats) goes on the shared client with add_event_hooks()
+rather than on a client of its own, which would get a pool of its own.
+
+httpx.Client is thread-safe, so worker threads can share the client (and
+the Square client on top of it). Async clients belong to one event loop,
+so nothing async is shared; give the async Square client an httpx client
+whose lifetime you manage:
+
+    async with make_async_http_client() as http:
+        client = make_async_square_client(token, http_client=http)
+        ...
+"""
+
+import atexit
+import importlib.util
+import threading
+
+DEFAULT_TIMEOUT = 60.0
+MAX_CONNECTIONS = 20
+MAX_KEEPALIVE_CONNECTIONS = 10
+KEEPALIVE_EXPIRY = 60.0
+
+_shared = None
+_shared_lock = threading.Lock()
+
+
+def http2_available():
+    return importlib.util.find_spec("h2") is not None
+
+
+def _limits(max_connections):
+    import httpx
+
+    return httpx.Limits(
+        max_connections=max_connections,
+        max_keepalive_connections=min(MAX_KEEPALIVE_CONNECTIONS, max_connections),
+        keepalive_expiry=KEEPALIVE_EXPIRY,
+    )
+
+
+def pooled_transport(max_connections=MAX_CONNECTIONS, http2=None):
+    """
+    Network transport with the pool settings, for wrapping transports
+    (utils.api_fixtures.RecordingTransport).
+    """
+    import httpx
+
+    return httpx.HTTPTransport(limits=_limits(max_connections), http2=http2_available() if http2 is None else http2)
+
+
+def make_http_client(transport=None, event_hooks=None, max_connections=MAX_CONNECTIONS,
+                     timeout=DEFAULT_TIMEOUT, http2=None):
+    """
+    A new httpx.Client with the pool settings. A `transport` replaces the
+    network one; pool limits and HTTP/2 are then the transport's business.
+    """
+    import httpx
+
+    return httpx.Client(
+        transport=transport or pooled_transport(max_connections, http2),
+        timeout=timeout,
+        event_hooks=event_hooks,
+        follow_redirects=True,
+    )
+
+
+def make_async_http_client(event_hooks=None, max_connections=MAX_CONNECTIONS, timeout=DEFAULT_TIMEOUT, http2=None):
+    import httpx
+
+    return httpx.AsyncClient(
+        limits=_limits(max_connections),
+        http2=http2_available() if http2 is None else http2,
+        timeout=timeout,
+        event_hooks=event_hooks,
+        follow_redirects=True,
+    )
+
+
+def shared_http_client():
+    """
+    The process-wide pooled client, created on first use and closed at exit.
+    """
+    global _shared
+    with _shared_lock:
+        if _shared is None:
+            _shared = make_http_client()
+            atexit.register(_shared.close)
+        return _shared
+
+
+def add_event_hooks(http_client, event_hooks):
+    """
+    Add httpx `event_hooks` to an existing client, such as the shared one
+    (utils.api_stats.ApiStats.http_hooks()). They see every request made
+    through that client. Adding the same hook twice is a no-op.
+    """
+    for event, hooks in event_hooks.items():
+        registered = http_client.event_hooks[event]
+        registered.extend(hook for hook in hooks if hook not in registered)
+    return http_client
+
+
+def _square_options(base_url, environment):
+    options = {}
+    if base_url:
+        options["base_url"] = base_url
+    if environment is not None:
+        options["environment"] = environment
+    return options
+
+
+def make_square_client(token, base_url=None, http_client=None, environment=None):
+    """
+    Square client on `http_client`, or on the shared pooled client.
+    """
+    from square import Square
+
+    return Square(
+        token=token,
+        httpx_client=http_client or shared_http_client(),
+        **_square_options(base_url, environment),
+    )
+
+
+def make_async_square_client(token, base_url=None, http_client=None, environment=None):
+    """
+    AsyncSquare client on `http_client`, or on a new pooled httpx.AsyncClient
+    that stays open for the life of the process.
+    """
+    from square import AsyncSquare
+
+    return AsyncSquare(
+        token=token,
+        httpx_client=http_client or make_async_http_client(),
+        **_square_options(base_url, environment),
+    )
@@ -0,0 +1,119 @@
+"""
+Incremental writers for extraction results.
+
+Each writer takes one row at a time, so a run never holds more than the
+current order's rows in memory. JSONL and CSV rows are flushed as they are
+written, which keeps everything up to the last finished order on disk if a
+run dies half way.
+"""
+
+import csv
+import io
+from datetime import datetime
+
+from .excel_writer import StreamingExcelWriter
+from .serialization import JsonlWriter, compression_for, open_binary, with_suffix
+
+RESULT_COLUMNS = [
+    "order_id",
+    "created_at",
+    "location_id",
+    "order_state",
+    "buyer_name",
+    "email",
+    "phone",
+    "item_name",
+    "variation",
+    "qty",
+    "total",
+    "pickup_date",
+    "pickup_time",
+    "allergies",
+    "extra_modifiers",
+]
+
+
+def flatten_value(value):
+    """
+    Make a row value fit a single CSV/Excel cell.
+    """
+    if isinstance(value, (list, tuple)):
+        return "; ".join(str(v) for v in value)
+    return value
+
+
+class CsvWriter:
+    def __init__(self, path, columns=RESULT_COLUMNS):
+        self.path = path
+        self.count = 0
+        self._f = io.TextIOWrapper(
+            open_binary(path, "wb"), encoding="utf-8", newline="",
+            line_buffering=compression_for(path) is None,
+        )
+        self._writer = csv.DictWriter(self._f, fieldnames=columns, extrasaction="ignore")
+        self._writer.writeheader()
+
+    def write(self, row, sheet=None):
+        self._writer.writerow({k: flatten_value(v) for k, v in row.items()})
+        self.count += 1
+
+    def close(self):
+        self._f.close()
+
+
+WRITERS = {
+    "jsonl": JsonlWriter,
+    "csv": CsvWriter,
+    "xlsx": StreamingExcelWriter,
+}
+
+
+class ResultWriters:
+    """
+    Fan each row out to every requested output format.
+
+    Usage:
+        with ResultWriters(["jsonl", "xlsx"]) as out:
+            for row in rows:
+                out.write(row)
+    """
+
+    # Formats that can be compressed on the fly (xlsx is already zipped).
+    COMPRESSIBLE = {"jsonl", "csv"}
+
+    def __init__(self, formats, prefix="orders", compress=None, timestamp=True):
+        stamp = f"_{datetime.now():%Y%m%d_%H%M%S}" if timestamp else ""
+        self.writers = []
+        try:
+            for fmt in formats:
+                path = f"{prefix}{stamp}.{fmt}"
+                if fmt in self.COMPRESSIBLE:
+                    path = with_suffix(path, compress)
+                self.writers.append(WRITERS[fmt](path))
+        except Exception:
+            self.close()
+            raise
+        self.count = 0
+
+    def add(self, writer):
+        """
+        Attach a writer that doesn't follow the timestamped-file naming,
+        e.g. utils.parquet_export.OrderRowsParquetWriter.
+        """
+        self.writers.append(writer)
+
+    def write(self, row, sheet=None):
+        for w in self.writers:
+            w.write(row, sheet=sheet)
+        self.count += 1
+
+    def close(self):
+        for w in self.writers:
+            w.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
@@ -0,0 +1,139 @@
+"""
+Lightweight stage tracing, exported as Chrome trace JSON.
+
+    from utils.tracing import tracer
+
+    with tracer.span("fetch payments", location=loc.name):
+        ...
+
+Spans nest by time on each thread, so a location span contains its fetch,
+aggregation and distribution spans, which in turn contain the API calls
+made under them (InstrumentedClient emits those with category "api"). The
+file written by tracer.write() opens in chrome://tracing or
+https://ui.perfetto.dev.
+
+Tracing is off until tracer.enable(); a disabled span() returns a shared
+no-op context manager, so leaving spans in hot loops costs one attribute
+check. Listeners (see utils.profiling) are called as fn(phase, name, cat)
+with phase "B" when a span begins and "E" when it ends; tracer.enable(
+record=False) runs spans for listeners only, without keeping events.
+"""
+
+import functools
+import json
+import os
+import threading
+import time
+from collections import defaultdict
+from contextlib import nullcontext
+from pathlib import Path
+
+_NULL_SPAN = nullcontext()
+
+
+class _Span:
+    __slots__ = ("tracer", "name", "cat", "args", "start")
+
+    def __init__(self, tracer, name, cat, args):
+        self.tracer = tracer
+        self.name = name
+        self.cat = cat
+        self.args = args
+
+    def __enter__(self):
+        for fn in self.tracer.listeners:
+            fn("B", self.name, self.cat)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        end = time.perf_counter()
+        for fn in self.tracer.listeners:
+            fn("E", self.name, self.cat)
+        if self.tracer.recording:
+            if exc_type is not None:
+                self.args["error"] = exc_type.__name__
+            self.tracer._record(self.name, self.cat, self.start, end, self.args)
+        return False
+
+
+class Tracer:
+    def __init__(self):
+        self.enabled = False
+        self.recording = False
+        self.events = []
+        self.listeners = []
+        self._origin = time.perf_counter()
+        self._lock = threading.Lock()
+
+    def enable(self, record=True):
+        if not self.enabled:
+            self.enabled = True
+            self._origin = time.perf_counter()
+            self.events = []
+        self.recording = self.recording or record
+
+    def span(self, name, cat="stage", **args):
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, args)
+
+    def _record(self, name, cat, start, end, args):
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": round((start - self._origin) * 1e6, 1),
+            "dur": round((end - start) * 1e6, 1),
+            "pid": os.getpid(),
+            "tid": threading.get_ident(),
+        }
+        if args:
+            event["args"] = {k: v if isinstance(v, (str, int, float, bool)) else str(v) for k, v in args.items()}
+        with self._lock:
+            self.events.append(event)
+
+    def write(self, path, process_name="square_api_calls"):
+        """
+        Write the recorded spans as Chrome trace JSON.
+        """
+        meta = [{"name": "process_name", "ph": "M", "pid": os.getpid(), "args": {"name": process_name}}]
+        Path(path).write_text(json.dumps({"traceEvents": meta + self.events, "displayTimeUnit": "ms"}))
+        print(f"🧭 Trace with {len(self.events)} spans written to {path}")
+
+    def print_summary(self, cat="stage"):
+        """
+        Total time and count per span name, slowest first.
+        """
+        totals = defaultdict(lambda: [0, 0.0])
+        for e in self.events:
+            if e["cat"] == cat:
+                totals[e["name"]][0] += 1
+                totals[e["name"]][1] += e["dur"] / 1e6
+        if not totals:
+            return
+        print(f"\n{'Stage':<44} {'Spans':>7} {'Total s':>9}")
+        print("-" * 62)
+        for name, (count, total) in sorted(totals.items(), key=lambda kv: -kv[1][1]):
+            print(f"{name[:44]:<44} {count:7d} {total:9.2f}")
+
+
+tracer = Tracer()
+
+
+def traced(name, cat="stage"):
+    """
+    Decorator: run every call of the function inside a span.
+    """
+    def decorate(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with tracer.span(name, cat):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+def add_trace_arguments(parser):
+    parser.add_argument("--trace", metavar="JSON",
+                        help="Record stage timings and write them as a Chrome trace (chrome://tracing, Perfetto)")
@@ -0,0 +1,10 @@
+"""
+Local SQLite warehouse of Square orders, payments and timecards.
+
+Usage:
+    python warehouse_sync.py --start 2025-11-01 --end 2025-12-01
+    python square_order_info.py --all --warehouse square_warehouse.sqlite
+"""
+from .store import DEFAULT_WAREHOUSE_PATH, Warehouse
+from .offline import WarehouseClient
+from .sync import sync_window
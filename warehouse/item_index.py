@@ -0,0 +1,99 @@
+"""
+Trigram inverted index over distinct line-item names.
+
+A shop sells a few hundred distinct items across hundreds of thousands of
+orders, so the index is built over distinct names, not line items. A
+partial-name query is split into trigrams. The index returns the names that
+contain every one of them, each candidate is confirmed with a plain
+substring check, and the line_items name index maps the surviving names to
+order IDs. The order table is never scanned.
+
+New names are indexed as orders are upserted, so syncing keeps the index
+current without rebuilds.
+"""
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS item_names (
+    id          INTEGER PRIMARY KEY,
+    name_lower  TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS item_name_trigrams (
+    trigram  TEXT NOT NULL,
+    name_id  INTEGER NOT NULL,
+    PRIMARY KEY (trigram, name_id)
+) WITHOUT ROWID;
+"""
+
+
+def trigrams(text):
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class ItemNameIndex:
+    def __init__(self, conn):
+        self.conn = conn
+        self.conn.executescript(SCHEMA)
+        self._known = None
+
+    def known_names(self):
+        if self._known is None:
+            self._known = {name for (name,) in self.conn.execute("SELECT name_lower FROM item_names")}
+        return self._known
+
+    def invalidate(self):
+        """
+        Drop the cached name set; it is re-read on next use.
+        """
+        self._known = None
+
+    def add_names(self, names):
+        """
+        Index any names not seen before. Runs inside the caller's
+        transaction when there is one; if that transaction rolls back, the
+        caller must invalidate() the cached names this added.
+        """
+        known = self.known_names()
+        new = {n for n in names if n and n not in known}
+        for name in new:
+            name_id = self.conn.execute(
+                "INSERT INTO item_names (name_lower) VALUES (?)", (name,)
+            ).lastrowid
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO item_name_trigrams VALUES (?, ?)",
+                [(gram, name_id) for gram in trigrams(name)],
+            )
+        known.update(new)
+        return len(new)
+
+    def rebuild(self):
+        try:
+            with self.conn:
+                self.conn.execute("DELETE FROM item_name_trigrams")
+                self.conn.execute("DELETE FROM item_names")
+                self._known = set()
+                names = [n for (n,) in self.conn.execute(
+                    "SELECT DISTINCT name_lower FROM line_items WHERE name_lower IS NOT NULL"
+                )]
+                return self.add_names(names)
+        except Exception:
+            self.invalidate()
+            raise
+
+    def matching_names(self, query):
+        """
+        Distinct lowercased item names containing `query`.
+        """
+        query = query.lower()
+        grams = trigrams(query)
+        if not grams:
+            # Too short for trigrams; the distinct-name table is small enough to scan
+            return [n for n in self.known_names() if query in n]
+
+        marks = ",".join("?" * len(grams))
+        candidates = self.conn.execute(
+            f"SELECT n.name_lower FROM item_name_trigrams t JOIN item_names n ON n.id = t.name_id "
+            f"WHERE t.trigram IN ({marks}) GROUP BY t.name_id HAVING COUNT(*) = ?",
+            [*grams, len(grams)],
+        )
+        return [name for (name,) in candidates if query in name]
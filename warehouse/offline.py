@@ -0,0 +1,141 @@
+"""
+A stand-in for the Square client that answers from the warehouse.
+
+Only the calls the extractors, tipout engine and find_item_sales make are
+implemented, with the same argument names and response attributes, so any
+of them can be handed a WarehouseClient instead of Square(...).
+"""
+
+from types import SimpleNamespace
+
+from square.types.customer import Customer
+from square.types.location import Location
+from square.types.order import Order
+from square.types.payment import Payment
+from square.types.team_member import TeamMember
+from square.types.timecard import Timecard
+
+
+def _get(obj, *path):
+    """
+    Walk attributes or dict keys, whichever the caller passed in.
+    """
+    for name in path:
+        if obj is None:
+            return None
+        obj = obj.get(name) if isinstance(obj, dict) else getattr(obj, name, None)
+    return obj
+
+
+def _models(model, rows):
+    return [model.model_validate(row) for row in rows]
+
+
+def _page(items, limit=None, cursor=None):
+    """
+    Slice a result list the way the API pages it; the cursor is an offset.
+    """
+    start = int(cursor) if cursor else 0
+    if not limit:
+        return items[start:], None
+    end = start + limit
+    return items[start:end], (str(end) if end < len(items) else None)
+
+
+class _Locations:
+    def __init__(self, warehouse):
+        self._wh = warehouse
+
+    def list(self, **kwargs):
+        return SimpleNamespace(locations=_models(Location, self._wh.locations()), errors=None)
+
+
+class _Orders:
+    def __init__(self, warehouse):
+        self._wh = warehouse
+
+    def search(self, location_ids=None, query=None, limit=None, cursor=None, return_entries=False, **kwargs):
+        created = _get(query, "filter", "date_time_filter", "created_at")
+        updated = _get(query, "filter", "date_time_filter", "updated_at")
+        sort_order = _get(query, "sort", "sort_order") or "DESC"
+        rows = self._wh.orders(
+            _get(created, "start_at"), _get(created, "end_at"), location_ids,
+            descending=sort_order == "DESC", updated_since=_get(updated, "start_at"),
+        )
+        rows, next_cursor = _page(rows, limit, cursor)
+        return SimpleNamespace(orders=_models(Order, rows), cursor=next_cursor, errors=None)
+
+    def get(self, order_id, **kwargs):
+        row = self._wh.order(order_id)
+        return SimpleNamespace(order=Order.model_validate(row) if row else None, errors=None)
+
+    retrieve_order = get
+
+    def batch_get(self, order_ids, **kwargs):
+        rows = [row for row in (self._wh.order(i) for i in order_ids) if row]
+        return SimpleNamespace(orders=_models(Order, rows), errors=None)
+
+
+class _Payments:
+    def __init__(self, warehouse):
+        self._wh = warehouse
+
+    def list(self, begin_time=None, end_time=None, location_id=None, **kwargs):
+        return _models(Payment, self._wh.payments(location_id, begin_time, end_time))
+
+
+class _Labor:
+    def __init__(self, warehouse):
+        self._wh = warehouse
+
+    def search_timecards(self, query=None, limit=None, cursor=None, **kwargs):
+        f = _get(query, "filter")
+        rows = self._wh.timecards(
+            _get(f, "location_ids"), _get(f, "start", "start_at"), _get(f, "end", "end_at")
+        )
+        rows, next_cursor = _page(rows, limit, cursor)
+        return SimpleNamespace(timecards=_models(Timecard, rows), cursor=next_cursor, errors=None)
+
+
+class _TeamMembers:
+    def __init__(self, warehouse):
+        self._wh = warehouse
+
+    def search(self, query=None, limit=None, cursor=None, **kwargs):
+        f = _get(query, "filter")
+        rows = self._wh.team_members(_get(f, "location_ids"), _get(f, "status"))
+        rows, next_cursor = _page(rows, limit, cursor)
+        return SimpleNamespace(team_members=_models(TeamMember, rows), cursor=next_cursor, errors=None)
+
+
+class _Customers:
+    def __init__(self, warehouse):
+        self._wh = warehouse
+
+    def get(self, customer_id, **kwargs):
+        row = self._wh.customer(customer_id)
+        return SimpleNamespace(customer=Customer.model_validate(row) if row else None, errors=None)
+
+    retrieve_customer = get
+
+
+class WarehouseClient:
+    """
+    Read-only, offline Square client backed by a Warehouse.
+    """
+
+    def __init__(self, warehouse):
+        self.warehouse = warehouse
+        self.locations = _Locations(warehouse)
+        self.orders = _Orders(warehouse)
+        self.payments = _Payments(warehouse)
+        self.labor = _Labor(warehouse)
+        self.team_members = _TeamMembers(warehouse)
+        self.customers = _Customers(warehouse)
+
+    def orders_with_item(self, item_name, start_iso=None, end_iso=None, location_ids=None):
+        """
+        Orders containing a line item whose name includes `item_name`.
+        Not a Square API call; lets find_item_sales skip scanning every order.
+        """
+        return _models(Order, self.warehouse.orders_with_item(item_name, start_iso, end_iso, location_ids))
@@ -0,0 +1,279 @@
+"""
+Daily rollups per location, maintained incrementally.
+
+- daily_item_sales: units, revenue and order count per item and variation,
+  from COMPLETED orders, by local order date.
+- daily_team_tips: hours, declared cash tips, card tips and auto-gratuity
+  per team member, by local date. Follows the same rules as
+  tipout.aggregation.aggregate_hours_and_tips_by_day: hours go to the date
+  the shift started, tip eligibility is that of the day's latest shift (by
+  start time), and tips come from COMPLETED payments with a team member,
+  each plus its order's AUTO_GRATUITY service charges.
+
+Upserts into the warehouse queue the (location, local date) pairs they touch
+in rollup_dirty. refresh() recomputes only those days, so the cost is
+O(changed days). Week, month and year reports are sums over the daily rows.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+
+from dateutil import tz
+
+LOCAL_TZ = tz.gettz("America/New_York")
+
+# Bump when a rollup's rules change; warehouses built with another version
+# are rebuilt when opened (see warehouse.store.Warehouse).
+ROLLUP_VERSION = "2"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS daily_item_sales (
+    location_id     TEXT NOT NULL,
+    local_date      TEXT NOT NULL,
+    item_name       TEXT NOT NULL,
+    variation_name  TEXT NOT NULL,
+    units           REAL NOT NULL,
+    revenue         INTEGER NOT NULL,
+    orders          INTEGER NOT NULL,
+    PRIMARY KEY (location_id, local_date, item_name, variation_name)
+);
+CREATE INDEX IF NOT EXISTS idx_daily_item_sales_date ON daily_item_sales (local_date);
+
+CREATE TABLE IF NOT EXISTS daily_team_tips (
+    location_id         TEXT NOT NULL,
+    local_date          TEXT NOT NULL,
+    team_member_id      TEXT NOT NULL,
+    hours               REAL NOT NULL,
+    declared_cash_tips  INTEGER NOT NULL,
+    card_tips           INTEGER NOT NULL,
+    auto_gratuity       INTEGER NOT NULL,
+    tip_eligible        INTEGER NOT NULL,
+    PRIMARY KEY (location_id, local_date, team_member_id)
+);
+CREATE INDEX IF NOT EXISTS idx_daily_team_tips_date ON daily_team_tips (local_date);
+
+CREATE TABLE IF NOT EXISTS rollup_dirty (
+    kind         TEXT NOT NULL,
+    location_id  TEXT NOT NULL,
+    local_date   TEXT NOT NULL,
+    PRIMARY KEY (kind, location_id, local_date)
+);
+"""
+
+# SQL expression mapping local_date to the start of its reporting period.
+PERIODS = {
+    "day": "local_date",
+    "week": "date(local_date, '-6 days', 'weekday 1')",  # Monday, as in get_week_bounds
+    "month": "substr(local_date, 1, 7)",
+    "year": "substr(local_date, 1, 4)",
+}
+
+
+def local_date(ts):
+    return datetime.fromtimestamp(ts, LOCAL_TZ).date().isoformat()
+
+
+def local_day_bounds(day):
+    """
+    Epoch-second bounds [start, end) of a local calendar day (DST aware).
+    """
+    d = date.fromisoformat(day)
+    start = datetime.combine(d, time.min, LOCAL_TZ)
+    end = datetime.combine(d + timedelta(days=1), time.min, LOCAL_TZ)
+    return start.timestamp(), end.timestamp()
+
+
+def mark_dirty(conn, kinds, pairs):
+    """
+    Queue (location_id, epoch ts) pairs for recomputation. Runs inside the
+    caller's transaction.
+    """
+    days = {(loc, local_date(ts)) for loc, ts in pairs if loc and ts is not None}
+    conn.executemany(
+        "INSERT OR IGNORE INTO rollup_dirty VALUES (?, ?, ?)",
+        [(kind, loc, day) for kind in kinds for loc, day in days],
+    )
+
+
+class Rollups:
+    def __init__(self, warehouse):
+        self.conn = warehouse.conn
+        self.conn.executescript(SCHEMA)
+
+    # ---- maintenance ----
+
+    def is_empty(self):
+        return not (
+            self.conn.execute("SELECT 1 FROM daily_item_sales LIMIT 1").fetchone()
+            or self.conn.execute("SELECT 1 FROM daily_team_tips LIMIT 1").fetchone()
+        )
+
+    def pending(self):
+        return self.conn.execute("SELECT COUNT(*) FROM rollup_dirty").fetchone()[0]
+
+    def refresh(self):
+        """
+        Recompute every queued day. Returns the number of days rebuilt.
+        """
+        dirty = self.conn.execute("SELECT kind, location_id, local_date FROM rollup_dirty").fetchall()
+        with self.conn:
+            for kind, location_id, day in dirty:
+                if kind == "sales":
+                    self._rebuild_sales(location_id, day)
+                else:
+                    self._rebuild_tips(location_id, day)
+            self.conn.execute("DELETE FROM rollup_dirty")
+        return len(dirty)
+
+    def rebuild_all(self):
+        """
+        Queue every day that has data and recompute it.
+        """
+        with self.conn:
+            self.conn.execute("DELETE FROM daily_item_sales")
+            self.conn.execute("DELETE FROM daily_team_tips")
+            pairs = self.conn.execute(
+                "SELECT location_id, created_ts FROM orders UNION "
+                "SELECT location_id, created_ts FROM payments UNION "
+                "SELECT location_id, start_ts FROM timecards"
+            ).fetchall()
+            mark_dirty(self.conn, ("sales", "tips"), pairs)
+        return self.refresh()
+
+    def _rebuild_sales(self, location_id, day):
+        start, end = local_day_bounds(day)
+        self.conn.execute(
+            "DELETE FROM daily_item_sales WHERE location_id = ? AND local_date = ?", (location_id, day)
+        )
+        self.conn.execute(
+            """
+            INSERT INTO daily_item_sales
+            SELECT o.location_id, ?, COALESCE(li.name, ''), COALESCE(li.variation_name, ''),
+                   SUM(COALESCE(li.quantity, 0)), SUM(COALESCE(li.total, 0)), COUNT(DISTINCT o.id)
+            FROM orders o JOIN line_items li ON li.order_id = o.id
+            WHERE o.location_id = ? AND o.created_ts >= ? AND o.created_ts < ? AND o.state = 'COMPLETED'
+            GROUP BY 3, 4
+            """,
+            (day, location_id, start, end),
+        )
+
+    def _rebuild_tips(self, location_id, day):
+        start, end = local_day_bounds(day)
+        rows = defaultdict(lambda: {"hours": 0.0, "cash": 0, "card": 0, "auto": 0, "eligible": 0})
+
+        for tm_id, hours, cash, eligible in self.conn.execute(
+            """
+            SELECT t.team_member_id, SUM(t.end_ts - t.start_ts) / 3600.0,
+                   SUM(COALESCE(t.declared_cash_tips, 0)),
+                   -- the latest shift's wage decides, as in the live aggregation
+                   (SELECT l.tip_eligible FROM timecards l
+                    WHERE l.location_id = t.location_id AND l.team_member_id = t.team_member_id
+                      AND l.start_ts >= ? AND l.start_ts < ? AND l.end_ts IS NOT NULL
+                    ORDER BY l.start_ts DESC LIMIT 1)
+            FROM timecards t
+            WHERE t.location_id = ? AND t.start_ts >= ? AND t.start_ts < ?
+              AND t.team_member_id IS NOT NULL AND t.end_ts IS NOT NULL
+            GROUP BY t.team_member_id
+            """,
+            (start, end, location_id, start, end),
+        ):
+            rows[tm_id].update(hours=hours, cash=cash, eligible=eligible)
+
+        for tm_id, card, auto in self.conn.execute(
+            """
+            SELECT p.team_member_id, SUM(COALESCE(p.tip, 0)),
+                   SUM(COALESCE((SELECT SUM(sc.applied) FROM service_charges sc
+                                 WHERE sc.order_id = p.order_id AND sc.type = 'AUTO_GRATUITY'), 0))
+            FROM payments p
+            WHERE p.location_id = ? AND p.created_ts >= ? AND p.created_ts < ?
+              AND p.status = 'COMPLETED' AND p.team_member_id IS NOT NULL
+            GROUP BY p.team_member_id
+            """,
+            (location_id, start, end),
+        ):
+            rows[tm_id].update(card=card, auto=auto)
+
+        self.conn.execute(
+            "DELETE FROM daily_team_tips WHERE location_id = ? AND local_date = ?", (location_id, day)
+        )
+        self.conn.executemany(
+            "INSERT INTO daily_team_tips VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            [
+                (location_id, day, tm_id, r["hours"], r["cash"], r["card"], r["auto"], r["eligible"])
+                for tm_id, r in rows.items()
+            ],
+        )
+
+    # ---- reports ----
+
+    def _filters(self, start_date, end_date, location_ids):
+        sql, params = "", []
+        if start_date:
+            sql += " AND local_date >= ?"
+            params.append(start_date)
+        if end_date:
+            sql += " AND local_date < ?"
+            params.append(end_date)
+        if location_ids:
+            sql += f" AND location_id IN ({','.join('?' * len(location_ids))})"
+            params += list(location_ids)
+        return sql, params
+
+    def item_sales(self, start_date=None, end_date=None, period="week", location_ids=None, item=None):
+        """
+        Units, revenue (cents) and order count per period and item. Dates are
+        local YYYY-MM-DD, end exclusive.
+        """
+        where, params = self._filters(start_date, end_date, location_ids)
+        if item:
+            where += " AND lower(item_name) LIKE ?"
+            params.append(f"%{item.lower()}%")
+        cur = self.conn.execute(
+            f"""
+            SELECT {PERIODS[period]} AS period, item_name, variation_name,
+                   SUM(units), SUM(revenue), SUM(orders)
+            FROM daily_item_sales WHERE 1=1 {where}
+            GROUP BY period, item_name, variation_name
+            ORDER BY period, SUM(revenue) DESC
+            """,
+            params,
+        )
+        cols = ["period", "item_name", "variation_name", "units", "revenue", "orders"]
+        return [dict(zip(cols, row)) for row in cur]
+
+    def team_tips(self, start_date=None, end_date=None, period="week", location_ids=None):
+        """
+        Hours and tips (cents) per period and team member.
+        """
+        where, params = self._filters(start_date, end_date, location_ids)
+        cur = self.conn.execute(
+            f"""
+            SELECT {PERIODS[period]} AS period, team_member_id, SUM(hours),
+                   SUM(declared_cash_tips), SUM(card_tips), SUM(auto_gratuity)
+            FROM daily_team_tips WHERE 1=1 {where}
+            GROUP BY period, team_member_id
+            ORDER BY period, team_member_id
+            """,
+            params,
+        )
+        cols = ["period", "team_member_id", "hours", "declared_cash_tips", "card_tips", "auto_gratuity"]
+        return [dict(zip(cols, row)) for row in cur]
+
+    def hours_and_tips_by_day(self, location_id, start_date, end_date):
+        """
+        Same shape as tipout.aggregation.aggregate_hours_and_tips_by_day, so
+        tipout.distribution.distribute_daily_tips can run on rollups.
+        """
+        data = defaultdict(dict)
+        for day, tm_id, hours, cash, card, auto, eligible in self.conn.execute(
+            "SELECT local_date, team_member_id, hours, declared_cash_tips, card_tips, auto_gratuity, "
+            "tip_eligible FROM daily_team_tips WHERE location_id = ? AND local_date >= ? AND local_date < ?",
+            (location_id, start_date, end_date),
+        ):
+            data[day][tm_id] = {
+                "hours": hours,
+                "declared_cash_tips": cash,
+                "card_tips": card + auto,
+                "eligible": bool(eligible),
+            }
+        return data
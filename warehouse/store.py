@@ -0,0 +1,462 @@
+"""
+SQLite store for Square orders, payments, timecards and the lookups they
+reference (locations, team members, customers).
+
+Every object keeps its full JSON so the offline client can hand back real
+SDK models; the columns next to it are the normalized, indexed fields that
+queries filter on. Timestamps are stored twice: the ISO string Square sent
+and epoch seconds (`*_ts`) so range filters compare numbers, not strings in
+mixed offsets.
+"""
+
+import sqlite3
+from contextlib import contextmanager
+
+from dateutil import parser as date_parser
+
+from utils.serialization import dumps, loads
+
+from .item_index import ItemNameIndex
+from .rollups import ROLLUP_VERSION, Rollups, mark_dirty
+
+DEFAULT_WAREHOUSE_PATH = "square_warehouse.sqlite"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS locations (
+    id    TEXT PRIMARY KEY,
+    name  TEXT,
+    raw   BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS team_members (
+    id           TEXT PRIMARY KEY,
+    given_name   TEXT,
+    family_name  TEXT,
+    status       TEXT,
+    raw          BLOB NOT NULL
+);
+CREATE TABLE IF NOT EXISTS team_member_locations (
+    team_member_id  TEXT NOT NULL,
+    location_id     TEXT NOT NULL,
+    PRIMARY KEY (team_member_id, location_id)
+);
+
+CREATE TABLE IF NOT EXISTS customers (
+    id   TEXT PRIMARY KEY,
+    raw  BLOB NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS orders (
+    id           TEXT PRIMARY KEY,
+    location_id  TEXT,
+    state        TEXT,
+    customer_id  TEXT,
+    version      INTEGER,
+    created_at   TEXT,
+    created_ts   REAL,
+    updated_ts   REAL,
+    total        INTEGER,
+    raw          BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_orders_location_created ON orders (location_id, created_ts);
+CREATE INDEX IF NOT EXISTS idx_orders_created ON orders (created_ts);
+
+CREATE TABLE IF NOT EXISTS line_items (
+    order_id          TEXT NOT NULL,
+    uid               TEXT NOT NULL,
+    name              TEXT,
+    name_lower        TEXT,
+    variation_name    TEXT,
+    catalog_object_id TEXT,
+    quantity          REAL,
+    base_price        INTEGER,
+    total             INTEGER,
+    PRIMARY KEY (order_id, uid)
+);
+CREATE INDEX IF NOT EXISTS idx_line_items_name_order ON line_items (name_lower, order_id);
+
+CREATE TABLE IF NOT EXISTS modifiers (
+    order_id       TEXT NOT NULL,
+    line_item_uid  TEXT NOT NULL,
+    uid            TEXT NOT NULL,
+    name           TEXT,
+    price          INTEGER,
+    PRIMARY KEY (order_id, line_item_uid, uid)
+);
+
+CREATE TABLE IF NOT EXISTS service_charges (
+    order_id  TEXT NOT NULL,
+    uid       TEXT NOT NULL,
+    name      TEXT,
+    type      TEXT,
+    applied   INTEGER,
+    PRIMARY KEY (order_id, uid)
+);
+
+CREATE TABLE IF NOT EXISTS payments (
+    id              TEXT PRIMARY KEY,
+    location_id     TEXT,
+    order_id        TEXT,
+    team_member_id  TEXT,
+    status          TEXT,
+    created_ts      REAL,
+    amount          INTEGER,
+    tip             INTEGER,
+    raw             BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_payments_location_created ON payments (location_id, created_ts);
+CREATE INDEX IF NOT EXISTS idx_payments_team_member ON payments (team_member_id);
+CREATE INDEX IF NOT EXISTS idx_payments_order ON payments (order_id);
+
+CREATE TABLE IF NOT EXISTS timecards (
+    id                  TEXT PRIMARY KEY,
+    location_id         TEXT,
+    team_member_id      TEXT,
+    start_ts            REAL,
+    end_ts              REAL,
+    declared_cash_tips  INTEGER,
+    tip_eligible        INTEGER,
+    raw                 BLOB NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_timecards_location_start ON timecards (location_id, start_ts);
+CREATE INDEX IF NOT EXISTS idx_timecards_team_member ON timecards (team_member_id);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    key    TEXT PRIMARY KEY,
+    value  TEXT
+);
+"""
+
+
+def to_ts(iso):
+    if not iso:
+        return None
+    return date_parser.isoparse(iso).timestamp()
+
+
+def _amount(money):
+    return getattr(money, "amount", None) if money is not None else None
+
+
+def _raw(obj):
+    if hasattr(obj, "model_dump"):
+        return dumps(obj.model_dump(mode="json", exclude_none=True))
+    return dumps(obj)
+
+
+class Warehouse:
+    def __init__(self, path=DEFAULT_WAREHOUSE_PATH, check_same_thread=True):
+        self.path = str(path)
+        # check_same_thread=False lets one connection serve several threads;
+        # the caller must then serialize access (see mock_square.server).
+        self.conn = sqlite3.connect(self.path, check_same_thread=check_same_thread)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        self.conn.executescript(SCHEMA)
+        self.item_index = ItemNameIndex(self.conn)
+        if not self.item_index.known_names() and self.conn.execute("SELECT 1 FROM line_items LIMIT 1").fetchone():
+            self.item_index.rebuild()
+        self.rollups = Rollups(self)
+        stale = self.get_state("rollup_version") != ROLLUP_VERSION
+        if (stale or self.rollups.is_empty()) and self.conn.execute("SELECT 1 FROM orders LIMIT 1").fetchone():
+            self.rollups.rebuild_all()
+        if stale:
+            self.set_state("rollup_version", ROLLUP_VERSION)
+
+    @contextmanager
+    def transaction(self):
+        with self.conn:
+            yield self.conn
+
+    # ---- writes ----
+
+    def upsert_locations(self, locations):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO locations VALUES (?, ?, ?)",
+                [(loc.id, getattr(loc, "name", None), _raw(loc)) for loc in locations],
+            )
+
+    def upsert_team_members(self, team_members):
+        with self.conn:
+            for tm in team_members:
+                self.conn.execute(
+                    "INSERT OR REPLACE INTO team_members VALUES (?, ?, ?, ?, ?)",
+                    (tm.id, getattr(tm, "given_name", None), getattr(tm, "family_name", None),
+                     getattr(tm, "status", None), _raw(tm)),
+                )
+                assigned = getattr(getattr(tm, "assigned_locations", None), "location_ids", None) or []
+                self.conn.execute("DELETE FROM team_member_locations WHERE team_member_id = ?", (tm.id,))
+                self.conn.executemany(
+                    "INSERT INTO team_member_locations VALUES (?, ?)",
+                    [(tm.id, loc_id) for loc_id in assigned],
+                )
+
+    def upsert_customers(self, customers):
+        with self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO customers VALUES (?, ?)",
+                [(c.id, _raw(c)) for c in customers],
+            )
+
+    def upsert_orders(self, orders):
+        """
+        Store orders with their line items, modifiers and service charges.
+        Child rows are replaced wholesale so edited orders don't leave
+        stale items behind. New item names are added to the trigram index
+        and the touched days (the orders' and, for tips, their payments')
+        queued for the rollups, in the same transaction.
+        Returns the number of orders written.
+        """
+        count = 0
+        names = set()
+        days = []
+        order_ids = []
+        try:
+            with self.conn:
+                for order in orders:
+                    names.update(self._upsert_order(order))
+                    days.append((getattr(order, "location_id", None), to_ts(getattr(order, "created_at", None))))
+                    order_ids.append(order.id)
+                    count += 1
+                self.item_index.add_names(names)
+                mark_dirty(self.conn, ("sales", "tips"), days)
+                # Auto-gratuity lives on the order but is credited on the
+                # day of the payment, which can differ from the order's day
+                mark_dirty(self.conn, ("tips",), self._payment_days(order_ids))
+        except Exception:
+            # The rollback also undid the names add_names() indexed
+            self.item_index.invalidate()
+            raise
+        return count
+
+    def _payment_days(self, order_ids, chunk=500):
+        """
+        (location_id, created_ts) of the stored payments for these orders.
+        """
+        pairs = []
+        for i in range(0, len(order_ids), chunk):
+            ids = order_ids[i:i + chunk]
+            pairs += self.conn.execute(
+                f"SELECT location_id, created_ts FROM payments WHERE order_id IN ({','.join('?' * len(ids))})", ids
+            ).fetchall()
+        return pairs
+
+    def _upsert_order(self, order):
+        c = self.conn
+        c.execute(
+            "INSERT OR REPLACE INTO orders VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (
+                order.id,
+                getattr(order, "location_id", None),
+                getattr(order, "state", None),
+                getattr(order, "customer_id", None),
+                getattr(order, "version", None),
+                getattr(order, "created_at", None),
+                to_ts(getattr(order, "created_at", None)),
+                to_ts(getattr(order, "updated_at", None)),
+                _amount(getattr(order, "total_money", None)),
+                _raw(order),
+            ),
+        )
+        for table in ("line_items", "modifiers", "service_charges"):
+            c.execute(f"DELETE FROM {table} WHERE order_id = ?", (order.id,))
+
+        items, mods = [], []
+        for i, item in enumerate(getattr(order, "line_items", None) or []):
+            uid = getattr(item, "uid", None) or str(i)
+            name = getattr(item, "name", None)
+            qty = getattr(item, "quantity", None)
+            items.append((
+                order.id, uid, name, name.lower() if name else None,
+                getattr(item, "variation_name", None),
+                getattr(item, "catalog_object_id", None),
+                float(qty) if qty else None,
+                _amount(getattr(item, "base_price_money", None)),
+                _amount(getattr(item, "total_money", None)),
+            ))
+            for j, mod in enumerate(getattr(item, "modifiers", None) or []):
+                mods.append((
+                    order.id, uid, getattr(mod, "uid", None) or str(j),
+                    getattr(mod, "name", None),
+                    _amount(getattr(mod, "total_price_money", None)),
+                ))
+        c.executemany("INSERT INTO line_items VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", items)
+        names = {row[3] for row in items}
+        c.executemany("INSERT INTO modifiers VALUES (?, ?, ?, ?, ?)", mods)
+        c.executemany(
+            "INSERT INTO service_charges VALUES (?, ?, ?, ?, ?)",
+            [
+                (order.id, getattr(sc, "uid", None) or str(k), getattr(sc, "name", None),
+                 getattr(sc, "type", None), _amount(getattr(sc, "applied_money", None)))
+                for k, sc in enumerate(getattr(order, "service_charges", None) or [])
+            ],
+        )
+        return names
+
+    def upsert_payments(self, payments):
+        with self.conn:
+            rows = [
+                (
+                    p.id,
+                    getattr(p, "location_id", None),
+                    getattr(p, "order_id", None),
+                    getattr(p, "team_member_id", None),
+                    getattr(p, "status", None),
+                    to_ts(getattr(p, "created_at", None)),
+                    _amount(getattr(p, "amount_money", None)),
+                    _amount(getattr(p, "tip_money", None)),
+                    _raw(p),
+                )
+                for p in payments
+            ]
+            self.conn.executemany("INSERT OR REPLACE INTO payments VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            mark_dirty(self.conn, ("tips",), [(r[1], r[5]) for r in rows])
+
+    def upsert_timecards(self, timecards):
+        with self.conn:
+            rows = [
+                (
+                    tc.id,
+                    getattr(tc, "location_id", None),
+                    getattr(tc, "team_member_id", None),
+                    to_ts(getattr(tc, "start_at", None)),
+                    to_ts(getattr(tc, "end_at", None)),
+                    _amount(getattr(tc, "declared_cash_tip_money", None)),
+                    int(bool(getattr(getattr(tc, "wage", None), "tip_eligible", False))),
+                    _raw(tc),
+                )
+                for tc in timecards
+            ]
+            self.conn.executemany("INSERT OR REPLACE INTO timecards VALUES (?, ?, ?, ?, ?, ?, ?, ?)", rows)
+            mark_dirty(self.conn, ("tips",), [(r[1], r[3]) for r in rows])
+
+    def set_state(self, key, value):
+        with self.conn:
+            self.conn.execute("INSERT OR REPLACE INTO sync_state VALUES (?, ?)", (key, str(value)))
+
+    def get_state(self, key, default=None):
+        row = self.conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else default
+
+    # ---- reads (raw JSON dicts; warehouse.offline turns them into SDK models) ----
+
+    def _raw_rows(self, sql, params=()):
+        return [loads(raw) for (raw,) in self.conn.execute(sql, params)]
+
+    def locations(self):
+        return self._raw_rows("SELECT raw FROM locations ORDER BY name")
+
+    def team_members(self, location_ids=None, status=None):
+        sql = "SELECT raw FROM team_members tm WHERE 1=1"
+        params = []
+        if location_ids:
+            marks = ",".join("?" * len(location_ids))
+            sql += (f" AND EXISTS (SELECT 1 FROM team_member_locations l "
+                    f"WHERE l.team_member_id = tm.id AND l.location_id IN ({marks}))")
+            params += list(location_ids)
+        if status:
+            sql += " AND status = ?"
+            params.append(status)
+        return self._raw_rows(sql, params)
+
+    def customer(self, customer_id):
+        rows = self._raw_rows("SELECT raw FROM customers WHERE id = ?", (customer_id,))
+        return rows[0] if rows else None
+
+    def order(self, order_id):
+        rows = self._raw_rows("SELECT raw FROM orders WHERE id = ?", (order_id,))
+        return rows[0] if rows else None
+
+    def orders(self, start_iso=None, end_iso=None, location_ids=None, descending=True, updated_since=None):
+        sql, params = "SELECT raw FROM orders WHERE 1=1", []
+        if updated_since:
+            sql += " AND updated_ts >= ?"
+            params.append(to_ts(updated_since))
+        if location_ids:
+            sql += f" AND location_id IN ({','.join('?' * len(location_ids))})"
+            params += list(location_ids)
+        if start_iso:
+            sql += " AND created_ts >= ?"
+            params.append(to_ts(start_iso))
+        if end_iso:
+            sql += " AND created_ts < ?"
+            params.append(to_ts(end_iso))
+        sql += f" ORDER BY created_ts {'DESC' if descending else 'ASC'}"
+        return self._raw_rows(sql, params)
+
+    def orders_with_item(self, item_name, start_iso=None, end_iso=None, location_ids=None):
+        """
+        Orders with a line item whose name contains `item_name`
+        (case-insensitive), newest first. Names are resolved through the
+        trigram index, then orders through the line_items name index.
+        """
+        names = self.item_index.matching_names(item_name)
+        if not names:
+            return []
+        sql = (f"SELECT raw FROM orders o WHERE o.id IN (SELECT order_id FROM line_items "
+               f"WHERE name_lower IN ({','.join('?' * len(names))}))")
+        params = list(names)
+        if location_ids:
+            sql += f" AND o.location_id IN ({','.join('?' * len(location_ids))})"
+            params += list(location_ids)
+        if start_iso:
+            sql += " AND o.created_ts >= ?"
+            params.append(to_ts(start_iso))
+        if end_iso:
+            sql += " AND o.created_ts < ?"
+            params.append(to_ts(end_iso))
+        sql += " ORDER BY o.created_ts DESC"
+        return self._raw_rows(sql, params)
+
+    def payments(self, location_id=None, start_iso=None, end_iso=None):
+        sql, params = "SELECT raw FROM payments WHERE 1=1", []
+        if location_id:
+            sql += " AND location_id = ?"
+            params.append(location_id)
+        if start_iso:
+            sql += " AND created_ts >= ?"
+            params.append(to_ts(start_iso))
+        if end_iso:
+            sql += " AND created_ts < ?"
+            params.append(to_ts(end_iso))
+        sql += " ORDER BY created_ts DESC"
+        return self._raw_rows(sql, params)
+
+    def timecards(self, location_ids=None, start_iso=None, end_iso=None):
+        """
+        Timecards that start at or after `start_iso` and end at or before
+        `end_iso`, matching the labor search filter fetch_timecards uses.
+        """
+        sql, params = "SELECT raw FROM timecards WHERE 1=1", []
+        if location_ids:
+            sql += f" AND location_id IN ({','.join('?' * len(location_ids))})"
+            params += list(location_ids)
+        if start_iso:
+            sql += " AND start_ts >= ?"
+            params.append(to_ts(start_iso))
+        if end_iso:
+            sql += " AND (end_ts IS NULL OR end_ts <= ?)"
+            params.append(to_ts(end_iso))
+        sql += " ORDER BY start_ts"
+        return self._raw_rows(sql, params)
+
+    def missing_ids(self, table, ids):
+        ids = [i for i in set(ids) if i]
+        if not ids:
+            return []
+        found = set()
+        for i in range(0, len(ids), 500):
+            chunk = ids[i:i + 500]
+            found.update(r[0] for r in self.conn.execute(
+                f"SELECT id FROM {table} WHERE id IN ({','.join('?' * len(chunk))})", chunk
+            ))
+        return sorted(set(ids) - found)
+
+    def counts(self):
+        tables = ["locations", "team_members", "customers", "orders", "line_items",
+                  "modifiers", "service_charges", "payments", "timecards"]
+        return {t: self.conn.execute(f"SELECT COUNT(*) FROM {t}").fetchone()[0] for t in tables}
+
+    def close(self):
+        self.conn.close()
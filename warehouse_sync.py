@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Copy Square orders, payments and timecards into the local warehouse.
+
+Usage:
+    python warehouse_sync.py --date 2025-11-24            # the week containing that date
+    python warehouse_sync.py --start 2025-11-01 --end 2025-12-01 --location L123
+"""
+
+import argparse
+import os
+import time
+from datetime import datetime, timezone
+
+from utils.square_http import make_square_client
+
+from tipout.utils import get_week_bounds
+from warehouse import DEFAULT_WAREHOUSE_PATH, Warehouse, sync_window
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Sync Square data into the local warehouse.")
+    parser.add_argument("--date", help="Sync the week containing this date (YYYY-MM-DD)")
+    parser.add_argument("--start", help="Start date (YYYY-MM-DD, UTC)")
+    parser.add_argument("--end", help="End date (YYYY-MM-DD, UTC, exclusive)")
+    parser.add_argument("--location", nargs="*", help="Specific location IDs to include")
+    parser.add_argument("--db", default=DEFAULT_WAREHOUSE_PATH, help=f"Warehouse path. Default: {DEFAULT_WAREHOUSE_PATH}")
+    args = parser.parse_args()
+
+    token = os.getenv("SQUARE_ACCESS_TOKEN")
+    if not token:
+        raise RuntimeError("Missing SQUARE_ACCESS_TOKEN environment variable.")
+    client = make_square_client(token)
+
+    if args.start:
+        start_iso = datetime.strptime(args.start, "%Y-%m-%d").replace(tzinfo=timezone.utc).isoformat()
+        end_iso = (
+            datetime.strptime(args.end, "%Y-%m-%d").replace(tzinfo=timezone.utc)
+            if args.end else datetime.now(timezone.utc)
+        ).isoformat()
+    else:
+        start_iso, end_iso = get_week_bounds(args.date)
+    print(f"📅 Syncing {start_iso} → {end_iso} into {args.db}")
+
+    warehouse = Warehouse(args.db)
+    try:
+        start = time.perf_counter()
+        written = sync_window(client, warehouse, start_iso, end_iso, args.location)
+        print(f"✅ Synced in {time.perf_counter() - start:.1f}s: "
+              + ", ".join(f"{n} {table}" for table, n in written.items()))
+    finally:
+        warehouse.close()
+
+
+if __name__ == "__main__":
+    main()
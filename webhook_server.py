@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Local receiver for Square webhooks (orders, payments, timecards).
+
+Serve:
+    SQUARE_WEBHOOK_SIGNATURE_KEY=... python webhook_server.py \
+        --notification-url https://example.ngrok.app/square --record webhook_events/
+
+Replay recorded payloads against a local receiver (re-signed with the local
+key, for the receiver's notification URL):
+    python webhook_server.py --replay webhook_events/ --url http://127.0.0.1:8787/square \
+        --notification-url https://example.ngrok.app/square
+
+The notification URL must be exactly the one configured in the Square
+dashboard; it is part of the signed message.
+"""
+
+import argparse
+import json
+import os
+import queue
+import threading
+import time
+import urllib.error
+import urllib.request
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from urllib.parse import urlparse
+
+from warehouse import DEFAULT_WAREHOUSE_PATH, Warehouse
+from warehouse.webhooks import SIGNATURE_HEADER, WebhookIngestor, compute_signature, is_valid_signature
+
+
+class IngestWorker(threading.Thread):
+    """
+    Owns the warehouse (SQLite connections are per-thread) and applies
+    events in arrival order, so request handlers can acknowledge Square
+    immediately.
+    """
+
+    def __init__(self, args):
+        super().__init__(daemon=True)
+        self.args = args
+        self.events = queue.Queue()
+
+    def run(self):
+        from utils.checkpoints import ExtractionCheckpoint
+
+        client = None
+        token = os.getenv("SQUARE_ACCESS_TOKEN")
+        if token:
+            from square_client import CachingClient
+            from utils.square_http import make_square_client
+            client = CachingClient(make_square_client(token))
+        else:
+            print("⚠️ SQUARE_ACCESS_TOKEN not set: order events are recorded but orders can't be fetched")
+
+        from square_order_info import EXTRACTORS
+
+        ingestor = WebhookIngestor(
+            Warehouse(self.args.db),
+            client=client,
+            extractors=EXTRACTORS,
+            checkpoint=ExtractionCheckpoint(self.args.checkpoint),
+        )
+        while True:
+            event = self.events.get()
+            try:
+                print(f"  ↳ {ingestor.handle(event)}")
+            except Exception as e:
+                print(f"❌ Failed to ingest {event.get('type')} {event.get('event_id')}: {e}")
+
+
+def make_handler(signature_key, notification_url, worker, record_dir=None):
+    path = urlparse(notification_url).path or "/"
+
+    class WebhookHandler(BaseHTTPRequestHandler):
+        def do_POST(self):
+            if self.path != path:
+                self.send_error(404)
+                return
+            body = self.rfile.read(int(self.headers.get("Content-Length", 0)))
+            if not is_valid_signature(signature_key, notification_url, body, self.headers.get(SIGNATURE_HEADER)):
+                print("⚠️ Rejected webhook with invalid signature")
+                self.send_error(401)
+                return
+            try:
+                event = json.loads(body)
+            except ValueError:
+                self.send_error(400)
+                return
+
+            if record_dir:
+                name = f"{datetime.now():%Y%m%d_%H%M%S_%f}_{event.get('event_id', 'event')}.json"
+                (Path(record_dir) / name).write_bytes(body)
+
+            print(f"📨 {event.get('type')} {event.get('event_id')}")
+            worker.events.put(event)
+            self.send_response(200)
+            self.end_headers()
+
+        def log_message(self, format, *args):
+            pass  # one line per event is printed above
+
+    return WebhookHandler
+
+
+def replay(directory, url, signature_key, delay=0.0, notification_url=None):
+    """
+    POST every recorded payload in `directory` (sorted by name, i.e. arrival
+    order) to `url`. Payloads are signed for `notification_url`, the URL the
+    receiver verifies against, which defaults to `url`.
+    """
+    files = sorted(Path(directory).glob("*.json"))
+    signed_url = notification_url or url
+    ok = 0
+    for f in files:
+        body = f.read_bytes()
+        req = urllib.request.Request(url, data=body, method="POST", headers={
+            "Content-Type": "application/json",
+            SIGNATURE_HEADER: compute_signature(signature_key, signed_url, body),
+        })
+        try:
+            with urllib.request.urlopen(req, timeout=10) as resp:
+                status = resp.status
+        except urllib.error.HTTPError as e:
+            status = e.code
+        ok += status == 200
+        print(f"{'✅' if status == 200 else '❌'} {status} {f.name}")
+        if delay:
+            time.sleep(delay)
+    print(f"Replayed {ok}/{len(files)} events to {url}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Receive (or replay) Square webhooks into the local warehouse.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8787)
+    parser.add_argument("--notification-url",
+                        help="URL configured in Square for this subscription; --replay signs for it too "
+                             "(default: http://HOST:PORT/square)")
+    parser.add_argument("--signature-key", default=os.getenv("SQUARE_WEBHOOK_SIGNATURE_KEY"),
+                        help="Subscription signature key (default: $SQUARE_WEBHOOK_SIGNATURE_KEY)")
+    parser.add_argument("--db", default=DEFAULT_WAREHOUSE_PATH, help=f"Warehouse path. Default: {DEFAULT_WAREHOUSE_PATH}")
+    parser.add_argument("--checkpoint", default=".extract_checkpoints.sqlite",
+                        help="Extraction checkpoint DB updated as orders arrive")
+    parser.add_argument("--record", metavar="DIR", help="Save every verified payload to DIR for replay")
+    parser.add_argument("--replay", metavar="DIR", help="POST recorded payloads from DIR instead of serving")
+    parser.add_argument("--url", help="Receiver URL for --replay (default: http://HOST:PORT/square)")
+    parser.add_argument("--delay", type=float, default=0.0, help="Seconds between replayed events")
+    args = parser.parse_args()
+
+    if not args.signature_key:
+        raise RuntimeError("Missing webhook signature key (--signature-key or SQUARE_WEBHOOK_SIGNATURE_KEY).")
+    local_url = f"http://{args.host}:{args.port}/square"
+
+    if args.replay:
+        replay(args.replay, args.url or local_url, args.signature_key, args.delay, args.notification_url)
+        return
+
+    if args.record:
+        Path(args.record).mkdir(parents=True, exist_ok=True)
+
+    worker = IngestWorker(args)
+    worker.start()
+    notification_url = args.notification_url or local_url
+    server = ThreadingHTTPServer(
+        (args.host, args.port), make_handler(args.signature_key, notification_url, worker, args.record)
+    )
+    print(f"📡 Listening on {args.host}:{args.port} for {notification_url}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\nStopped.")
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()